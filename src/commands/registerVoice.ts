@@ -39,6 +39,9 @@ export function registerVoice(program: Command): void {
 		.command("logs")
 		.description("Tail voice daemon logs")
 		.option("-n, --lines <count>", "Number of lines to show", "20")
+		.option("--event <name>", "Only show this event")
+		.option("--level <level>", "Only show this level (info, warn, error)")
+		.option("--since <time>", "Only show entries since this ISO time (UTC)")
 		.action((options) => logs(options));
 
 	configHelp(voiceCommand, voiceConfigHelp);
@@ -1,3 +1,8 @@
+import { delimiter } from "node:path";
+import {
+	getGlobalConfigPath,
+	projectConfigPathFrom,
+} from "../../shared/loadConfigFrom";
 import { voicePaths } from "./shared";
 
 export function buildDaemonEnv(options?: {
@@ -5,6 +10,12 @@ export function buildDaemonEnv(options?: {
 }): Record<string, string> {
 	const env = { ...process.env } as Record<string, string>;
 	env.VOICE_LOG_FILE = voicePaths.log;
+	env.VOICE_LOG_DB = voicePaths.db;
+	// The daemon reads (and watches) these itself instead of running the CLI
+	env.VOICE_CONFIG_FILES = [
+		getGlobalConfigPath(),
+		projectConfigPathFrom(process.cwd()),
+	].join(delimiter);
 	if (options?.debug) env.VOICE_DEBUG = "1";
 	return env;
 }
@@ -1,22 +1,31 @@
-import { existsSync, readFileSync } from "node:fs";
+import { existsSync } from "node:fs";
+import { queryLogs } from "./queryLogs";
 import { voicePaths } from "./shared";
 
-export function logs(options: { lines?: string }): void {
-	if (!existsSync(voicePaths.log)) {
+export function logs(options: {
+	lines?: string;
+	event?: string;
+	level?: string;
+	since?: string;
+}): void {
+	if (!existsSync(voicePaths.log) && !existsSync(voicePaths.db)) {
 		console.log("No voice log file found");
 		return;
 	}
 
 	const count = Number.parseInt(options.lines ?? "150", 10);
-	const content = readFileSync(voicePaths.log, "utf8").trim();
+	const lines = queryLogs({
+		lines: count,
+		event: options.event,
+		level: options.level,
+		since: options.since,
+	});
 
-	if (!content) {
+	if (lines.length === 0) {
 		console.log("Voice log is empty");
 		return;
 	}
 
-	const lines = content.split("\n").slice(-count);
-
 	for (const line of lines) {
 		try {
 			const event = JSON.parse(line);
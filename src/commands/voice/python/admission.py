@@ -0,0 +1,65 @@
+"""Who may run the models: live mic jobs first, batch callers in the gaps."""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# Batch work starts only after live jobs have been idle this long, so it runs
+# between utterances rather than between one utterance's partials
+BATCH_GRACE_SECONDS = 1.0
+
+
+class Admission:
+    """Shared access for live jobs, exclusive access for batch work.
+
+    Any number of live jobs (one per stream's model worker) run at once and
+    never wait for each other.  A batch pass waits until no live job is
+    running or waiting and none has run for ``BATCH_GRACE_SECONDS``, and live
+    jobs that arrive meanwhile go first.  A forward pass can't be
+    interrupted, so a live job waits at most for the one batch pass running.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._live = 0  # live jobs running or waiting
+        self._batch = False  # a batch pass is running
+        self._last_live = 0.0
+
+    @contextmanager
+    def live(self):
+        with self._cond:
+            self._live += 1
+            while self._batch:
+                self._cond.wait()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._live -= 1
+                self._last_live = time.monotonic()
+                self._cond.notify_all()
+
+    def _batch_wait(self) -> float | None:
+        """Seconds until a batch pass may start, or None if it may now."""
+        if self._live or self._batch:
+            return BATCH_GRACE_SECONDS
+        remaining = self._last_live + BATCH_GRACE_SECONDS - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    @contextmanager
+    def batch(self):
+        """Wait for a gap in live traffic, then hold off live jobs until done."""
+        with self._cond:
+            while (wait := self._batch_wait()) is not None:
+                self._cond.wait(wait)
+            self._batch = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._batch = False
+                self._cond.notify_all()
+
+
+# The one instance every model worker and the transcription service share
+model_access = Admission()
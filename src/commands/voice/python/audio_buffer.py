@@ -0,0 +1,57 @@
+"""Fixed-capacity float32 utterance buffer with zero-copy contiguous views."""
+
+import numpy as np
+
+
+class UtteranceBuffer:
+    """Mirrored ring buffer: every sample is written twice, ``capacity`` apart.
+
+    Any run of the most recent ``n <= capacity`` samples is therefore one
+    contiguous slice of the backing array, so readers get views instead of
+    ``np.concatenate`` copies.  Appends are O(chunk), independent of how much
+    audio is already buffered.
+
+    Views alias the backing array: they stay valid across appends until the
+    buffer wraps, and after ``clear()`` until new appends overwrite them.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.float32)
+        self._pos = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, chunk: np.ndarray) -> None:
+        """Append samples, dropping the oldest once capacity is exceeded."""
+        cap = self._capacity
+        n = len(chunk)
+        if n > cap:
+            chunk = chunk[-cap:]
+            n = cap
+        start = self._pos
+        first = min(n, cap - start)
+        self._data[start : start + first] = chunk[:first]
+        self._data[start + cap : start + cap + first] = chunk[:first]
+        rest = n - first
+        if rest:
+            self._data[:rest] = chunk[first:]
+            self._data[cap : cap + rest] = chunk[first:]
+        self._pos = (start + n) % cap
+        self._len = min(self._len + n, cap)
+
+    def view(self) -> np.ndarray:
+        """Return the whole buffered utterance as a contiguous view."""
+        return self.last(self._len)
+
+    def last(self, n: int) -> np.ndarray:
+        """Return the last ``n`` samples, or all of them if fewer are buffered."""
+        n = min(n, self._len)
+        end = self._pos + self._capacity
+        return self._data[end - n : end]
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._len = 0
@@ -1,29 +1,47 @@
 """Microphone capture via sounddevice (16kHz PCM)."""
 
 import os
-import queue
+
 import numpy as np
-import sounddevice as sd
 
+from capture_ring import CaptureRing
 from logger import log
+from metrics import DROPPED_SAMPLES, OVERFLOWS
 
 SAMPLE_RATE = 16000
 BLOCK_SIZE = 512  # Silero VAD requires exactly 512 samples at 16kHz
+RING_BLOCKS = 313  # ~10 s of audio; beyond that new audio is dropped
+
+_DEVICE_OVERFLOWS = OVERFLOWS.labels("device")
+_RING_OVERFLOWS = OVERFLOWS.labels("ring")
+_DROPPED_SAMPLES = DROPPED_SAMPLES.labels()
 
 
 class AudioCapture:
-    def __init__(self):
-        self._queue: queue.Queue[np.ndarray] = queue.Queue()
-        self._stream: sd.InputStream | None = None
-        device_name = os.environ.get("VOICE_MIC")
-        self._device = device_name if device_name else None
+    def __init__(self, device: str | None = None):
+        self._ring = CaptureRing(RING_BLOCKS, BLOCK_SIZE)
+        self._reported_drops = 0
+        self._stream = None
+        self._device = device or os.environ.get("VOICE_MIC") or None
 
     def _callback(self, indata: np.ndarray, frames: int, time_info, status) -> None:
         if status:
+            if status.input_overflow:
+                _DEVICE_OVERFLOWS.inc()
             log("audio_status", str(status), level="warn")
-        self._queue.put(indata[:, 0].copy())
+        self._ring.write(indata[:, 0])
+
+    def depth(self) -> int:
+        """Number of blocks waiting to be read."""
+        return self._ring.depth()
+
+    def stats(self) -> dict:
+        """Capture counters: blocks written and dropped, high-water mark, lag."""
+        return self._ring.stats()
 
     def start(self) -> None:
+        import sounddevice as sd
+
         log(
             "audio_start",
             f"device={self._device}, rate={SAMPLE_RATE}, block={BLOCK_SIZE}",
@@ -38,15 +56,25 @@ class AudioCapture:
         )
         self._stream.start()
 
-    def read(self, timeout: float = 1.0) -> np.ndarray | None:
-        try:
-            return self._queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
+    def read_batch(self, max_blocks: int, timeout: float = 1.0) -> list[np.ndarray]:
+        """Wait for one block, then take any others already queued behind it.
+
+        Blocks are views into the capture ring, valid until the next call.
+        """
+        blocks = list(self._ring.read(max_blocks, timeout))
+        dropped = self._ring.dropped_samples
+        if dropped != self._reported_drops:
+            _DROPPED_SAMPLES.inc(dropped - self._reported_drops)
+            self._reported_drops = dropped
+            _RING_OVERFLOWS.inc()
+            log(
+                "audio_dropped", "capture ring overflowed", level="warn", **self.stats()
+            )
+        return blocks
 
     def stop(self) -> None:
         if self._stream:
             self._stream.stop()
             self._stream.close()
             self._stream = None
-            log("audio_stop")
+            log("audio_stop", **self.stats())
@@ -0,0 +1,325 @@
+"""Micro-benchmarks of the voice hot paths, checked against a stored baseline.
+
+Runs on Linux with no mic and no GPU; model benchmarks are skipped when the
+model isn't in the models dir (see setup_models.py).  Each benchmark reports
+median time per call and, from traced passes, the peak bytes allocated
+during a call and the memory blocks each call allocates.
+
+Without a baseline, or with --save, the results become the baseline.
+Otherwise the run fails when a benchmark is slower, allocates more at peak,
+or allocates more blocks than its baseline by more than --threshold (a
+fraction).
+
+uv run --project src/commands/voice/python --extra runtime \\
+    python src/commands/voice/python/bench.py [-k vad] [--save] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+
+DEFAULT_BASELINE = os.path.expanduser("~/.assist/voice/bench_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+REPEATS = 7
+REPEAT_SECONDS = 0.05  # calls per repeat are scaled to take at least this
+TRACED_CALLS = 20
+ALLOC_SLACK_BYTES = 1024  # so tiny baselines don't fail on noise
+ALLOC_SLACK_COUNT = 1  # likewise, in blocks per call
+
+# name -> setup returning the call to time
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {}
+
+SENTENCE = (
+    "please open the settings file and change the default model to the small "
+    "one then run the tests again and tell me which of them failed"
+)
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _speech_like(samples: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(samples) / 16000
+    tone = 0.3 * np.sin(2 * np.pi * 180 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    return (tone + rng.normal(0, 0.02, samples)).astype(np.float32)
+
+
+@benchmark("vad.process")
+def _vad():
+    from vad import SileroVAD
+
+    vad = SileroVAD()
+    block = _speech_like(512)
+    return lambda: vad.process(block)
+
+
+@benchmark("smart_turn.features")
+def _smart_turn_features():
+    from log_mel import log_mel
+    from smart_turn import CHUNK_SECONDS
+
+    window = _speech_like(CHUNK_SECONDS * 16000)
+    return lambda: log_mel(window)
+
+
+@benchmark("smart_turn.inference")
+def _smart_turn_inference():
+    from log_mel import log_mel
+    from smart_turn import CHUNK_SECONDS, SmartTurn
+
+    model = SmartTurn()
+    features = log_mel(_speech_like(CHUNK_SECONDS * 16000))
+    return lambda: model.probability(features)
+
+
+@benchmark("smart_turn.mel_stream.check")
+def _mel_stream_check():
+    """A turn check on a growing utterance: mel frames for the last 200 ms."""
+    from log_mel import MelStream
+    from smart_turn import CHUNK_SECONDS
+
+    audio = _speech_like(60 * 16000)
+    step = 16000 // 5
+    state = {"mel": MelStream(CHUNK_SECONDS * 16000), "end": 0}
+
+    def check():
+        if state["end"] + step > len(audio):
+            state["mel"], state["end"] = MelStream(CHUNK_SECONDS * 16000), 0
+        state["end"] += step
+        return state["mel"].update(audio[: state["end"]])
+
+    return check
+
+
+@benchmark("wake_word.get_wake_words")
+def _get_wake_words():
+    from wake_word import get_wake_words
+
+    return get_wake_words
+
+
+@benchmark("wake_word.check.hit")
+def _check_hit():
+    from wake_word import check_wake_word
+
+    text = f"computer {SENTENCE}"
+    return lambda: check_wake_word(text)
+
+
+@benchmark("wake_word.check.miss")
+def _check_miss():
+    from wake_word import check_wake_word
+
+    return lambda: check_wake_word(SENTENCE)
+
+
+@benchmark("typing.word_edit")
+def _word_edit():
+    """A long transcript whose last words are revised, as partials are."""
+    from text_diff import word_edit
+
+    typed = " ".join([SENTENCE] * 8)
+    revised = typed.rsplit(" ", 3)[0] + " which ones failed"
+    return lambda: word_edit(typed, revised)
+
+
+@benchmark("typing.merge_edits")
+def _merge_edits():
+    from text_diff import merge_edits
+
+    first, second = (0, SENTENCE), (12, "them passed")
+    return lambda: merge_edits(first, second)
+
+
+@benchmark("logger.log")
+def _log():
+    import logger
+
+    def call():
+        logger.log("bench", "partial text", trace=1, seconds=0.012)
+
+    return call
+
+
+def _calls(fn: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """Traced blocks, without those of earlier snapshots."""
+    ignore = tracemalloc.Filter(False, tracemalloc.__file__)
+    return tracemalloc.take_snapshot().filter_traces([ignore])
+
+
+def _allocation_count(fn: Callable[[], object]) -> float:
+    """Blocks allocated per call, counting those it returns.
+
+    Every result is kept until the count is taken, so nothing a call hands
+    back is freed first; temporaries it frees itself show in the peak.
+    """
+    results: list[object] = [None] * TRACED_CALLS
+    _snapshot()  # the first one compiles the filter's pattern, which would count
+    start = _snapshot()
+    for i in range(TRACED_CALLS):
+        results[i] = fn()
+    grown = _snapshot().compare_to(start, "lineno")
+    del results
+    return round(sum(max(0, s.count_diff) for s in grown) / TRACED_CALLS, 2)
+
+
+def _allocations(fn: Callable[[], object]) -> dict:
+    """Peak bytes during a call, blocks allocated and bytes kept per call."""
+    tracemalloc.start()
+    fn()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(TRACED_CALLS):
+        fn()
+    after, peak = tracemalloc.get_traced_memory()
+    count = _allocation_count(fn)
+    tracemalloc.stop()
+    return {
+        "alloc_peak_b": max(0, peak - before),
+        "alloc_count": count,
+        "retained_b": round((after - before) / TRACED_CALLS),
+    }
+
+
+def measure(fn: Callable[[], object]) -> dict:
+    """Median seconds per call over REPEATS, plus allocations."""
+    import logger
+
+    fn()  # warm-up
+    number = 1
+    while _calls(fn, number) < REPEAT_SECONDS and number < 1 << 20:
+        number *= 2
+    times = []
+    for _ in range(REPEATS):
+        times.append(_calls(fn, number) / number)
+        logger.flush()  # keep the log queue from filling (and dropping)
+    return {
+        "time_us": round(statistics.median(times) * 1e6, 3),
+        "min_us": round(min(times) * 1e6, 3),
+        "calls": number * REPEATS,
+        **_allocations(fn),
+    }
+
+
+def compare(result: dict, base: dict | None, threshold: float) -> list[str]:
+    """Regressions of ``result`` against its baseline entry."""
+    if not base:
+        return []
+    problems = []
+    if result["time_us"] > base["time_us"] * (1 + threshold):
+        problems.append(f"time {base['time_us']} -> {result['time_us']} us")
+    limit = base["alloc_peak_b"] * (1 + threshold) + ALLOC_SLACK_BYTES
+    if result["alloc_peak_b"] > limit:
+        problems.append(f"peak {base['alloc_peak_b']} -> {result['alloc_peak_b']} B")
+    if "alloc_count" in base:  # older baselines don't have it
+        limit = base["alloc_count"] * (1 + threshold) + ALLOC_SLACK_COUNT
+        if result["alloc_count"] > limit:
+            problems.append(
+                f"allocations {base['alloc_count']} -> {result['alloc_count']} per call"
+            )
+    return problems
+
+
+def run(names: list[str]) -> dict:
+    results = {}
+    for name in names:
+        try:
+            fn = BENCHMARKS[name]()
+        except (OSError, ImportError, RuntimeError) as exc:  # model not downloaded
+            results[name] = {"skipped": str(exc).splitlines()[0]}
+            continue
+        results[name] = measure(fn)
+    return results
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def _report(results: dict, baseline: dict, threshold: float) -> list[str]:
+    failures = []
+    print(f"{'benchmark':40s} {'time_us':>10s} {'peak_B':>9s} {'allocs':>7s}")
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:40s} skipped: {result['skipped']}")
+            continue
+        problems = compare(result, baseline.get(name), threshold)
+        failures += [f"{name}: {p}" for p in problems]
+        print(
+            f"{name:40s} {result['time_us']:10.2f} {result['alloc_peak_b']:9d} "
+            f"{result['alloc_count']:7.2f}{'  REGRESSED' if problems else ''}"
+        )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", default="", help="only benchmarks containing this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="write a new baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown before failing, as a fraction (0.25 = 25%%)",
+    )
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    # Benchmarks log heavily; keep that out of the real voice.log
+    bench_dir = tempfile.mkdtemp(prefix="voice-bench-")
+    os.environ.setdefault("VOICE_LOG_FILE", os.path.join(bench_dir, "voice.log"))
+
+    results = run([name for name in BENCHMARKS if args.k in name])
+    baseline: dict = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    failures = _report(results, baseline.get("results", {}), args.threshold)
+
+    report = {"environment": _environment(), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save or not baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline.get("environment") != report["environment"]:
+        print("\nWarning: baseline was recorded in a different environment")
+    if failures:
+        print("\nRegressions:\n  " + "\n  ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
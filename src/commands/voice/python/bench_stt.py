@@ -0,0 +1,105 @@
+"""Compare STT backends on WAV files by real-time factor and word error rate.
+
+A WAV may have its reference transcript alongside it (``a.wav`` -> ``a.txt``);
+the ONNX backends are also scored against the NeMo transcription.
+
+uv run --project src/commands/voice/python --extra runtime \\
+    python src/commands/voice/python/bench_stt.py a.wav b.wav \\
+    --onnx parakeet-ctc/model.onnx --onnx parakeet-ctc/model.int8.onnx
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+from logger import log
+from stt import DEFAULT_MODEL, ParakeetSTT
+from stt_onnx import OnnxSTT, model_path
+from wav_source import read_wav
+
+
+def _words(text: str) -> list[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def _word_errors(ref: list[str], hyp: list[str]) -> int:
+    """Word-level edit distance (substitutions + insertions + deletions)."""
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1]
+
+
+def wer(refs: list[str], hyps: list[str]) -> float:
+    """Corpus word error rate of ``hyps`` against ``refs``."""
+    pairs = [(_words(r), _words(h)) for r, h in zip(refs, hyps)]
+    words = sum(len(r) for r, _ in pairs)
+    return sum(_word_errors(r, h) for r, h in pairs) / max(words, 1)
+
+
+def _reference(path: str) -> str | None:
+    txt = os.path.splitext(path)[0] + ".txt"
+    if not os.path.exists(txt):
+        return None
+    with open(txt, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def _bench(factory, clips: list) -> dict:
+    start = time.monotonic()
+    model = factory()
+    load = time.monotonic() - start
+    model.transcribe(clips[0][:16000])  # warm-up
+    texts = []
+    start = time.monotonic()
+    for audio in clips:
+        texts.append(model.transcribe(audio))
+    seconds = time.monotonic() - start
+    audio_seconds = sum(len(audio) for audio in clips) / 16000
+    return {
+        "load_s": round(load, 1),
+        "rtf": round(seconds / audio_seconds, 4),
+        "texts": texts,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="16-bit PCM WAV files")
+    parser.add_argument(
+        "--onnx", action="append", default=[], help="exported model (repeatable)"
+    )
+    parser.add_argument("--nemo", default=DEFAULT_MODEL, help="NeMo model name")
+    parser.add_argument("--no-nemo", action="store_true", help="skip the NeMo path")
+    args = parser.parse_args()
+
+    clips = [read_wav(path) for path in args.files]
+    refs = [_reference(path) for path in args.files]
+    backends = {} if args.no_nemo else {"nemo": lambda: ParakeetSTT(args.nemo)}
+    for name in args.onnx:
+        backends[name] = lambda name=name: OnnxSTT(model_path(name))
+
+    results = {name: _bench(factory, clips) for name, factory in backends.items()}
+    nemo = results.get("nemo")
+    for name, result in results.items():
+        if all(ref is not None for ref in refs):
+            result["wer"] = round(wer(refs, result["texts"]), 4)
+        if nemo and name != "nemo":
+            result["wer_vs_nemo"] = round(wer(nemo["texts"], result["texts"]), 4)
+
+    log("stt_benchmark", f"{len(clips)} files", **results)
+    print(f"{'backend':40s} {'load s':>7s} {'RTF':>8s} {'WER':>7s} {'vs NeMo':>8s}")
+    for name, r in results.items():
+        scores = [f"{r[k]:.2%}" if k in r else "-" for k in ("wer", "wer_vs_nemo")]
+        print(
+            f"{name:40s} {r['load_s']:7.1f} {r['rtf']:8.4f} {scores[0]:>7s} {scores[1]:>8s}"
+        )
+    print(json.dumps({name: r["texts"] for name, r in results.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
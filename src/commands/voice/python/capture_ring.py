@@ -0,0 +1,85 @@
+"""Preallocated single-producer/single-consumer ring of fixed-size audio frames."""
+
+import threading
+
+import numpy as np
+
+
+class CaptureRing:
+    """Frames written by the audio callback, read as zero-copy views.
+
+    The producer only advances ``_write`` and the consumer only ``_read``, so
+    neither blocks the other; each counter is one int, which CPython stores
+    atomically.  Frames handed out by ``read`` stay reserved until the next
+    ``read``, so a reader that keeps a frame longer must copy it.
+
+    When the reader is a whole ring behind, incoming audio is dropped (and
+    counted) rather than overwriting frames the reader may still hold.
+    """
+
+    def __init__(self, frames: int, frame_size: int):
+        self._data = np.zeros((frames, frame_size), dtype=np.float32)
+        self._frames = frames
+        self._frame_size = frame_size
+        self._write = 0  # frames published; producer only
+        self._fill = 0  # samples in the frame being written; producer only
+        self._read = 0  # frames released; consumer only
+        self._taken = 0  # end of the batch the consumer holds
+        self._ready = threading.Event()
+        # Counters: frames written, samples dropped, deepest backlog (frames)
+        self.written = 0
+        self.dropped_samples = 0
+        self.high_water = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """Producer: copy ``samples`` in, without allocating."""
+        n, i = len(samples), 0
+        while i < n:
+            if self._write - self._read >= self._frames:
+                self.dropped_samples += n - i
+                break
+            slot = self._data[self._write % self._frames]
+            take = min(self._frame_size - self._fill, n - i)
+            slot[self._fill : self._fill + take] = samples[i : i + take]
+            self._fill += take
+            i += take
+            if self._fill == self._frame_size:
+                self._fill = 0
+                self._write += 1
+                self.written += 1
+        self.high_water = max(self.high_water, self._write - self._read)
+        self._ready.set()
+
+    def depth(self) -> int:
+        """Frames written but not yet read (the reader's lag)."""
+        return self._write - self._taken
+
+    def read(self, max_frames: int, timeout: float) -> np.ndarray:
+        """Consumer: release the previous batch and return up to ``max_frames``.
+
+        Waits up to ``timeout`` for the first frame.  The result is a
+        ``(k, frame_size)`` view of the ring, valid until the next call.
+        """
+        self._read = self._taken
+        if self._write == self._read:
+            self._ready.clear()
+            if self._write == self._read and not self._ready.wait(timeout):
+                return self._data[:0]
+        start = self._read % self._frames
+        # Never past the end of the backing array, so always one slice
+        k = min(self._write - self._read, max_frames, self._frames - start)
+        self._taken = self._read + k
+        return self._data[start : start + k]
+
+    @property
+    def dropped(self) -> int:
+        """Frames' worth of audio dropped."""
+        return -(-self.dropped_samples // self._frame_size)
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "high_water": self.high_water,
+            "lag": self.depth(),
+        }
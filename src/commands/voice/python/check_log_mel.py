@@ -0,0 +1,66 @@
+"""Check log_mel against transformers' WhisperFeatureExtractor.
+
+Needs the runtime extra (transformers comes in with NeMo):
+uv run --project src/commands/voice/python --extra runtime \
+    python src/commands/voice/python/check_log_mel.py
+"""
+
+import sys
+
+import numpy as np
+from transformers import WhisperFeatureExtractor
+
+from log_mel import MelStream, log_mel
+from smart_turn import CHUNK_SECONDS, SAMPLE_RATE
+
+TOLERANCE = 1e-4
+WINDOW = CHUNK_SECONDS * SAMPLE_RATE
+
+extractor = WhisperFeatureExtractor(chunk_length=CHUNK_SECONDS)
+
+
+def last_window(utterance: np.ndarray) -> np.ndarray:
+    window = np.zeros(WINDOW, dtype=np.float32)
+    tail = utterance[-WINDOW:]
+    window[WINDOW - len(tail) :] = tail
+    return window
+
+
+def reference(window: np.ndarray) -> np.ndarray:
+    return extractor(
+        window,
+        sampling_rate=SAMPLE_RATE,
+        return_tensors="np",
+        padding="max_length",
+        max_length=WINDOW,
+        truncation=True,
+        do_normalize=True,
+    ).input_features[0]
+
+
+rng = np.random.default_rng(0)
+n = 20 * SAMPLE_RATE
+envelope = np.sin(np.arange(n) / 3000.0) ** 2
+utterance = (0.1 * rng.standard_normal(n) * envelope + 0.01).astype(np.float32)
+
+failed = []
+stream = MelStream(WINDOW)
+for length in (4000, 20000, 20480, 50000, WINDOW, 130560, 200000, n):
+    # MelStream ends its window on the last full hop
+    window = last_window(utterance[: length - length % 160])
+    expected = reference(window)
+    checks = {
+        "log_mel": log_mel(window),
+        "MelStream": stream.update(utterance[:length]),
+    }
+    for name, actual in checks.items():
+        error = float(np.abs(actual - expected).max())
+        if actual.shape != expected.shape or error > TOLERANCE:
+            failed.append((name, length, error))
+
+if failed:
+    print("log_mel differs from WhisperFeatureExtractor:")
+    for name, length, error in failed:
+        print(f"  {name} at {length} samples - max abs error {error:.2e}")
+    sys.exit(1)
+print("log_mel matches WhisperFeatureExtractor")
@@ -0,0 +1,141 @@
+"""Typing the command out of transcriptions as they stream in."""
+
+import sys
+
+from logger import DEBUG, log
+from text_diff import word_edit
+from wake_word import check_wake_word, get_wake_words
+from windows import foreground_window_info
+
+
+class CommandTyper:
+    """Types the command after the wake word, correcting it as partials change.
+
+    All keystrokes go through the ``KeystrokeQueue``; the Enter decision runs
+    on its thread, after the typing queued before it.
+    """
+
+    def __init__(self, keys, submit_windows: set[str]):
+        self._keys = keys
+        self.submit_windows = submit_windows
+        self.wake_words = get_wake_words()
+        self.typed = ""
+        self.wake_detected = False
+
+    def reset(self) -> None:
+        self.typed = ""
+        self.wake_detected = False
+
+    def _update(self, new_text: str) -> None:
+        """Edit the typed text into ``new_text`` with minimal deletions."""
+        self._keys.edit(*word_edit(self.typed, new_text))
+        self.typed = new_text
+
+    def _erase(self) -> None:
+        if self.typed:
+            self._keys.backspace(len(self.typed))
+
+    def _should_submit(self) -> bool:
+        """Check if the foreground window matches the submit allowlist.
+
+        The allowlist names Windows processes; elsewhere there is no
+        portable way to find the focused window, so commands always submit.
+        """
+        if not self.submit_windows or sys.platform != "win32":
+            return True
+        info = foreground_window_info()
+        process_name = info.split(":")[0].strip() if ":" in info else ""
+        return process_name in self.submit_windows
+
+    def _dispatch(self, text: str) -> None:
+        """Log and optionally submit a recognized command.
+
+        Runs on the keystroke thread, after the typing queued before it.
+        """
+        should_submit = self._should_submit()
+        if should_submit:
+            log("dispatch_enter", text)
+            if DEBUG:
+                print(f"  Final: {text} [Enter]", file=sys.stderr)
+            self._keys.send_enter()
+        else:
+            log("dispatch_typed", text)
+            if DEBUG:
+                print(f"  Final: {text} (no submit)", file=sys.stderr)
+
+    def partial(self, text: str, activated: bool) -> None:
+        """Type a partial transcription incrementally."""
+        if not text.strip():
+            return
+
+        if DEBUG:
+            print(f"\n  Partial: {text}", file=sys.stderr)
+
+        if activated:
+            # Already activated — everything is the command, no wake word needed
+            partial = text.strip()
+            if partial and partial != self.typed:
+                self._update(partial)
+        elif not self.wake_detected:
+            found, command = check_wake_word(text, self.wake_words)
+            if found and command:
+                self.wake_detected = True
+                log("wake_word_detected", command)
+                if DEBUG:
+                    print(f"  Wake word! Typing: {command}", file=sys.stderr)
+                self._update(command)
+        else:
+            found, command = check_wake_word(text, self.wake_words)
+            if found and command and command != self.typed:
+                self._update(command)
+
+    def final_command(self, text: str) -> None:
+        """Finalize utterance in ACTIVATED state (full text is the command)."""
+        command = text.strip()
+        if command:
+            if command != self.typed:
+                self._update(command)
+            self._keys.put(self._dispatch, command)
+        else:
+            self._erase()
+            log("dispatch_cancelled", "Empty command in activated mode")
+
+    def final_streamed(self, text: str) -> None:
+        """Finalize when wake word was detected during streaming."""
+        found, command = check_wake_word(text, self.wake_words)
+        if found and command:
+            if command != self.typed:
+                self._update(command)
+            self._keys.put(self._dispatch, command)
+        elif found:
+            self._erase()
+            log("dispatch_cancelled", "No command after wake word")
+        elif self.typed:
+            # Final transcription lost the wake word (e.g. audio clipping
+            # turned "computer" into "uter"); fall back to the command
+            # captured during streaming
+            self._keys.put(self._dispatch, self.typed)
+
+    def final_text(self, text: str) -> bool:
+        """Check final transcription for wake word.
+
+        Returns False if it was the wake word alone (the caller should wait
+        for the command in ACTIVATED state).
+        """
+        found, command = check_wake_word(text, self.wake_words)
+        if found and command:
+            log("wake_word_detected", command)
+            if DEBUG:
+                print(f"  Wake word! Final: {command}", file=sys.stderr)
+            self._update(command)
+            self._keys.put(self._dispatch, command)
+        if found and not command:
+            log("wake_word_only", "Listening for command...")
+            if DEBUG:
+                print("  Wake word heard — listening for command...", file=sys.stderr)
+            return False
+        if not found:
+            log("no_wake_word", text)
+            if DEBUG:
+                print(f"  No wake word: {text}", file=sys.stderr)
+        return True
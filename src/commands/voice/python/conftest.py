@@ -0,0 +1,9 @@
+"""Shared pytest setup: log records go to a scratch file, not voice.log."""
+
+import os
+import tempfile
+
+# logger reads these at import, so set them before any test module loads it
+_LOG_DIR = tempfile.mkdtemp(prefix="voice-test-")
+os.environ["VOICE_LOG_FILE"] = os.path.join(_LOG_DIR, "voice.log")
+os.environ.pop("VOICE_LOG_DB", None)
@@ -0,0 +1,145 @@
+"""Energy pre-gate that lets the idle VAD skip Silero in a quiet room.
+
+Each block's energy, pre-emphasized so hum and rumble don't count, is
+compared with an adaptive noise floor.  Blocks clearly below it (``skip``)
+don't need Silero; every AUDIT_EVERY-th quiet block runs anyway (``audit``)
+to measure how often the gate is wrong: an audited block Silero calls speech
+is a miss.  Anything near or above the floor (``pass``), and the HANGOVER
+blocks after it, run Silero, so the gaps between syllables are scored as
+usual.  A run that follows a skip first replays the PREROLL blocks before
+it (see ``SileroVAD``); that is counted against the CPU saved.
+"""
+
+import os
+
+import numpy as np
+
+from logger import log
+from metrics import counter
+
+PRE_EMPHASIS = 0.97  # first-order high-pass, as speech front ends use
+MARGIN_DB = 6.0  # blocks under floor + MARGIN_DB are quiet
+AUDIT_EVERY = 32  # consecutive quiet blocks (~1 s) per audit
+# Blocks replayed from a reset state before a run that follows a skip.  In
+# replay 4 already scored onsets as high as the ungated model; 8 adds margin.
+PREROLL = 8
+HANGOVER = 8  # blocks (~0.25 s) after a loud one that always run Silero
+SILENT_DB = -100.0  # digital silence (muted mic, padding): quiet, not the floor
+
+# Floor tracking, per block in dB: falls fast to a quieter room, rises slowly
+# (~15 s) so a long stretch of non-speech noise raises it but speech cannot
+FLOOR_FALL = 0.1
+FLOOR_RISE = 0.002
+
+REPORT_BLOCKS = 1875  # ~60 s of gated audio between vad_gate log records
+
+SKIP, AUDIT, PASS = "skip", "audit", "pass"
+
+DECISIONS = counter(
+    "voice_vad_gate_blocks_total", "Idle blocks by energy gate decision", ("decision",)
+)
+MISSES = counter(
+    "voice_vad_gate_misses_total", "Audited quiet blocks Silero scored as speech"
+)
+SAVED = counter(
+    "voice_vad_gate_saved_seconds_total",
+    "Silero CPU time skipped, net of the gate's own time",
+)
+
+
+def gate_enabled() -> bool:
+    return os.environ.get("VOICE_VAD_GATE", "1") != "0"
+
+
+class EnergyGate:
+    """Adaptive-floor energy gate, plus the stats for its ``vad_gate`` log."""
+
+    def __init__(self):
+        self.floor_db: float | None = None
+        self._quiet = 0  # consecutive quiet blocks
+        self._hold = 0  # hangover blocks left
+        self._run_seconds = 0.0  # mean Silero run, to price blocks
+        self._decisions = {d: DECISIONS.labels(d) for d in (SKIP, AUDIT, PASS)}
+        self._misses = MISSES.labels()
+        self._saved = SAVED.labels()
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._counts = dict.fromkeys((SKIP, AUDIT, PASS), 0)
+        self._missed = 0
+        self._replayed = 0
+        self._gate_seconds = 0.0
+
+    @staticmethod
+    def levels(blocks: np.ndarray) -> np.ndarray:
+        """Pre-emphasized energy in dB of each row of ``blocks``, vectorized.
+
+        A windowed FFT band energy separates speech slightly better but costs
+        several times this, which eats into what skipping Silero saves.
+        """
+        emphasized = blocks[:, 1:] - PRE_EMPHASIS * blocks[:, :-1]
+        power = np.einsum("ij,ij->i", emphasized, emphasized) / emphasized.shape[1]
+        return 10 * np.log10(power + 1e-12)
+
+    def decide(self, level: float) -> str:
+        floor = SILENT_DB if self.floor_db is None else self.floor_db
+        if level >= floor + MARGIN_DB:
+            self._quiet, self._hold = 0, HANGOVER
+            return PASS
+        if self._hold:
+            self._hold -= 1
+            return PASS
+        self._quiet += 1
+        return AUDIT if self._quiet % AUDIT_EVERY == 0 else SKIP
+
+    def observe(self, level: float, decision: str, speech: bool) -> None:
+        """Track the floor from non-speech blocks and count the decision."""
+        if speech:
+            if decision == AUDIT:
+                self._missed += 1
+                self._misses.inc()
+        elif level > SILENT_DB:
+            if self.floor_db is None:
+                self.floor_db = level
+            rate = FLOOR_FALL if level < self.floor_db else FLOOR_RISE
+            self.floor_db += rate * (level - self.floor_db)
+        self._counts[decision] += 1
+        self._decisions[decision].inc()
+
+    def timed(
+        self, gate_seconds: float, run_seconds: float, runs: int, replayed: int
+    ) -> None:
+        """Account one batch: time spent gating, and Silero's time per run.
+
+        ``runs`` counts the blocks scored; ``replayed`` the pre-roll blocks
+        run before them, which ``run_seconds`` also includes.
+        """
+        self._gate_seconds += gate_seconds
+        self._replayed += replayed
+        runs += replayed
+        if runs:
+            mean = run_seconds / runs
+            if self._run_seconds:
+                self._run_seconds += 0.05 * (mean - self._run_seconds)
+            else:
+                self._run_seconds = mean
+        if sum(self._counts.values()) >= REPORT_BLOCKS:
+            self._report()
+
+    def _report(self) -> None:
+        counts, audits = self._counts, self._counts[AUDIT]
+        runs_saved = counts[SKIP] - self._replayed
+        saved = runs_saved * self._run_seconds - self._gate_seconds
+        self._saved.inc(max(saved, 0.0))
+        log(
+            "vad_gate",
+            f"skipped {counts[SKIP]} of {sum(counts.values())} Silero runs",
+            **counts,
+            replayed=self._replayed,
+            misses=self._missed,
+            miss_rate=round(self._missed / audits, 4) if audits else 0.0,
+            cpu_saved_s=round(saved, 3),
+            gate_s=round(self._gate_seconds, 3),
+            floor_db=round(self.floor_db or 0.0, 1),
+        )
+        self._reset_stats()
@@ -0,0 +1,99 @@
+"""Export a NeMo Parakeet CTC model to ONNX for the onnxruntime backend."""
+
+import json
+import os
+
+import numpy as np
+
+from logger import log
+from nemo_features import NemoFeatures
+from stt_onnx import CONFIG_FILE
+
+FP32_FILE = "model.onnx"
+
+# Features further than this from NeMo's own preprocessor fail the export
+MAX_FEATURE_ERROR = 1e-3
+
+
+def _restore(source: str):
+    """Load from a local .nemo file, or by name (the local cache if present)."""
+    import nemo.collections.asr as nemo_asr
+
+    model_class = nemo_asr.models.EncDecCTCModelBPE
+    if source.endswith(".nemo"):
+        return model_class.restore_from(source, map_location="cpu")
+    return model_class.from_pretrained(source, map_location="cpu")
+
+
+def _preprocessor_config(model) -> dict:
+    cfg = model.cfg.preprocessor
+    return {
+        "sample_rate": cfg.sample_rate,
+        "n_fft": cfg.n_fft,
+        "window_size": cfg.window_size,
+        "window_stride": cfg.window_stride,
+        "features": cfg.features,
+        "preemph": cfg.get("preemph", 0.97),
+        "normalize": cfg.normalize,
+    }
+
+
+def _check_features(model, features: NemoFeatures) -> float:
+    """Max difference between NumPy and NeMo features on a test signal."""
+    import torch
+
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(3 * 16000) * 0.1).astype(np.float32)
+    with torch.no_grad():
+        ref, ref_len = model.preprocessor(
+            input_signal=torch.from_numpy(audio)[None],
+            length=torch.tensor([len(audio)]),
+        )
+    ref = ref[0, :, : int(ref_len[0])].numpy()
+    return float(np.abs(ref - features(audio)).max())
+
+
+def _quantize(source: str, target: str) -> None:
+    """Dynamic int8 weights for the MatMuls, where the encoder spends its time."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        source,
+        target,
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"],
+        per_channel=True,
+    )
+
+
+def export(source: str, target: str) -> None:
+    """Write ``target`` (``*.int8.onnx`` is quantized) plus its config.
+
+    Exports into ``target``'s directory, which also holds the fp32 model and
+    its external weight files (Parakeet 1.1b is over protobuf's 2 GB limit).
+    """
+    out_dir = os.path.dirname(target)
+    os.makedirs(out_dir, exist_ok=True)
+    model = _restore(source)
+    model.eval()
+
+    preprocessor = _preprocessor_config(model)
+    error = _check_features(model, NemoFeatures(**preprocessor))
+    if error > MAX_FEATURE_ERROR:
+        raise RuntimeError(f"NumPy features differ from NeMo's by {error:.2e}")
+
+    fp32 = os.path.join(out_dir, FP32_FILE)
+    if not os.path.exists(fp32):
+        model.export(fp32)
+    # Id-ordered pieces; the CTC blank is the class after the last one
+    vocabulary = list(model.tokenizer.vocab)
+    if len(vocabulary) != model.decoder.num_classes_with_blank - 1:
+        raise RuntimeError(f"{source}: vocabulary does not match the CTC head")
+    config = {"source": source, "preprocessor": preprocessor, "vocabulary": vocabulary}
+    with open(os.path.join(out_dir, CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    if target != fp32:
+        if ".int8." not in os.path.basename(target):
+            raise ValueError(f"{target}: expected {FP32_FILE} or *.int8.onnx")
+        _quantize(fp32, target)
+    log("setup_stt_onnx", f"Exported {source} to {target}", feature_error=error)
@@ -2,8 +2,12 @@
 
 import ctypes
 import ctypes.wintypes as w
+import sys
 
-user32 = ctypes.windll.user32
+from logger import log
+
+# Importable elsewhere (e.g. for replay on Linux); only sending needs Windows
+user32 = ctypes.windll.user32 if sys.platform == "win32" else None
 
 INPUT_KEYBOARD = 1
 KEYEVENTF_UNICODE = 0x0004
@@ -44,30 +48,50 @@ class INPUT(ctypes.Structure):
     _fields_ = [("type", w.DWORD), ("_input", _INPUT)]
 
 
-def _send_key(vk: int = 0, scan: int = 0, flags: int = 0) -> None:
+def _key(vk: int = 0, scan: int = 0, flags: int = 0) -> INPUT:
     inp = INPUT(type=INPUT_KEYBOARD)
     inp.ki.wVk = vk
     inp.ki.wScan = scan
     inp.ki.dwFlags = flags
-    user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+    return inp
+
+
+def _tap(vk: int = 0, scan: int = 0, flags: int = 0) -> list[INPUT]:
+    return [_key(vk, scan, flags), _key(vk, scan, flags | KEYEVENTF_KEYUP)]
+
+
+def _send(inputs: list[INPUT]) -> None:
+    """Inject all of ``inputs`` with a single ``SendInput`` call."""
+    if not inputs:
+        return
+    array = (INPUT * len(inputs))(*inputs)
+    sent = user32.SendInput(len(inputs), array, ctypes.sizeof(INPUT))
+    if sent != len(inputs):
+        log("keystroke_error", f"SendInput sent {sent}/{len(inputs)}", level="error")
+
+
+def edit(backspaces: int, text: str) -> None:
+    """Press backspace ``backspaces`` times, then type ``text``, as one batch."""
+    inputs = []
+    for _ in range(backspaces):
+        inputs += _tap(vk=VK_BACK, scan=SCAN_BACK)
+    # UTF-16 code units, so characters outside the BMP go as surrogate pairs
+    units = memoryview(text.encode("utf-16-le")).cast("H")
+    for unit in units:
+        inputs += _tap(scan=unit, flags=KEYEVENTF_UNICODE)
+    _send(inputs)
 
 
 def type_text(text: str) -> None:
     """Type a string by sending Unicode keystrokes."""
-    for ch in text:
-        code = ord(ch)
-        _send_key(scan=code, flags=KEYEVENTF_UNICODE)
-        _send_key(scan=code, flags=KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)
+    edit(0, text)
 
 
 def backspace(n: int = 1) -> None:
     """Press backspace n times."""
-    for _ in range(n):
-        _send_key(vk=VK_BACK, scan=SCAN_BACK)
-        _send_key(vk=VK_BACK, scan=SCAN_BACK, flags=KEYEVENTF_KEYUP)
+    edit(n, "")
 
 
 def press_enter() -> None:
     """Press the Enter key."""
-    _send_key(vk=VK_RETURN, scan=SCAN_RETURN)
-    _send_key(vk=VK_RETURN, scan=SCAN_RETURN, flags=KEYEVENTF_KEYUP)
+    _send(_tap(vk=VK_RETURN, scan=SCAN_RETURN))
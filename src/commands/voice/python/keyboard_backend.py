@@ -0,0 +1,76 @@
+"""Keystroke backends: where the daemon's typing ends up.
+
+A backend has ``edit(backspaces, text)``, which injects a whole edit as one
+batch, and ``press_enter()``.
+"""
+
+import os
+import sys
+import threading
+import time
+
+BACKENDS = ("sendinput", "uinput", "recording")
+
+
+def load_keyboard():
+    """Backend named by ``VOICE_KEYBOARD``, defaulting to the platform's own."""
+    default = "sendinput" if sys.platform == "win32" else "uinput"
+    name = os.environ.get("VOICE_KEYBOARD", default)
+    if name == "sendinput":
+        import keyboard
+
+        return keyboard
+    if name == "uinput":
+        from keyboard_uinput import UinputKeyboard
+
+        return UinputKeyboard()
+    if name == "recording":
+        return RecordingKeyboard()
+    raise ValueError(f"VOICE_KEYBOARD must be one of {BACKENDS}, got {name!r}")
+
+
+class SharedKeyboard:
+    """One backend shared by several keystroke queues, one call at a time.
+
+    A backend may inject an edit in several writes (see ``keyboard_uinput``),
+    so without the lock two streams' edits could interleave mid-word.
+    """
+
+    def __init__(self, sink):
+        self._sink = sink
+        self._lock = threading.Lock()
+
+    def edit(self, backspaces: int, text: str) -> None:
+        with self._lock:
+            self._sink.edit(backspaces, text)
+
+    def press_enter(self) -> None:
+        with self._lock:
+            self._sink.press_enter()
+
+
+class RecordingKeyboard:
+    """Backend that records timestamped edits in memory instead of sending them."""
+
+    def __init__(self):
+        self.events: list[tuple[float, str, object]] = []
+        self.text = ""
+        self.submitted: list[str] = []
+        self.keystrokes = 0  # key taps a real backend would have injected
+
+    def edit(self, backspaces: int, text: str) -> None:
+        self.events.append((time.monotonic(), "edit", (backspaces, text)))
+        self.keystrokes += backspaces + len(text)
+        self.text = self.text[: max(0, len(self.text) - backspaces)] + text
+
+    def type_text(self, text: str) -> None:
+        self.edit(0, text)
+
+    def backspace(self, n: int = 1) -> None:
+        self.edit(n, "")
+
+    def press_enter(self) -> None:
+        self.events.append((time.monotonic(), "enter", None))
+        self.keystrokes += 1
+        self.submitted.append(self.text)
+        self.text = ""
@@ -0,0 +1,116 @@
+"""Simulate keyboard input on Linux through a uinput virtual keyboard.
+
+Works under X11 and Wayland alike (the events come from a kernel device), but
+needs write access to /dev/uinput.  Characters map to keys of a US layout;
+anything else cannot be typed and is logged.
+"""
+
+import fcntl
+import os
+import struct
+import time
+
+from logger import log
+
+# struct input_event: timeval, type, code, value
+EVENT = struct.Struct("llHHi")
+EV_SYN, EV_KEY = 0x00, 0x01
+SYN_REPORT = 0
+KEY_ENTER, KEY_BACKSPACE, KEY_LEFTSHIFT = 28, 14, 42
+
+# ioctls from linux/uinput.h
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+UI_DEV_SETUP = 0x405C5503
+UI_SET_EVBIT = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+BUS_VIRTUAL = 0x06
+# struct uinput_setup: input_id (bustype, vendor, product, version), name, ff
+SETUP = struct.Struct("4H80sI")
+
+# Readers' evdev buffers hold at least 64 events; a longer burst written at
+# once can overflow them (SYN_DROPPED), so it goes out in slices
+WRITE_EVENTS = 64
+WRITE_PAUSE = 0.002
+
+_ROWS = {
+    2: "1234567890-=",
+    16: "qwertyuiop[]",
+    30: "asdfghjkl;'`",
+    43: "\\zxcvbnm,./",
+}
+_SHIFTED_ROWS = {
+    2: "!@#$%^&*()_+",
+    16: "QWERTYUIOP{}",
+    30: 'ASDFGHJKL:"~',
+    43: "|ZXCVBNM<>?",
+}
+
+
+def _keymap() -> dict[str, tuple[int, bool]]:
+    """Character -> (key code, needs shift) for a US layout."""
+    keys = {" ": (57, False), "\t": (15, False), "\n": (KEY_ENTER, False)}
+    for rows, shift in ((_ROWS, False), (_SHIFTED_ROWS, True)):
+        for first, row in rows.items():
+            for i, ch in enumerate(row):
+                keys[ch] = (first + i, shift)
+    return keys
+
+
+KEYMAP = _keymap()
+
+
+class UinputKeyboard:
+    """Keystroke backend writing each edit to the device in a few large writes."""
+
+    def __init__(self, path: str = "/dev/uinput"):
+        self._fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        fcntl.ioctl(self._fd, UI_SET_EVBIT, EV_KEY)
+        codes = {code for code, _ in KEYMAP.values()}
+        for code in sorted(codes | {KEY_BACKSPACE, KEY_LEFTSHIFT}):
+            fcntl.ioctl(self._fd, UI_SET_KEYBIT, code)
+        setup = SETUP.pack(BUS_VIRTUAL, 0, 0, 1, b"assist-voice", 0)
+        fcntl.ioctl(self._fd, UI_DEV_SETUP, setup)
+        fcntl.ioctl(self._fd, UI_DEV_CREATE)
+        log("keyboard_init", f"uinput device on {path}")
+
+    def close(self) -> None:
+        fcntl.ioctl(self._fd, UI_DEV_DESTROY)
+        os.close(self._fd)
+
+    def _events(self, events: list[tuple[int, int, int]]) -> None:
+        now = time.time()
+        sec, usec = int(now), int(now % 1 * 1e6)
+        data = b"".join(EVENT.pack(sec, usec, *event) for event in events)
+        step = WRITE_EVENTS * EVENT.size
+        for start in range(0, len(data), step):
+            if start:
+                time.sleep(WRITE_PAUSE)
+            os.write(self._fd, data[start : start + step])
+
+    @staticmethod
+    def _tap(code: int, shift: bool = False) -> list[tuple[int, int, int]]:
+        events = [(EV_KEY, code, 1), (EV_KEY, code, 0), (EV_SYN, SYN_REPORT, 0)]
+        if shift:
+            events = [(EV_KEY, KEY_LEFTSHIFT, 1), (EV_SYN, SYN_REPORT, 0)] + events
+            events += [(EV_KEY, KEY_LEFTSHIFT, 0), (EV_SYN, SYN_REPORT, 0)]
+        return events
+
+    def edit(self, backspaces: int, text: str) -> None:
+        """Press backspace ``backspaces`` times, then type ``text``, as one batch."""
+        events = self._tap(KEY_BACKSPACE) * backspaces
+        for ch in text:
+            if ch not in KEYMAP:
+                log("keystroke_unmapped", repr(ch), level="warn")
+                continue
+            events += self._tap(*KEYMAP[ch])
+        self._events(events)
+
+    def type_text(self, text: str) -> None:
+        self.edit(0, text)
+
+    def backspace(self, n: int = 1) -> None:
+        self.edit(n, "")
+
+    def press_enter(self) -> None:
+        self._events(self._tap(KEY_ENTER))
@@ -0,0 +1,142 @@
+"""Dispatch stage — replays keystroke calls in order on their own thread."""
+
+import queue
+import threading
+from collections.abc import Callable
+
+from keyboard_backend import load_keyboard
+from logger import log
+from metrics import KEYSTROKES
+from text_diff import merge_edits
+
+QUEUE_SIZE = 256
+
+_TEXT_KEYS = KEYSTROKES.labels("text")
+_BACKSPACES = KEYSTROKES.labels("backspace")
+_ENTERS = KEYSTROKES.labels("enter")
+
+# Marks queued (backspaces, text) edits, which may be merged before sending
+_EDIT = object()
+
+
+class KeystrokeQueue:
+    """Keeps keystroke injection latency off the audio thread.
+
+    Each edit goes to the backend as one batch, and edits queued while an
+    earlier one was being injected are merged into a single batch, so a burst
+    of partial corrections costs one injection.  Other calls (Enter,
+    callbacks) are ordering barriers and are never merged across.
+
+    Keystrokes are never dropped: when the queue is full ``put`` blocks, which
+    only happens if the dispatch thread is hundreds of edits behind.  A bug
+    that stops the thread fails every later call (and ``check``) instead, so
+    a dead consumer never leaves the caller blocked on a full queue.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink or load_keyboard()  # see keyboard_backend
+        self._queue: queue.Queue[tuple[object, tuple] | None] = queue.Queue(
+            maxsize=QUEUE_SIZE
+        )
+        self._thread = threading.Thread(
+            target=self._loop, name="keystrokes", daemon=True
+        )
+        self.edits = 0
+        self.injections = 0
+        self._error: Exception | None = None
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def check(self) -> None:
+        """Re-raise the exception that stopped the dispatch thread, if any."""
+        if self._error is not None:
+            raise self._error
+
+    def _put(self, item: tuple[object, tuple]) -> None:
+        self.check()
+        self._queue.put(item)
+
+    def put(self, fn: Callable, *args) -> None:
+        self._put((fn, args))
+
+    def edit(self, backspaces: int, text: str) -> None:
+        """Queue ``backspaces`` backspaces followed by ``text``."""
+        if backspaces or text:
+            self._put((_EDIT, (backspaces, text)))
+
+    def type_text(self, text: str) -> None:
+        self.edit(0, text)
+
+    def backspace(self, n: int = 1) -> None:
+        self.edit(n, "")
+
+    def press_enter(self) -> None:
+        self.put(self.send_enter)
+
+    def send_enter(self) -> None:
+        """Press Enter now; only for callbacks already on the keystroke thread."""
+        self.sink.press_enter()
+        _ENTERS.inc()
+
+    def stop(self) -> None:
+        """Flush pending keystrokes, then stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5.0)
+
+    def _loop(self) -> None:
+        try:
+            self._run()
+        except Exception as exc:
+            self._error = exc
+            # Wake any caller blocked on the full queue; its next call raises
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            raise
+
+    def _run(self) -> None:
+        item = self._queue.get()
+        while item is not None:
+            fn, args = item
+            if fn is _EDIT:
+                item = self._send_edits(args)
+                continue
+            self._call(fn, *args)
+            item = self._queue.get()
+
+    def _send_edits(self, edit: tuple[int, str]):
+        """Send ``edit`` merged with the edits queued behind it.
+
+        Returns the next queued item, which is not an edit.
+        """
+        while True:
+            self.edits += 1
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                item = _EDIT
+                break
+            if item is None or item[0] is not _EDIT:
+                break
+            edit = merge_edits(edit, item[1])
+        if edit[0] or edit[1]:
+            self.injections += 1
+            self._call(self.sink.edit, *edit)
+            _BACKSPACES.inc(edit[0])
+            _TEXT_KEYS.inc(len(edit[1]))
+        return self._queue.get() if item is _EDIT else item
+
+    @staticmethod
+    def _call(fn: Callable, *args) -> None:
+        try:
+            fn(*args)
+        except OSError as exc:
+            # The device write or SendInput call failed; later keys may work
+            log("keystroke_error", str(exc), level="error")
+        except Exception as exc:
+            log("keystroke_crash", repr(exc), level="error")
+            raise
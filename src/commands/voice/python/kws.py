@@ -0,0 +1,80 @@
+"""Acoustic keyword spotting with openWakeWord ONNX models."""
+
+import os
+
+import numpy as np
+import onnxruntime as ort
+
+from logger import log
+
+# Shared feature models, downloaded by setup_models.py
+MEL_MODEL = "melspectrogram.onnx"
+EMBEDDING_MODEL = "embedding_model.onnx"
+
+CHUNK = 1280  # 80 ms of audio per embedding
+MEL_CONTEXT = 480  # extra samples so each chunk yields 8 whole mel frames
+MEL_FRAMES = 76  # mel frames per embedding
+DEFAULT_THRESHOLD = 0.5
+
+
+def _session(path: str) -> ort.InferenceSession:
+    so = ort.SessionOptions()
+    so.intra_op_num_threads = 1
+    so.inter_op_num_threads = 1
+    return ort.InferenceSession(
+        path, sess_options=so, providers=["CPUExecutionProvider"]
+    )
+
+
+class KeywordSpotter:
+    """Streaming mel -> speech embedding -> keyword classifier pipeline.
+
+    The mel and embedding models are shared by every openWakeWord keyword;
+    only the small classifier is trained per wake word.  Each 80 ms chunk
+    costs one run of each model, a few milliseconds of CPU.
+    """
+
+    def __init__(self, model_path: str, models_dir: str):
+        log("kws_init", f"model={model_path}")
+        self._mel = _session(os.path.join(models_dir, MEL_MODEL))
+        self._embed = _session(os.path.join(models_dir, EMBEDDING_MODEL))
+        self._keyword = _session(model_path)
+        keyword_input = self._keyword.get_inputs()[0]
+        self._names = [
+            s.get_inputs()[0].name for s in (self._mel, self._embed, self._keyword)
+        ]
+        # 16-bit PCM scale, as the mel model expects; [context | chunk]
+        self._audio = np.zeros((1, MEL_CONTEXT + CHUNK), dtype=np.float32)
+        self._filled = 0
+        self._mels = np.ones((MEL_FRAMES, 32), dtype=np.float32)
+        self._embeddings = np.zeros(keyword_input.shape[1:], dtype=np.float32)
+        self.threshold = float(
+            os.environ.get("VOICE_WAKE_GATE_THRESHOLD", DEFAULT_THRESHOLD)
+        )
+
+    def _score(self) -> float:
+        mel_name, embed_name, keyword_name = self._names
+        mels = self._mel.run(None, {mel_name: self._audio})[0]
+        mels = np.squeeze(mels) / 10 + 2  # openWakeWord's transform
+        self._mels = np.concatenate((self._mels, mels))[-MEL_FRAMES:]
+        embedding = self._embed.run(None, {embed_name: self._mels[None, :, :, None]})
+        self._embeddings = np.roll(self._embeddings, -1, axis=0)
+        self._embeddings[-1] = np.squeeze(embedding[0])
+        score = self._keyword.run(None, {keyword_name: self._embeddings[None]})[0]
+        return float(np.squeeze(score))
+
+    def feed(self, block: np.ndarray) -> float:
+        """Add audio; return the best score of the chunks it completed, or 0."""
+        pcm = block * 32767.0
+        best = 0.0
+        while len(pcm):
+            take = min(CHUNK - self._filled, len(pcm))
+            start = MEL_CONTEXT + self._filled
+            self._audio[0, start : start + take] = pcm[:take]
+            self._filled += take
+            pcm = pcm[take:]
+            if self._filled == CHUNK:
+                best = max(best, self._score())
+                self._audio[0, :MEL_CONTEXT] = self._audio[0, -MEL_CONTEXT:]
+                self._filled = 0
+        return best
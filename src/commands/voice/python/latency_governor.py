@@ -0,0 +1,128 @@
+"""Adapts streaming STT work to how fast STT actually runs on this machine."""
+
+import os
+
+from logger import log
+from streaming_stt import LOOKBACK_SAMPLES, MAX_PENDING_SAMPLES, SAMPLE_RATE
+
+# End-of-turn budget: end of speech to final transcription
+DEFAULT_BUDGET_MS = 800
+
+# Partials may use at most this fraction of real time on the model worker,
+# leaving the rest for Smart Turn and the final pass
+TARGET_LOAD = 0.5
+MIN_INTERVAL = SAMPLE_RATE  # 1 s, the fixed cadence on a fast GPU
+MAX_INTERVAL = 4 * SAMPLE_RATE
+MIN_LOOKBACK = SAMPLE_RATE // 2
+MIN_PENDING = 2 * SAMPLE_RATE
+# Share of the budget the lookback may take in the final pass
+LOOKBACK_SHARE = 0.25
+# Mic blocks waiting to be read before partials are skipped (~0.5 s)
+BACKLOG_BLOCKS = 16
+SMOOTHING = 0.3  # weight of the newest real-time factor measurement
+
+
+class LatencyGovernor:
+    """Tracks STT real-time factor and mic backlog; sets streaming parameters.
+
+    - Partial cadence stretches so partials stay under ``TARGET_LOAD``.
+    - Partials are skipped while the mic backlog is deep, and during trailing
+      silence once a partial pass would eat half the budget (a running pass
+      cannot be interrupted when the turn ends).
+    - Lookback and uncommitted audio are capped so the final pass, which
+      decodes both, fits the budget.
+
+    On a fast GPU every parameter stays at its fixed default.
+    """
+
+    def __init__(self, budget_ms: float | None = None):
+        if budget_ms is None:
+            budget_ms = float(
+                os.environ.get("VOICE_LATENCY_BUDGET_MS", DEFAULT_BUDGET_MS)
+            )
+        self.budget = budget_ms / 1000
+        self.rtf = 0.0
+        self.partial_seconds = 0.0
+        self.interval = MIN_INTERVAL
+        self.lookback = LOOKBACK_SAMPLES
+        self.max_pending = MAX_PENDING_SAMPLES
+        self._skipping = ""
+
+    def observe(self, result, decoded: int) -> None:
+        """Fold in a partial or final STT result that decoded ``decoded`` samples."""
+        if decoded > 0:
+            rtf = result.seconds / (decoded / SAMPLE_RATE)
+            self.rtf = rtf if not self.rtf else self.rtf + SMOOTHING * (rtf - self.rtf)
+        if result.kind == "partial":
+            self.partial_seconds = result.seconds
+        elif result.kind == "final" and result.waited + result.seconds > self.budget:
+            log(
+                "latency_budget",
+                "final pass over budget",
+                level="warn",
+                budget_ms=round(self.budget * 1000),
+                waited_ms=round(result.waited * 1000),
+                stt_ms=round(result.seconds * 1000),
+                decoded_s=round(decoded / SAMPLE_RATE, 2),
+            )
+        self._adjust()
+
+    def _adjust(self) -> None:
+        interval = self.partial_seconds / TARGET_LOAD * SAMPLE_RATE
+        interval = int(min(max(interval, MIN_INTERVAL), MAX_INTERVAL))
+        lookback, pending = LOOKBACK_SAMPLES, MAX_PENDING_SAMPLES
+        if self.rtf:
+            # Final pass cost is about rtf * (lookback + pending)
+            decodable = self.budget / self.rtf * SAMPLE_RATE
+            lookback = min(max(decodable * LOOKBACK_SHARE, MIN_LOOKBACK), lookback)
+            pending = min(max(decodable - lookback, MIN_PENDING), pending)
+        params = (interval, int(lookback), int(pending))
+        if params != (self.interval, self.lookback, self.max_pending):
+            self.interval, self.lookback, self.max_pending = params
+            log(
+                "governor",
+                "streaming parameters changed",
+                rtf=round(self.rtf, 3),
+                partial_ms=round(self.partial_seconds * 1000),
+                interval_s=round(self.interval / SAMPLE_RATE, 2),
+                lookback_s=round(self.lookback / SAMPLE_RATE, 2),
+                max_pending_s=round(self.max_pending / SAMPLE_RATE, 2),
+            )
+
+    def tune(self, stream) -> None:
+        """Apply the current lookback and commit caps to ``stream``."""
+        stream.lookback = self.lookback
+        stream.max_pending = self.max_pending
+
+    def allow_speculation(self, decoded: int) -> bool:
+        """Whether a speculative final pass over ``decoded`` samples fits the budget.
+
+        The pass cannot be interrupted, so a long one would hold up the Smart
+        Turn checks queued behind it.
+        """
+        expected = self.rtf * decoded / SAMPLE_RATE
+        if expected <= self.budget:
+            return True
+        log("governor", "speculative final skipped", expected_ms=round(expected * 1000))
+        return False
+
+    def allow_partial(self, backlog: int, silent: bool) -> bool:
+        """Whether to run a partial pass now.
+
+        ``backlog`` is mic blocks waiting to be read; ``silent`` is true in
+        trailing silence, when the turn may end any moment.
+        """
+        reason = ""
+        if backlog > BACKLOG_BLOCKS:
+            reason = "mic backlog"
+        elif silent and self.partial_seconds > self.budget / 2:
+            reason = "protecting final"
+        if reason != self._skipping:
+            self._skipping = reason
+            log(
+                "governor",
+                f"skipping partials: {reason}" if reason else "partials resumed",
+                backlog=backlog,
+                partial_ms=round(self.partial_seconds * 1000),
+            )
+        return not reason
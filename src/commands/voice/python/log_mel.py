@@ -0,0 +1,168 @@
+"""Whisper-compatible log-mel features in NumPy, with an incremental frame cache.
+
+Reproduces ``WhisperFeatureExtractor(chunk_length=8)`` called with
+``do_normalize=True`` on an already window-sized input, without importing
+transformers.
+"""
+
+from functools import cache
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+N_FFT = 400
+HOP = 160
+N_MELS = 80
+MEL_FLOOR = 1e-10
+NORM_EPS = 1e-7
+RING_FRAMES = 1024  # must exceed the frames in one window (800 for 8 s)
+EDGE = N_FFT // 2  # centred frames reach this far either side of their hop
+
+
+def _hz_to_mel(freq: np.ndarray) -> np.ndarray:
+    """Slaney mel scale: linear below 1 kHz, logarithmic above."""
+    mels = 3.0 * freq / 200.0
+    log_region = freq >= 1000.0
+    mels[log_region] = 15.0 + np.log(freq[log_region] / 1000.0) * (27.0 / np.log(6.4))
+    return mels
+
+
+def _mel_to_hz(mels: np.ndarray) -> np.ndarray:
+    freq = 200.0 * mels / 3.0
+    log_region = mels >= 15.0
+    freq[log_region] = 1000.0 * np.exp((np.log(6.4) / 27.0) * (mels[log_region] - 15.0))
+    return freq
+
+
+@cache
+def mel_filters(n_mels: int = N_MELS, n_fft: int = N_FFT) -> np.ndarray:
+    """Slaney-normalised triangular filterbank, shape (n_fft // 2 + 1, n_mels).
+
+    Matches ``librosa.filters.mel(norm="slaney")``, which NeMo also uses.
+    """
+    fft_freqs = np.linspace(0, SAMPLE_RATE // 2, n_fft // 2 + 1)
+    mel_edges = np.linspace(0.0, _hz_to_mel(np.array([SAMPLE_RATE / 2]))[0], n_mels + 2)
+    edges = _mel_to_hz(mel_edges)
+    slopes = edges[None, :] - fft_freqs[:, None]
+    down = -slopes[:, :-2] / np.diff(edges)[:-1]
+    up = slopes[:, 2:] / np.diff(edges)[1:]
+    filters = np.maximum(0.0, np.minimum(down, up))
+    return filters * (2.0 / (edges[2:] - edges[:-2]))
+
+
+@cache
+def hann_window() -> np.ndarray:
+    """Periodic Hann window, as Whisper uses."""
+    return np.hanning(N_FFT + 1)[:-1]
+
+
+def _zero_extended(audio: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """``audio[lo:hi]`` as float64, with zeros for samples before 0."""
+    out = np.zeros(hi - lo)
+    if hi > 0:
+        begin = max(lo, 0)
+        out[begin - lo :] = audio[begin:hi]
+    return out
+
+
+def _frames(audio: np.ndarray) -> np.ndarray:
+    """Windowed frames at every hop of ``audio`` (no centring)."""
+    view = np.lib.stride_tricks.sliding_window_view(audio, N_FFT)[::HOP]
+    return view * hann_window()
+
+
+def _mel_power(frames: np.ndarray, n_mels: int) -> np.ndarray:
+    spectrum = np.fft.rfft(frames, axis=-1)
+    return (np.abs(spectrum) ** 2) @ mel_filters(n_mels)
+
+
+def _finish(mel: np.ndarray) -> np.ndarray:
+    """Log, dynamic-range clamp and rescale; returns (n_mels, frames)."""
+    log_spec = np.log10(np.maximum(mel, MEL_FLOOR))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return ((log_spec + 4.0) / 4.0).T.astype(np.float32)
+
+
+def log_mel(window: np.ndarray, n_mels: int = N_MELS) -> np.ndarray:
+    """Features for one window of audio, shape (n_mels, len(window) // HOP)."""
+    x = np.asarray(window, dtype=np.float64)
+    x = (x - x.mean()) / np.sqrt(x.var() + NORM_EPS)
+    padded = np.pad(x, EDGE, mode="reflect")
+    mel = _mel_power(_frames(padded), n_mels)
+    return _finish(mel[:-1])
+
+
+class MelStream:
+    """Rolling mel-frame cache for one growing utterance.
+
+    Whisper normalises the whole window before the STFT, so a cached frame
+    can't store its final power directly.  With ``C`` the spectrum of a raw
+    frame and ``W`` that of the window itself, the normalised power is
+    ``|C - mW|^2 / s^2``; caching ``mel(|C|^2)`` and ``mel(Re(C W*))`` per frame
+    lets every check apply the current mean and variance in O(frames x mels).
+    Only frames that completed since the previous check get an FFT.  The three
+    frames touching the window edges (reflect padding) are computed directly.
+    """
+
+    def __init__(self, window_samples: int, n_mels: int = N_MELS):
+        self._window = window_samples
+        self._n_mels = n_mels
+        self._power = np.zeros((RING_FRAMES, n_mels))
+        self._cross = np.zeros((RING_FRAMES, n_mels))
+        w = np.fft.rfft(hann_window())
+        self._w_conj = np.conj(w)
+        self._w_mel = (np.abs(w) ** 2) @ mel_filters(n_mels)
+        self._next = -1  # next absolute frame to compute; frame j is centred on j*HOP
+
+    def _feed(self, audio: np.ndarray, first: int, last: int) -> None:
+        """Cache frames ``first..last``."""
+        segment = _zero_extended(audio, first * HOP - EDGE, last * HOP + EDGE)
+        spectrum = np.fft.rfft(_frames(segment), axis=-1)
+        rows = np.arange(first, last + 1) % RING_FRAMES
+        filters = mel_filters(self._n_mels)
+        self._power[rows] = (np.abs(spectrum) ** 2) @ filters
+        self._cross[rows] = np.real(spectrum * self._w_conj) @ filters
+
+    def _edges(self, audio, start: int, end: int, mean: float, scale: float):
+        """Mel power of the first two and the last frame of the window."""
+        span = HOP + EDGE
+        left = (_zero_extended(audio, start, start + span) - mean) / scale
+        right = (_zero_extended(audio, end - span, end) - mean) / scale
+        left = np.pad(left, (EDGE, 0), mode="reflect")
+        right = np.pad(right, (0, EDGE), mode="reflect")
+        frames = np.stack([left[:N_FFT], left[HOP:], right[:N_FFT]])
+        return _mel_power(frames * hann_window(), self._n_mels)
+
+    def update(self, audio: np.ndarray) -> np.ndarray:
+        """Features for the window ending at the hop boundary at/before ``len(audio)``.
+
+        ``audio`` is the whole utterance so far; it must only ever grow.
+        """
+        end = len(audio) - len(audio) % HOP
+        start = end - self._window
+        n_frames = self._window // HOP
+        last = end // HOP - 2  # last interior frame (fully inside the window)
+        first_needed = start // HOP + 2
+        first = max(self._next, first_needed, last - RING_FRAMES + 1, -1)
+        if first <= last:
+            self._feed(audio, first, last)
+            self._next = last + 1
+
+        real = np.asarray(audio[max(start, 0) : end], dtype=np.float64)
+        mean = real.sum() / self._window
+        var = (real @ real) / self._window - mean * mean
+        scale = np.sqrt(var + NORM_EPS)
+
+        js = np.arange(first_needed, last + 1)
+        live = (js >= -1)[:, None]
+        rows = js % RING_FRAMES
+        power = np.where(live, self._power[rows], 0.0)
+        cross = np.where(live, self._cross[rows], 0.0)
+        interior = (power - 2 * mean * cross + mean * mean * self._w_mel) / scale**2
+
+        mel = np.empty((n_frames, self._n_mels))
+        edges = self._edges(audio, start, end, mean, scale)
+        mel[:2] = edges[:2]
+        mel[2:-1] = interior
+        mel[-1] = edges[2]
+        return _finish(mel)
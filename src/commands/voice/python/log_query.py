@@ -0,0 +1,39 @@
+"""Print voice log records from the SQLite index as JSON Lines.
+
+Used by ``assist voice status`` and ``assist voice logs``; exits 1 when
+there is no index yet so callers can fall back to reading voice.log.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+from log_store import query
+from logger import LOG_DB
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the voice log index")
+    parser.add_argument("-n", "--lines", type=int, default=150)
+    parser.add_argument("--event", help="only this event")
+    parser.add_argument("--level", help="only this level (info, warn, error)")
+    parser.add_argument("--since", help="ISO timestamp or prefix, UTC")
+    parser.add_argument("--until", help="ISO timestamp or prefix, UTC")
+    args = parser.parse_args()
+
+    if not os.path.exists(LOG_DB):
+        sys.exit(1)
+    try:
+        lines = query(
+            LOG_DB, args.lines, args.event, args.level, args.since, args.until
+        )
+    except sqlite3.Error as exc:
+        print(f"Log index unreadable: {exc}", file=sys.stderr)
+        sys.exit(1)
+    for line in lines:
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
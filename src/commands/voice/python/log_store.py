@@ -0,0 +1,93 @@
+"""SQLite index of log records, so queries don't scan voice.log."""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Rows older than this are pruned when the store opens and on log rotation
+RETENTION_DAYS = int(os.environ.get("VOICE_LOG_RETENTION_DAYS", "30"))
+
+# Upper bound on rows a single query returns
+MAX_ROWS = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    event TEXT NOT NULL,
+    level TEXT NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS events_event ON events (event);
+CREATE INDEX IF NOT EXISTS events_level ON events (level);
+"""
+
+
+class LogStore:
+    """Append-only events table in WAL mode, so readers never block the writer.
+
+    Each row keeps the record's JSON line verbatim, alongside the indexed
+    columns; ISO UTC timestamps sort as text.
+    """
+
+    def __init__(self, path: str):
+        # Used by the log writer thread and by the atexit flush, never both
+        # at once (the writer's lock serializes them)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self.prune()
+
+    def insert(self, rows: list[tuple[str, str, str, str]]) -> None:
+        """Add (timestamp, event, level, line) rows in one transaction."""
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO events (timestamp, event, level, line) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def prune(self) -> None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
+        with self._db:
+            self._db.execute(
+                "DELETE FROM events WHERE timestamp < ?", (cutoff.isoformat(),)
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def query(
+    path: str,
+    limit: int,
+    event: str | None = None,
+    level: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+) -> list[str]:
+    """Return the newest ``limit`` matching JSON lines, oldest first.
+
+    ``since`` and ``until`` are ISO timestamps or prefixes of one (e.g.
+    ``2025-06-01T09``), compared as UTC.
+    """
+    filters = {
+        "event = ?": event,
+        "level = ?": level,
+        "timestamp >= ?": since,
+        "timestamp < ?": until,
+    }
+    clauses = [clause for clause, value in filters.items() if value]
+    args = [value for value in filters.values() if value]
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    # Rows are appended in time order; a time filter seeks the timestamp index
+    order = "timestamp" if since or until else "id"
+    sql = f"SELECT line FROM events {where} ORDER BY {order} DESC LIMIT ?"
+    db = sqlite3.connect(Path(path).as_uri() + "?mode=ro", uri=True)
+    try:
+        rows = db.execute(sql, (*args, min(limit, MAX_ROWS))).fetchall()
+    finally:
+        db.close()
+    return [line for (line,) in reversed(rows)]
@@ -1,38 +1,176 @@
-"""JSON Lines structured logging to voice.log."""
+"""JSON Lines structured logging to voice.log.
 
+``log`` only queues the record, so it is cheap on the audio thread; a
+background writer formats and appends them in batches, rotates the file, and
+indexes each record in a SQLite store (voice.db) for log_query.py.
+"""
+
+import atexit
 import json
 import os
+import sqlite3
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime, timezone
 
+from log_store import LogStore
 
 LOG_FILE = os.environ.get(
     "VOICE_LOG_FILE", os.path.expanduser("~/.assist/voice/voice.log")
 )
 
+LOG_DB = os.environ.get("VOICE_LOG_DB", os.path.splitext(LOG_FILE)[0] + ".db")
+
 DEBUG = os.environ.get("VOICE_DEBUG", "") == "1"
 
+# Rotate once voice.log reaches this size, keeping voice.log.1 .. .N
+MAX_BYTES = int(os.environ.get("VOICE_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+BACKUPS = int(os.environ.get("VOICE_LOG_BACKUPS", "3"))
+
+# Write at least this often, or as soon as this many records are pending
+FLUSH_SECONDS = 0.5
+FLUSH_RECORDS = 256
+
+# Beyond this backlog records are dropped and counted, never buffered
+MAX_PENDING = 10_000
+
+# deque append/popleft are atomic, so producers never take a lock
+_pending: deque[tuple[float, dict]] = deque()
+_wake = threading.Event()
+# Only a full backlog takes this lock, to count drops from every thread
+_dropped_lock = threading.Lock()
+dropped = 0
+
+
+class _Writer:
+    def __init__(self):
+        self._lock = threading.Lock()  # the thread and atexit both flush
+        self._file = None
+        self._store: LogStore | None = None
+        self._size = 0
+        self._reported = 0
+        self._thread = threading.Thread(
+            target=self._loop, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            _wake.wait(FLUSH_SECONDS)
+            _wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            rows = self._drain()
+            if rows:
+                self._append("".join(row[3] + "\n" for row in rows))
+                self._index(rows)
+
+    def _drain(self) -> list[tuple[str, str, str, str]]:
+        """Format queued records as (timestamp, event, level, line) rows."""
+        entries = []
+        while _pending:
+            created, entry = _pending.popleft()
+            entry["timestamp"] = datetime.fromtimestamp(
+                created, timezone.utc
+            ).isoformat()
+            entries.append(entry)
+            if DEBUG:
+                _echo(entry)
+        with _dropped_lock:
+            total = dropped
+        if total > self._reported:
+            entry = {"event": "log_dropped", "level": "warn"}
+            entry["data"] = {"count": total - self._reported}
+            entry["timestamp"] = datetime.now(timezone.utc).isoformat()
+            entries.append(entry)
+            self._reported = total
+        return [
+            (e["timestamp"], e["event"], e["level"], json.dumps(e, default=str))
+            for e in entries
+        ]
+
+    def _append(self, text: str) -> None:
+        try:
+            if self._file is None:
+                # Owned by the writer, which closes it on rotation or error
+                self._file = open(LOG_FILE, "a", encoding="utf-8")  # noqa: SIM115
+                self._size = self._file.tell()
+            self._file.write(text)
+            self._file.flush()
+            self._size += len(text)
+            if self._size >= MAX_BYTES:
+                self._rotate()
+        except OSError:
+            self._close()
+
+    def _index(self, rows: list[tuple[str, str, str, str]]) -> None:
+        try:
+            if self._store is None:
+                self._store = LogStore(LOG_DB)
+            self._store.insert(rows)
+        except sqlite3.Error:
+            # The text log stays authoritative; reopen on the next batch
+            if self._store is not None:
+                self._store.close()
+            self._store = None
+
+    def _rotate(self) -> None:
+        self._close()
+        if self._store is not None:
+            try:
+                self._store.prune()
+            except sqlite3.Error:
+                pass
+        if BACKUPS <= 0:
+            os.remove(LOG_FILE)
+            return
+        for i in range(BACKUPS - 1, 0, -1):
+            if os.path.exists(f"{LOG_FILE}.{i}"):
+                os.replace(f"{LOG_FILE}.{i}", f"{LOG_FILE}.{i + 1}")
+        os.replace(LOG_FILE, f"{LOG_FILE}.1")
+
+    def _close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+def _echo(entry: dict) -> None:
+    ts = entry["timestamp"][11:19]
+    level = entry.get("level", "info").upper()
+    event = entry.get("event", "")
+    msg = entry.get("message", "")
+    print(f"{ts} {level:5s} [{event}] {msg}", file=sys.stderr, flush=True)
+
+
+_writer = _Writer()
+atexit.register(_writer.flush)
+
 
-def _write(entry: dict) -> None:
-    entry["timestamp"] = datetime.now(timezone.utc).isoformat()
-    line = json.dumps(entry)
-    try:
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
-    except OSError:
-        pass
-    if DEBUG:
-        ts = entry["timestamp"][11:19]
-        level = entry.get("level", "info").upper()
-        event = entry.get("event", "")
-        msg = entry.get("message", "")
-        print(f"{ts} {level:5s} [{event}] {msg}", file=sys.stderr, flush=True)
+def flush() -> None:
+    """Write every queued record now."""
+    _writer.flush()
 
 
 def log(event: str, message: str = "", *, level: str = "info", **data) -> None:
+    """Queue a record; ``data`` is serialized later, so don't mutate it after."""
+    global dropped
+    if len(_pending) >= MAX_PENDING:
+        with _dropped_lock:
+            dropped += 1
+        return
     entry: dict = {"event": event, "level": level}
     if message:
         entry["message"] = message
     if data:
         entry["data"] = data
-    _write(entry)
+    _pending.append((time.time(), entry))
+    if len(_pending) == FLUSH_RECORDS:
+        _wake.set()
@@ -0,0 +1,209 @@
+"""In-process counters and histograms, exported in Prometheus text format.
+
+Updating a metric is plain attribute arithmetic with no lock, cheap enough
+for every audio block once the caller holds the child (``BLOCKS.labels()``).
+Nearly all are written from the daemon's main loop; the few written from
+several threads (keystrokes in multi-stream mode) may very rarely lose an
+increment, which is fine for monitoring.
+
+``MetricsWriter`` rewrites voice.prom next to voice.log every WRITE_SECONDS,
+for node_exporter's textfile collector or ``assist voice status``; the
+transcription socket also answers ``{"op": "metrics"}`` with the same text.
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from collections.abc import Callable
+
+from logger import LOG_FILE, log
+
+WRITE_SECONDS = 5.0
+METRICS_FILE = "voice.prom"
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n: int = 1) -> None:
+        self.value += n
+
+    def samples(self, name: str, labels: str) -> list[str]:
+        return [f"{name}{labels} {self.value}"]
+
+
+class Gauge:
+    """A value that is set, or read from ``track``'s callback when scraped."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._fn: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def track(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    def samples(self, name: str, labels: str) -> list[str]:
+        value = self._fn() if self._fn else self.value
+        return [f"{name}{labels} {value}"]
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # the last is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str) -> list[str]:
+        inner = labels[1:-1] + "," if labels else ""
+        lines, total = [], 0
+        for bound, count in zip((*self._buckets, "+Inf"), self._counts):
+            total += count
+            lines.append(f'{name}_bucket{{{inner}le="{bound}"}} {total}')
+        return [
+            *lines,
+            f"{name}_sum{labels} {self.sum}",
+            f"{name}_count{labels} {self.count}",
+        ]
+
+
+class Family:
+    """A named metric, with one child per combination of label values."""
+
+    def __init__(self, name: str, help_text: str, kind: str, make, labels=()):
+        self.name = name
+        self._help = help_text
+        self._kind = kind
+        self._make = make
+        self._labels = labels
+        self._children: dict[tuple, object] = {}
+        if not labels:
+            self._children[()] = make()
+
+    def labels(self, *values: str):
+        """The child for ``values``; keep it to skip this lookup when hot."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._make()
+        return child
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self._help}", f"# TYPE {self.name} {self._kind}"]
+        for values, child in list(self._children.items()):
+            pairs = ",".join(f'{k}="{v}"' for k, v in zip(self._labels, values))
+            lines += child.samples(self.name, f"{{{pairs}}}" if pairs else "")
+        return lines
+
+
+_families: list[Family] = []
+
+
+def counter(name: str, help_text: str, labels=()) -> Family:
+    _families.append(Family(name, help_text, "counter", Counter, labels))
+    return _families[-1]
+
+
+def gauge(name: str, help_text: str, labels=()) -> Family:
+    _families.append(Family(name, help_text, "gauge", Gauge, labels))
+    return _families[-1]
+
+
+def histogram(name: str, help_text: str, buckets, labels=()) -> Family:
+    family = Family(name, help_text, "histogram", lambda: Histogram(buckets), labels)
+    _families.append(family)
+    return family
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    return "\n".join(line for f in _families for line in f.render()) + "\n"
+
+
+BLOCKS = counter("voice_blocks_total", "Audio blocks scored by the VAD")
+VAD_SECONDS = histogram(
+    "voice_vad_block_seconds",
+    "VAD compute time per block, averaged over each batch of blocks",
+    (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025),
+)
+MIC_QUEUE = gauge(
+    "voice_mic_queue_blocks", "Captured blocks waiting to be read", ("stream",)
+)
+OVERFLOWS = counter(
+    "voice_capture_overflows_total",
+    "Overflow events: the device's input overflowed, or a read found audio"
+    " dropped by the full capture ring (one event however long the stall)",
+    ("source",),
+)
+DROPPED_SAMPLES = counter(
+    "voice_capture_dropped_samples_total",
+    "Samples dropped because the capture ring was full",
+)
+MODEL_SECONDS = histogram(
+    "voice_model_seconds",
+    "Model job run time by kind (partial, speculative, final STT; turn)",
+    (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    ("kind",),
+)
+STT_RTF = histogram(
+    "voice_stt_rtf",
+    "STT run time over the length of audio transcribed",
+    (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0),
+    ("kind",),
+)
+SMART_TURN = counter(
+    "voice_smart_turn_total",
+    "Smart Turn answers: complete, incomplete, or undecided (check again later)",
+    ("outcome",),
+)
+TRANSITIONS = counter(
+    "voice_state_transitions_total", "Daemon state changes", ("from", "to")
+)
+KEYSTROKES = counter(
+    "voice_keystrokes_total", "Keys sent to the keyboard backend", ("key",)
+)
+
+
+class MetricsWriter:
+    """Rewrites the metrics file every WRITE_SECONDS, and once on stop."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="metrics", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+        self.write()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(WRITE_SECONDS):
+            self.write()
+
+    def write(self) -> None:
+        """Replace the file whole, so a reader never sees half of it."""
+        tmp = self._path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(render())
+            os.replace(tmp, self._path)
+        except OSError as exc:
+            log("metrics_error", str(exc), level="warn")
+
+
+def export_metrics() -> MetricsWriter:
+    writer = MetricsWriter(os.path.join(os.path.dirname(LOG_FILE), METRICS_FILE))
+    writer.start()
+    return writer
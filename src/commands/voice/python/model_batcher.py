@@ -0,0 +1,134 @@
+"""One model shared by several streams, with concurrent calls batched."""
+
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from logger import log
+from model_worker import MODEL_ERRORS
+
+# Most requests merged into one forward pass
+MAX_BATCH = 8
+
+
+class Batcher:
+    """Runs ``fn_batch`` on its own thread over every call queued meanwhile.
+
+    Callers block until their item's result is back.  While a batch runs, new
+    calls queue up and go out together in the next one, so batches grow with
+    load and a lone caller pays only the thread handoff.
+    """
+
+    def __init__(
+        self, name: str, fn_batch: Callable[[list], list], max_batch: int = MAX_BATCH
+    ):
+        self._name = name
+        self._fn_batch = fn_batch
+        self._max_batch = max_batch
+        self._queue: queue.Queue[tuple[object, Future] | None] = queue.Queue()
+        self.calls = 0
+        self.batches = 0
+        self._crash: Exception | None = None
+        self._thread = threading.Thread(
+            target=self._loop, name=f"batch-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, item):
+        return self.submit(item).result()
+
+    def submit(self, item) -> Future:
+        future: Future = Future()
+        self._queue.put((item, future))
+        if self._crash is not None:
+            self._drain()  # the thread is gone; don't leave the caller waiting
+        return future
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+        log(f"{self._name}_batches", **self.stats())
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "batches": self.batches,
+            "mean_batch": round(self.calls / self.batches, 2) if self.batches else 0,
+        }
+
+    def _take(self) -> list[tuple[object, Future]] | None:
+        """Wait for one request, then take any others already queued."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        while len(batch) < self._max_batch:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(request)
+        return batch
+
+    def _drain(self) -> None:
+        """Fail every queued call with the crash that stopped the thread."""
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None:
+                request[1].set_exception(self._crash)
+
+    def _loop(self) -> None:
+        while (batch := self._take()) is not None:
+            self.calls += len(batch)
+            self.batches += 1
+            try:
+                values = self._fn_batch([item for item, _ in batch])
+            except MODEL_ERRORS as exc:
+                _fail(batch, exc)
+                continue
+            except Exception as exc:
+                # A bug: fail every caller, now and later, rather than hang them
+                log(f"{self._name}_crash", repr(exc), level="error")
+                self._crash = exc
+                _fail(batch, exc)
+                self._drain()
+                raise
+            for (_, future), value in zip(batch, values):
+                future.set_result(value)
+
+
+def _fail(batch: list[tuple[object, Future]], exc: Exception) -> None:
+    for _, future in batch:
+        future.set_exception(exc)
+
+
+class SharedSTT:
+    """STT behind ``STTStream``'s interface, batching ``frame_ids`` across streams."""
+
+    def __init__(self, stt):
+        self._stt = stt
+        self.blank_id = stt.blank_id
+        self.frame_ids = Batcher("stt", stt.frame_ids_batch)
+
+    def decode(self, ids: list[int]) -> str:
+        return self._stt.decode(ids)
+
+    def stop(self) -> None:
+        self.frame_ids.stop()
+
+
+class SharedTurn:
+    """Smart Turn behind ``TurnStream``'s interface, batching across streams."""
+
+    def __init__(self, model):
+        self.probability = Batcher("smart_turn", model.probability_batch)
+
+    def stop(self) -> None:
+        self.probability.stop()
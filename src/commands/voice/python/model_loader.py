@@ -0,0 +1,111 @@
+"""Parallel model loading with a startup timing report."""
+
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from logger import DEBUG, log
+
+_origin = time.monotonic()
+_spans: dict[str, tuple[float, float]] = {}
+_imports_cpu = 0.0
+
+
+def mark_imports_done() -> None:
+    """Note CPU time spent so far, which before main() is module imports."""
+    global _imports_cpu
+    _imports_cpu = time.process_time()
+
+
+@contextmanager
+def timed(name: str):
+    """Record a startup span as (start, duration) seconds since launch."""
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        _spans[name] = (start - _origin, time.monotonic() - start)
+
+
+def report_startup() -> None:
+    """Log where startup time went, as a waterfall of recorded spans."""
+    total = time.monotonic() - _origin
+    spans = {
+        name: [round(start, 3), round(duration, 3)]
+        for name, (start, duration) in sorted(_spans.items(), key=lambda s: s[1])
+    }
+    imports = round(_imports_cpu, 3)
+    log("startup_timing", f"ready in {total:.1f}s", spans=spans, imports_cpu=imports)
+    if DEBUG:
+        print(f"\n  Startup: {total:.1f}s (imports {imports:.2f}s)", file=sys.stderr)
+        for name, (start, duration) in spans.items():
+            print(f"    {start:6.2f}s +{duration:6.2f}s  {name}", file=sys.stderr)
+
+
+class Pending:
+    """Stands in for a model that is still loading.
+
+    Attribute access waits for the load, so only the model worker thread
+    should touch it until ``done()``; the audio thread checks ``done()`` first.
+    """
+
+    def __init__(self, future: Future):
+        self._future = future
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def get(self) -> object:
+        """Wait for the load and return the model itself."""
+        return self._future.result()
+
+    def __getattr__(self, name: str):
+        return getattr(self._future.result(), name)
+
+
+class Ready(Pending):
+    """A model built elsewhere (e.g. shared between streams), already loaded."""
+
+    def __init__(self, model: object):
+        future: Future = Future()
+        future.set_result(model)
+        super().__init__(future)
+
+
+class ModelLoader:
+    """Builds every model on its own thread; each is usable once its load ends."""
+
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="load")
+        self._futures: dict[str, Future] = {}
+        self.ready = False
+
+    def _build(self, name: str, factory: Callable[[], object]) -> object:
+        """Build the model, then warm it up, before it counts as loaded."""
+        with timed(name):
+            model = factory()
+        if warm_up := getattr(model, "warm_up", None):
+            with timed(f"{name} warm-up"):
+                warm_up()
+        return model
+
+    def load(self, name: str, factory: Callable[[], object]) -> Pending:
+        self._futures[name] = self._pool.submit(self._build, name, factory)
+        return Pending(self._futures[name])
+
+    def poll(self) -> bool:
+        """Return True once, when the last load finishes; raise if one failed."""
+        if self.ready or not all(f.done() for f in self._futures.values()):
+            return False
+        for future in self._futures.values():
+            future.result()
+        self._pool.shutdown(wait=False)
+        self.ready = True
+        return True
+
+    def wait(self) -> None:
+        """Block until every model has loaded (``poll`` still reports it)."""
+        for future in self._futures.values():
+            future.result()
@@ -0,0 +1,170 @@
+"""Background worker that runs the heavy models off the audio thread."""
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from onnxruntime.capi.onnxruntime_pybind11_state import (
+    EPFail,
+    Fail,
+    InvalidArgument,
+    RuntimeException,
+)
+
+from admission import model_access
+from logger import log
+
+# Lower runs first.  Each kind holds at most one queued job: a newer job of the
+# same kind replaces the queued one, and a final drops every queued job.
+PRIORITY = {"final": 0, "turn": 1, "speculative": 2, "partial": 3}
+
+# Running jobs whose result a final makes moot
+PREEMPTIBLE = ("partial", "speculative")
+
+RESULTS_SIZE = 16
+
+# What a failing forward pass raises: ORT's own errors, which don't derive
+# from the builtin ones, and the RuntimeError (torch), ValueError (shapes,
+# dtypes) and arithmetic errors of the models and their NumPy pre-processing
+MODEL_ERRORS = (
+    Fail,
+    InvalidArgument,
+    RuntimeException,
+    EPFail,
+    RuntimeError,
+    ValueError,
+    ArithmeticError,
+)
+
+
+@dataclass
+class Job:
+    kind: str
+    tag: int  # utterance or turn-check id the caller uses to spot stale results
+    audio: np.ndarray
+    fn: Callable[[np.ndarray], object]
+    submitted: float = 0.0
+
+
+@dataclass
+class Result:
+    kind: str
+    tag: int
+    value: object
+    seconds: float  # running the model
+    waited: float  # queued behind other jobs
+    started: float  # monotonic time the model began running
+    samples: int  # length of the job's audio
+
+
+class ModelWorker:
+    """Single thread running STT and Smart Turn jobs by priority.
+
+    Results land on the bounded ``results`` queue, which the daemon drains
+    between audio blocks; a full queue stalls this worker, never the VAD loop.
+    A bug that stops the thread is re-raised by ``check``, so the daemon
+    fails rather than waiting forever for results.
+    """
+
+    def __init__(self):
+        self.results: queue.Queue[Result] = queue.Queue(maxsize=RESULTS_SIZE)
+        self._slots: dict[str, Job] = {}
+        self._cond = threading.Condition()
+        self._running = False
+        self._current: Job | None = None
+        self._preempted: Job | None = None
+        self._error: Exception | None = None
+        self._thread = threading.Thread(
+            target=self._loop, name="model-worker", daemon=True
+        )
+
+    def start(self) -> None:
+        self._running = True
+        self._thread.start()
+
+    def submit(self, job: Job) -> None:
+        job.submitted = time.monotonic()
+        with self._cond:
+            stale = self._slots.get(job.kind)
+            if stale is not None:
+                log("job_dropped", stale.kind, tag=stale.tag)
+            if job.kind == "final":
+                self._slots.clear()
+                if self._current is not None and self._current.kind in PREEMPTIBLE:
+                    # Can't interrupt a forward pass; discard its result and
+                    # run the final straight after it
+                    self._preempted = self._current
+            self._slots[job.kind] = job
+            self._cond.notify()
+
+    def check(self) -> None:
+        """Re-raise the exception that stopped the worker thread, if any."""
+        if self._error is not None:
+            raise self._error
+
+    def idle(self) -> bool:
+        """True when no job is queued or running."""
+        with self._cond:
+            return not self._slots and self._current is None
+
+    def cancel(self, kind: str) -> None:
+        """Drop a queued job of ``kind`` (a running one still completes)."""
+        with self._cond:
+            self._slots.pop(kind, None)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5.0)
+
+    def _next(self) -> Job | None:
+        with self._cond:
+            while self._running and not self._slots:
+                self._cond.wait()
+            if not self._running:
+                return None
+            kind = min(self._slots, key=PRIORITY.__getitem__)
+            self._current = self._slots.pop(kind)
+            return self._current
+
+    def _keep(self, job: Job) -> bool:
+        """Return False if ``job`` was preempted while it ran."""
+        with self._cond:
+            if self._preempted is job:
+                self._preempted = None
+                log("job_preempted", job.kind, tag=job.tag)
+                return False
+            return True
+
+    def _loop(self) -> None:
+        while (job := self._next()) is not None:
+            # Live jobs go before any transcription service batch
+            with model_access.live():
+                start = time.monotonic()
+                try:
+                    value = job.fn(job.audio)
+                except MODEL_ERRORS as exc:
+                    log("model_error", f"{job.kind}: {exc}", level="error")
+                    value = None
+                except Exception as exc:
+                    # A bug, not a bad input: record it where the daemon logs
+                    log("model_crash", f"{job.kind}: {exc!r}", level="error")
+                    self._error = exc
+                    raise
+            if self._keep(job):
+                seconds = time.monotonic() - start
+                waited = start - job.submitted
+                self.results.put(
+                    Result(
+                        job.kind, job.tag, value, seconds, waited, start, len(job.audio)
+                    )
+                )
+            # Only now idle, so idle() implies the result is already queued
+            with self._cond:
+                self._current = None
+                self._preempted = None
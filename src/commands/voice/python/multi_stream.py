@@ -0,0 +1,114 @@
+"""Several audio sources in one daemon, sharing one set of models."""
+
+import signal
+import time
+
+from audio_capture import AudioCapture
+from keyboard_backend import SharedKeyboard, load_keyboard
+from keystroke_queue import KeystrokeQueue
+from logger import log
+from model_batcher import SharedSTT, SharedTurn
+from model_loader import ModelLoader, Ready
+from model_worker import ModelWorker
+from smart_turn import SmartTurn
+from stt import load_stt
+from vad import MAX_BATCH, BatchedVAD
+from voice_daemon import VoiceDaemon
+
+# Sleep when no source had audio, instead of blocking on any one of them
+POLL_SECONDS = 0.005
+
+
+class MultiStreamDaemon:
+    """Independent capture/VAD/turn-taking pipelines over shared models.
+
+    Each stream is a full ``VoiceDaemon`` with its own utterance buffer,
+    state machine, model worker and keystroke queue.  This loop reads every
+    source without blocking and scores all their new blocks with one
+    ``BatchedVAD`` call per time step.  The workers' STT and Smart Turn jobs
+    run concurrently, so jobs that overlap go through the shared models as
+    one padded forward pass (see ``model_batcher``).
+    """
+
+    def __init__(self, mics: list, keys: list, workers: list, config: dict):
+        self._running = True
+        self._mics = mics
+        loader = ModelLoader()
+        vad = loader.load("vad", lambda: BatchedVAD(len(mics)))
+        smart_turn = loader.load("smart_turn", SmartTurn)
+        stt = loader.load("stt", load_stt)
+        # The shared wrappers need the models themselves
+        loader.wait()
+        self.vad = vad.get()
+        self._turn = SharedTurn(smart_turn.get())
+        self.stt = stt.get()
+        self._stt = SharedSTT(self.stt)
+        self.streams = [
+            VoiceDaemon(
+                mic=mic,
+                keys=stream_keys,
+                worker=worker,
+                config=config,
+                models=(
+                    loader,
+                    Ready(self.vad.stream(i)),
+                    Ready(self._turn),
+                    Ready(self._stt),
+                ),
+                name=str(i),
+            )
+            for i, (mic, stream_keys, worker) in enumerate(zip(mics, keys, workers))
+        ]
+        log("multi_stream_init", f"{len(mics)} streams")
+
+    @classmethod
+    def for_mics(cls, config: dict) -> "MultiStreamDaemon":
+        """One stream per ``voice.mics`` device, typing through one keyboard."""
+        devices = config["mics"]
+        sink = SharedKeyboard(load_keyboard())
+        return cls(
+            [AudioCapture(device) for device in devices],
+            [KeystrokeQueue(sink) for _ in devices],
+            [ModelWorker() for _ in devices],
+            config,
+        )
+
+    def _handle_signal(self, signum, frame) -> None:
+        log("daemon_signal", f"Received signal {signum}")
+        self.stop()
+
+    def stop(self) -> None:
+        self._running = False
+
+    def reload(self, config: dict) -> None:
+        for stream in self.streams:
+            stream.reload(config)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        for stream in self.streams:
+            stream.start()
+        try:
+            while self._running:
+                for stream in self.streams:
+                    stream.poll()
+                batches = [mic.read_batch(MAX_BATCH, timeout=0) for mic in self._mics]
+                if not any(batches):
+                    time.sleep(POLL_SECONDS)
+                start = time.monotonic()
+                probs = self.vad.process_streams(batches)
+                seconds = time.monotonic() - start
+                for stream, blocks, stream_probs in zip(self.streams, batches, probs):
+                    stream.feed(blocks, stream_probs, seconds)
+        finally:
+            for stream in self.streams:
+                stream.close()
+            self._turn.stop()
+            self._stt.stop()
+
+    def batch_stats(self) -> dict:
+        return {
+            "stt": self._stt.frame_ids.stats(),
+            "smart_turn": self._turn.probability.stats(),
+        }
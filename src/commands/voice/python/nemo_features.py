@@ -0,0 +1,57 @@
+"""NeMo-compatible log-mel features in NumPy, for the ONNX STT backend.
+
+Reproduces NeMo's ``AudioToMelSpectrogramPreprocessor`` in eval mode (no
+dither) for a single utterance: pre-emphasis, centred zero-padded STFT with a
+symmetric Hann window, power mel spectrum, natural log with an additive
+guard, then per-feature normalisation over the valid frames.
+"""
+
+import numpy as np
+
+from log_mel import SAMPLE_RATE, mel_filters
+
+LOG_GUARD = 2.0**-24
+NORM_EPS = 1e-5
+
+
+class NemoFeatures:
+    """Feature extractor built from an exported model's preprocessor config."""
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        n_fft: int = 512,
+        window_size: float = 0.025,
+        window_stride: float = 0.01,
+        features: int = 80,
+        preemph: float | None = 0.97,
+        normalize: str = "per_feature",
+    ):
+        if sample_rate != SAMPLE_RATE or normalize != "per_feature":
+            raise ValueError(
+                f"unsupported preprocessor: sample_rate={sample_rate} "
+                f"normalize={normalize}"
+            )
+        win = int(window_size * sample_rate)
+        left = (n_fft - win) // 2
+        # torch.stft centres a shorter window inside the FFT frame
+        self._window = np.pad(np.hanning(win), (left, n_fft - win - left))
+        self._filters = mel_filters(features, n_fft)
+        self._n_fft = n_fft
+        self._hop = int(window_stride * sample_rate)
+        self._preemph = preemph
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        """Features for one utterance, shape (features, len(audio) // hop)."""
+        x = np.asarray(audio, dtype=np.float64)
+        if self._preemph:
+            x = np.concatenate((x[:1], x[1:] - self._preemph * x[:-1]))
+        n_frames = len(x) // self._hop  # NeMo drops the final centred frame
+        padded = np.pad(x, self._n_fft // 2)
+        frames = np.lib.stride_tricks.sliding_window_view(padded, self._n_fft)
+        frames = frames[:: self._hop][:n_frames] * self._window
+        power = np.abs(np.fft.rfft(frames, axis=-1)) ** 2
+        log_mel = np.log(power @ self._filters + LOG_GUARD)
+        mean = log_mel.mean(axis=0)
+        std = log_mel.std(axis=0, ddof=1) if n_frames > 1 else 0.0
+        return ((log_mel - mean) / (std + NORM_EPS)).T.astype(np.float32)
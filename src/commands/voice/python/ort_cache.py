@@ -0,0 +1,114 @@
+"""Graph-optimized ONNX models cached on disk, so sessions skip optimizing."""
+
+import hashlib
+import json
+import os
+import platform
+
+import onnxruntime as ort
+
+from logger import log
+
+CACHE_DIR = "optimized"  # under the models dir
+
+
+def _models_dir() -> str:
+    return os.environ.get(
+        "VOICE_MODELS_DIR", os.path.expanduser("~/.assist/voice/models")
+    )
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cpu_features() -> str:
+    """What optimized kernels may depend on: architecture and ISA flags."""
+    flags = ""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            flags = next(
+                (
+                    line.split(":", 1)[1]
+                    for line in f
+                    if line.startswith(("flags", "Features"))
+                ),
+                "",
+            )
+    except OSError:
+        pass  # not Linux; the processor string identifies the family
+    return " ".join([platform.machine(), platform.processor(), *sorted(flags.split())])
+
+
+def cache_key(model_path: str, level: ort.GraphOptimizationLevel) -> str:
+    """Changes with the source model, ORT version, CPU or optimization level."""
+    parts = [file_digest(model_path), ort.__version__, cpu_features(), str(level)]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def _sidecar(path: str) -> str:
+    return path + ".json"
+
+
+def _valid(path: str) -> bool:
+    """The entry exists and still matches the digest recorded when written."""
+    try:
+        with open(_sidecar(path), encoding="utf-8") as f:
+            expected = json.load(f)["sha256"]
+        return file_digest(path) == expected
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def _remove_stale(cache: str, stem: str) -> None:
+    """Drop entries for this model under any older key."""
+    for name in os.listdir(cache):
+        if name.startswith(f"{stem}."):
+            os.remove(os.path.join(cache, name))
+
+
+def _store(model_path: str, target: str, so: ort.SessionOptions, providers: list):
+    """Build the session from the source model, saving the optimized graph."""
+    cache = os.path.dirname(target)
+    os.makedirs(cache, exist_ok=True)
+    _remove_stale(cache, os.path.basename(target).split(".")[0])
+    tmp = target + ".tmp"
+    so.optimized_model_filepath = tmp
+    # ORT warns the graph is hardware-specific; cache_key covers that
+    so.log_severity_level = 3
+    session = ort.InferenceSession(model_path, sess_options=so, providers=providers)
+    with open(_sidecar(target), "w", encoding="utf-8") as f:
+        json.dump({"sha256": file_digest(tmp), "source": model_path}, f)
+    os.replace(tmp, target)
+    return session
+
+
+def cached_session(
+    model_path: str, so: ort.SessionOptions, providers: list[str]
+) -> ort.InferenceSession:
+    """Session on the cached optimized model; optimize and cache it on a miss.
+
+    Entries are named by ``cache_key``, and one whose recorded digest no
+    longer matches (truncated, edited) is rebuilt rather than loaded.  The
+    cached graph is already optimized, so it loads with optimization off.
+    """
+    stem = os.path.splitext(os.path.basename(model_path))[0].replace(".", "_")
+    key = cache_key(model_path, so.graph_optimization_level)
+    target = os.path.join(_models_dir(), CACHE_DIR, f"{stem}.{key}.onnx")
+    if _valid(target):
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        log("ort_cache_hit", stem, key=key)
+        return ort.InferenceSession(target, sess_options=so, providers=providers)
+    try:
+        session = _store(model_path, target, so, providers)
+    except (OSError, RuntimeError) as exc:
+        # Read-only models dir, or a graph ORT can't serialize
+        log("ort_cache_error", f"{stem}: {exc}", level="warn")
+        so.optimized_model_filepath = ""
+        return ort.InferenceSession(model_path, sess_options=so, providers=providers)
+    log("ort_cache_stored", stem, key=key)
+    return session
@@ -0,0 +1,174 @@
+"""On-demand profile of the running daemon, triggered without a restart.
+
+``kill -USR1 <pid>``, or creating ``voice.profile`` next to voice.log (for
+platforms without SIGUSR1), samples every thread's stack for
+VOICE_PROFILE_SECONDS and snapshots tracemalloc.  Two files are written
+next to voice.log:
+
+- ``profile-<time>.folded``: stack samples in the collapsed format that
+  flamegraph.pl and speedscope read, one line per distinct stack.
+- ``profile-<time>.alloc.txt``: the top allocating lines.  Allocations are
+  traced from the trigger, unless VOICE_TRACEMALLOC=1 traced from startup.
+
+Sampling runs on its own thread, so capture and the models keep running;
+each sample only holds the GIL long enough to walk the stacks.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from logger import LOG_FILE, log
+
+PROFILE_SECONDS = float(os.environ.get("VOICE_PROFILE_SECONDS", "10"))
+SAMPLE_SECONDS = 0.005
+TOP_ALLOCATORS = 50
+TRACE_FRAMES = 8  # tracemalloc frames kept per allocation
+
+TRIGGER_FILE = "voice.profile"
+POLL_SECONDS = 1.0
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    name = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({name}:{code.co_firstlineno})"
+
+
+def _stack(frame) -> list[str]:
+    """Frame labels from the thread's entry point down to ``frame``."""
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame))
+        frame = frame.f_back
+    return labels[::-1]
+
+
+def sample_stacks(seconds: float, stop: threading.Event) -> Counter:
+    """Count each thread's stack every SAMPLE_SECONDS, as folded lines."""
+    counts: Counter = Counter()
+    me = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not stop.is_set():
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != me:
+                thread = names.get(ident, str(ident)).replace(" ", "_")
+                counts[";".join([thread, *_stack(frame)])] += 1
+        stop.wait(SAMPLE_SECONDS)
+    return counts
+
+
+def top_allocators(snapshot: tracemalloc.Snapshot) -> list[str]:
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+    )
+    stats = snapshot.statistics("lineno")
+    total = sum(stat.size for stat in stats)
+    header = f"{total / 1024:.1f} KiB traced in {len(stats)} lines"
+    return [header, *(str(stat) for stat in stats[:TOP_ALLOCATORS])]
+
+
+class Profiler:
+    """Runs one profile at a time on request, writing into ``directory``."""
+
+    def __init__(self, directory: str):
+        self._dir = directory
+        self._lock = threading.Lock()
+        self._running: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._requested = threading.Event()
+        self._watch = threading.Thread(
+            target=self._watch_trigger, name="profile-trigger", daemon=True
+        )
+
+    def start(self) -> None:
+        if os.environ.get("VOICE_TRACEMALLOC") == "1":
+            tracemalloc.start(TRACE_FRAMES)
+        self._watch.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._watch.join(timeout=5.0)
+        if self._running:
+            self._running.join(timeout=5.0)
+
+    def request(self) -> None:
+        """Ask the watcher thread for a profile; only sets an Event, so it is
+        safe in a signal handler, where taking locks or logging could deadlock.
+        """
+        self._requested.set()
+
+    def trigger(self) -> bool:
+        """Start a profile unless one is running."""
+        with self._lock:
+            if self._running and self._running.is_alive():
+                log("profile_busy", "A profile is already running", level="warn")
+                return False
+            self._running = threading.Thread(
+                target=self._profile, name="profiler", daemon=True
+            )
+            self._running.start()
+        return True
+
+    def _watch_trigger(self) -> None:
+        path = os.path.join(self._dir, TRIGGER_FILE)
+        while not self._stop.wait(POLL_SECONDS):
+            requested = self._requested.is_set()
+            self._requested.clear()
+            if os.path.exists(path):
+                os.remove(path)
+                requested = True
+            if requested:
+                self.trigger()
+
+    def _profile(self) -> None:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(TRACE_FRAMES)
+        log("profile_start", f"{PROFILE_SECONDS:g}s")
+        begin = time.monotonic()
+        counts = sample_stacks(PROFILE_SECONDS, self._stop)
+        snapshot = tracemalloc.take_snapshot()
+        if started:
+            tracemalloc.stop()
+        seconds = round(time.monotonic() - begin, 2)
+
+        stem = os.path.join(self._dir, f"profile-{datetime.now():%Y%m%d-%H%M%S}")
+        try:
+            with open(f"{stem}.folded", "w", encoding="utf-8") as f:
+                f.writelines(f"{stack} {n}\n" for stack, n in counts.most_common())
+            with open(f"{stem}.alloc.txt", "w", encoding="utf-8") as f:
+                f.write("\n".join(top_allocators(snapshot)) + "\n")
+        except OSError as exc:
+            log("profile_error", str(exc), level="warn")
+            return
+        log(
+            "profile_written",
+            stem,
+            seconds=seconds,
+            samples=sum(counts.values()),
+            stacks=len(counts),
+        )
+
+
+def install_profiler() -> Profiler:
+    """Profile on SIGUSR1 (where it exists) or the trigger file.
+
+    Call from the main thread, which is the only one that can set handlers.
+    """
+    directory = os.path.dirname(LOG_FILE)
+    os.makedirs(directory, exist_ok=True)
+    profiler = Profiler(directory)
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.request())
+    profiler.start()
+    return profiler
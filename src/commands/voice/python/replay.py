@@ -0,0 +1,256 @@
+"""Replay WAV files through the voice daemon and report pipeline latency.
+
+Drives the real VoiceDaemon state machine and models from 16-bit PCM WAV
+files, with keystrokes recorded instead of sent, so it runs on Linux with no
+mic.  Without --realtime, audio is fed as fast as the pipeline takes it, and
+latencies measure processing only (no waiting for audio to arrive).
+
+--streams N feeds the files to N streams of one multi-stream daemon at once,
+sharing the models, to measure how throughput scales with batching.
+
+uv run --project src/commands/voice/python --extra runtime \\
+    python src/commands/voice/python/replay.py a.wav b.wav [--realtime] [--streams N]
+"""
+
+import argparse
+import bisect
+import json
+import queue
+import time
+
+import numpy as np
+
+import voice_daemon
+from keyboard_backend import RecordingKeyboard
+from keystroke_queue import KeystrokeQueue
+from logger import log
+from model_worker import RESULTS_SIZE, ModelWorker
+from voice_config import load_voice_config
+from wav_source import WavSource
+
+
+class RecordingQueue(queue.Queue):
+    """Model results queue that remembers every result the daemon applied."""
+
+    def __init__(self):
+        super().__init__(maxsize=RESULTS_SIZE)
+        self.applied = []
+
+    def get_nowait(self):
+        result = super().get_nowait()
+        self.applied.append(result)
+        return result
+
+
+class TimedVAD:
+    """Wraps the VAD, recording when each block was scored and what it cost."""
+
+    def __init__(self, vad):
+        self._vad = vad
+        self.scored: list[tuple[float, float]] = []  # (time, probability)
+        self.seconds = 0.0
+
+    def process_batch(self, blocks: list[np.ndarray]) -> np.ndarray:
+        start = time.monotonic()
+        probs = self._vad.process_batch(blocks)
+        self.record(probs, start, time.monotonic())
+        return probs
+
+    def record(self, probs, start: float, end: float) -> None:
+        self.seconds += end - start
+        self.scored.extend((end, float(p)) for p in probs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._vad, name)
+
+
+class TimedStreams:
+    """Wraps a ``BatchedVAD``, keeping a ``TimedVAD`` record per stream.
+
+    A call's time is split between the streams that had blocks in it.
+    """
+
+    def __init__(self, vad, streams: int):
+        self._vad = vad
+        self.streams = [TimedVAD(vad) for _ in range(streams)]
+
+    def process_streams(self, batches: list[list[np.ndarray]]) -> list[np.ndarray]:
+        start = time.monotonic()
+        probs = self._vad.process_streams(batches)
+        end = time.monotonic()
+        share = (end - start) / max(1, sum(1 for blocks in batches if blocks))
+        for timed, stream_probs in zip(self.streams, probs):
+            if len(stream_probs):
+                timed.record(stream_probs, end - share, end)
+        return probs
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {"n": 0}
+    ms = np.array(values) * 1000
+    return {
+        "n": len(values),
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p90_ms": round(float(np.percentile(ms, 90)), 1),
+        "max_ms": round(float(ms.max()), 1),
+    }
+
+
+def _turn_latencies(speech: list[float], keystrokes: list) -> tuple[list, list]:
+    """End-of-turn and first-keystroke latency for each submitted command."""
+    end_of_turn, first_key = [], []
+    since = float("-inf")
+    first = None
+    for t, op, _ in keystrokes:
+        first = first if first is not None else t
+        if op != "enter":
+            continue
+        lo = bisect.bisect_right(speech, since)
+        hi = bisect.bisect_right(speech, t)
+        if hi > lo:
+            end_of_turn.append(t - speech[hi - 1])
+            first_key.append(first - speech[lo])
+        since, first = t, None
+    return end_of_turn, first_key
+
+
+def summarize(source, vad, results, keys, wall: float) -> dict:
+    keyboard = keys.sink
+    speech = [t for t, p in vad.scored if p > vad.threshold]
+    end_of_turn, first_key = _turn_latencies(speech, keyboard.events)
+    by_kind: dict[str, list] = {
+        "partial": [],
+        "turn": [],
+        "speculative": [],
+        "final": [],
+    }
+    for result in results.applied:
+        by_kind[result.kind].append(result)
+    audio = source.seconds
+
+    def rtf(seconds: float) -> float:
+        return round(seconds / audio, 4)
+
+    return {
+        "audio_s": round(audio, 2),
+        "wall_s": round(wall, 2),
+        "commands": keyboard.submitted,
+        "typing": {
+            "keystrokes": keyboard.keystrokes,
+            "edits": keys.edits,
+            "injections": keys.injections,
+        },
+        "end_of_turn": _stats(end_of_turn),
+        "time_to_first_keystroke": _stats(first_key),
+        "partial_stt": _stats([r.waited + r.seconds for r in by_kind["partial"]]),
+        "rtf": {
+            "vad": rtf(vad.seconds),
+            "smart_turn": rtf(sum(r.seconds for r in by_kind["turn"])),
+            "stt_partial": rtf(sum(r.seconds for r in by_kind["partial"])),
+            "stt_speculative": rtf(sum(r.seconds for r in by_kind["speculative"])),
+            "stt_final": rtf(sum(r.seconds for r in by_kind["final"])),
+            "pipeline": rtf(wall),
+        },
+    }
+
+
+def replay(paths: list[str], realtime: bool, gap: float) -> dict:
+    keys = KeystrokeQueue(RecordingKeyboard())
+    worker = ModelWorker()
+    worker.results = RecordingQueue()
+    source = WavSource(
+        paths,
+        gap_seconds=gap,
+        realtime=realtime,
+        is_idle=lambda: worker.idle() and worker.results.empty(),
+        on_end=lambda: daemon.stop(),
+    )
+    # Benchmark the steady state, not model loading
+    voice_daemon.PROGRESSIVE_START = False
+    config = {**load_voice_config(), "submitWindows": []}
+    daemon = voice_daemon.VoiceDaemon(
+        mic=source, keys=keys, worker=worker, config=config
+    )
+    vad = daemon._vad = TimedVAD(daemon._vad)
+
+    start = time.monotonic()
+    daemon.run()
+    return summarize(source, vad, worker.results, keys, time.monotonic() - start)
+
+
+def replay_streams(paths: list[str], realtime: bool, gap: float, n: int) -> dict:
+    """Replay the files on ``n`` streams at once; report throughput and batching."""
+    from multi_stream import MultiStreamDaemon
+
+    keys = [KeystrokeQueue(RecordingKeyboard()) for _ in range(n)]
+    workers = [ModelWorker() for _ in range(n)]
+    ended: set[int] = set()
+
+    def end(i: int) -> None:
+        ended.add(i)
+        if len(ended) == n:
+            daemon.stop()
+
+    sources = []
+    for i, worker in enumerate(workers):
+        worker.results = RecordingQueue()
+        sources.append(
+            WavSource(
+                paths,
+                gap_seconds=gap,
+                realtime=realtime,
+                is_idle=lambda w=worker: w.idle() and w.results.empty(),
+                on_end=lambda i=i: end(i),
+            )
+        )
+    config = {**load_voice_config(), "submitWindows": []}
+    daemon = MultiStreamDaemon(sources, keys, workers, config)
+    vad = daemon.vad = TimedStreams(daemon.vad, n)
+
+    start = time.monotonic()
+    daemon.run()
+    wall = time.monotonic() - start
+    audio = sum(source.seconds for source in sources)
+    return {
+        "streams": n,
+        "audio_s": round(audio, 2),
+        "wall_s": round(wall, 2),
+        "rtf": round(wall / audio, 4),
+        "batches": daemon.batch_stats(),
+        "per_stream": [
+            summarize(*stream, wall)
+            for stream in zip(sources, vad.streams, [w.results for w in workers], keys)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="16-bit PCM WAV files")
+    parser.add_argument("--realtime", action="store_true", help="feed audio at 1x")
+    parser.add_argument(
+        "--gap",
+        type=float,
+        default=2.0,
+        help="seconds of silence around each file (over 1s ends a turn)",
+    )
+    parser.add_argument(
+        "--streams", type=int, default=1, help="replay on N streams at once"
+    )
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    if args.streams > 1:
+        report = replay_streams(args.files, args.realtime, args.gap, args.streams)
+    else:
+        report = replay(args.files, args.realtime, args.gap)
+    log("replay_report", "realtime" if args.realtime else "fast", **report)
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
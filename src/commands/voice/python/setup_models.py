@@ -4,6 +4,19 @@ import os
 import sys
 
 from logger import log
+from stt import DEFAULT_MODEL
+from stt_onnx import model_path
+
+
+def onnx_stt_selected() -> bool:
+    return os.environ.get("VOICE_MODEL_STT", "").endswith(".onnx")
+
+
+def stt_source() -> str:
+    """The NeMo model to download (and export, for the ONNX backend)."""
+    if onnx_stt_selected():
+        return os.environ.get("VOICE_STT_SOURCE", DEFAULT_MODEL)
+    return os.environ.get("VOICE_MODEL_STT", DEFAULT_MODEL)
 
 
 def get_models_dir() -> str:
@@ -47,7 +60,10 @@ def setup_smart_turn(models_dir: str) -> None:
 
 
 def setup_stt(models_dir: str) -> None:
-    model_name = os.environ.get("VOICE_MODEL_STT", "nvidia/parakeet-ctc-1.1b")
+    model_name = stt_source()
+    if model_name.endswith(".nemo"):
+        print(f"  Using local STT model: {model_name}")
+        return
     print(f"  Downloading STT model: {model_name}...")
     print("  (this may take a while on first run)")
 
@@ -58,31 +74,77 @@ def setup_stt(models_dir: str) -> None:
     print(f"  STT model ready: {model_name}")
 
 
+def setup_stt_onnx(models_dir: str) -> None:
+    target = model_path(os.environ["VOICE_MODEL_STT"])
+    if os.path.exists(target):
+        print(f"  {target} already exists")
+        return
+
+    source = stt_source()
+    print(f"  Exporting {source} to {target}...")
+    from export_stt import export
+
+    export(source, target)
+    print("  ONNX STT model ready")
+
+
+def setup_wake_word(models_dir: str) -> None:
+    """Shared openWakeWord feature models; the keyword model is user-supplied."""
+    import urllib.request
+
+    from kws import EMBEDDING_MODEL, MEL_MODEL
+
+    base = "https://github.com/dscripka/openWakeWord/releases/download/v0.5.1"
+    for name in (MEL_MODEL, EMBEDDING_MODEL):
+        target = os.path.join(models_dir, name)
+        if os.path.exists(target):
+            print(f"  {name} already exists")
+            continue
+        print(f"  Downloading {name}...")
+        urllib.request.urlretrieve(f"{base}/{name}", target)
+        log("setup_wake_word", f"Downloaded to {target}")
+    print(f"  Keyword model: {os.environ['VOICE_MODEL_WAKE_WORD']}")
+
+
+def setup_optimized(models_dir: str) -> None:
+    """Build the VAD and Smart Turn sessions once, caching optimized graphs."""
+    from smart_turn import SmartTurn
+    from vad import SileroVAD
+
+    SileroVAD()
+    SmartTurn()
+    print("  Optimized models cached (see ort_cache_* in the log)")
+
+
 def main() -> None:
     models_dir = get_models_dir()
     os.makedirs(models_dir, exist_ok=True)
     print(f"Models directory: {models_dir}\n")
 
-    print("[1/3] Silero VAD")
-    try:
-        setup_silero_vad(models_dir)
-    except Exception as e:
-        log("setup_vad_error", str(e), level="error")
-        print(f"  ERROR: {e}", file=sys.stderr)
-
-    print("\n[2/3] Smart Turn (pipecat-ai)")
-    try:
-        setup_smart_turn(models_dir)
-    except Exception as e:
-        log("setup_smart_turn_error", str(e), level="error")
-        print(f"  ERROR: {e}", file=sys.stderr)
-
-    print("\n[3/3] Parakeet STT (NeMo)")
-    try:
-        setup_stt(models_dir)
-    except Exception as e:
-        log("setup_stt_error", str(e), level="error")
-        print(f"  ERROR: {e}", file=sys.stderr)
+    steps = [
+        ("Silero VAD", setup_silero_vad, "setup_vad_error"),
+        ("Smart Turn (pipecat-ai)", setup_smart_turn, "setup_smart_turn_error"),
+        ("Parakeet STT (NeMo)", setup_stt, "setup_stt_error"),
+    ]
+    steps.append(("Optimized ONNX cache", setup_optimized, "setup_optimized_error"))
+    if onnx_stt_selected():
+        steps.append(
+            ("Parakeet STT ONNX export", setup_stt_onnx, "setup_stt_onnx_error")
+        )
+    if os.environ.get("VOICE_MODEL_WAKE_WORD"):
+        steps.append(
+            ("Wake word (openWakeWord)", setup_wake_word, "setup_wake_word_error")
+        )
+
+    for i, (title, setup, error_event) in enumerate(steps, 1):
+        if i > 1:
+            print()
+        print(f"[{i}/{len(steps)}] {title}")
+        try:
+            setup(models_dir)
+        except Exception as e:
+            log(error_event, str(e), level="error")
+            print(f"  ERROR: {e}", file=sys.stderr)
 
     print("\nSetup complete.")
 
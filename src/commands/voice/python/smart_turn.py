@@ -4,25 +4,16 @@ import os
 
 import numpy as np
 import onnxruntime as ort
-from transformers import WhisperFeatureExtractor
 
+from log_mel import MelStream, log_mel
 from logger import log
+from ort_cache import cached_session
 
 END_THRESHOLD = 0.5
 CHUNK_SECONDS = 8
 SAMPLE_RATE = 16000
 
 
-def _truncate_or_pad(audio: np.ndarray) -> np.ndarray:
-    max_samples = CHUNK_SECONDS * SAMPLE_RATE
-    if len(audio) > max_samples:
-        return audio[-max_samples:]
-    if len(audio) < max_samples:
-        padding = max_samples - len(audio)
-        return np.pad(audio, (padding, 0), mode="constant", constant_values=0)
-    return audio
-
-
 class SmartTurn:
     def __init__(self):
         model_path = os.environ.get("VOICE_MODEL_SMART_TURN")
@@ -38,26 +29,34 @@ class SmartTurn:
         so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
         so.inter_op_num_threads = 1
         so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-        self._session = ort.InferenceSession(
-            model_path, sess_options=so, providers=["CPUExecutionProvider"]
-        )
-        self._feature_extractor = WhisperFeatureExtractor(chunk_length=CHUNK_SECONDS)
-        self.threshold = END_THRESHOLD
-
-    def is_end_of_turn(self, audio: np.ndarray) -> bool:
-        """Check if the accumulated audio indicates end of utterance."""
-        audio = _truncate_or_pad(audio)
-        inputs = self._feature_extractor(
-            audio,
-            sampling_rate=SAMPLE_RATE,
-            return_tensors="np",
-            padding="max_length",
-            max_length=CHUNK_SECONDS * SAMPLE_RATE,
-            truncation=True,
-            do_normalize=True,
-        )
-        features = inputs.input_features.squeeze(0).astype(np.float32)
-        features = np.expand_dims(features, axis=0)
-        outputs = self._session.run(None, {"input_features": features})
-        prob = float(outputs[0][0].item())
-        return prob > self.threshold
+        self._session = cached_session(model_path, so, ["CPUExecutionProvider"])
+
+    def probability(self, features: np.ndarray) -> float:
+        """End-of-turn probability for (n_mels, frames) log-mel features."""
+        outputs = self._session.run(None, {"input_features": features[None]})
+        return float(outputs[0][0].item())
+
+    def probability_batch(self, features: list[np.ndarray]) -> list[float]:
+        """``probability`` for several windows in one forward pass."""
+        outputs = self._session.run(None, {"input_features": np.stack(features)})
+        return [float(p) for p in outputs[0].reshape(len(features), -1)[:, 0]]
+
+    def warm_up(self) -> None:
+        """Run once on silence so kernel setup isn't paid inside an utterance."""
+        self.probability(log_mel(np.zeros(CHUNK_SECONDS * SAMPLE_RATE, np.float32)))
+
+
+class TurnStream:
+    """End-of-turn checks on one growing utterance.
+
+    Mel frames are cached as the utterance grows, so a check only computes the
+    frames since the previous one.
+    """
+
+    def __init__(self, model: SmartTurn):
+        self._model = model
+        self._mel = MelStream(CHUNK_SECONDS * SAMPLE_RATE)
+
+    def probability(self, audio: np.ndarray) -> float:
+        """End-of-turn probability; ``audio`` is the whole utterance so far."""
+        return self._model.probability(self._mel.update(audio))
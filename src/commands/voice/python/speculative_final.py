@@ -0,0 +1,75 @@
+"""Final transcription started before the end of the turn is confirmed."""
+
+import itertools
+
+from audio_capture import BLOCK_SIZE
+from logger import log
+
+# Unique across utterances, so a late result can never match a newer job
+_tags = itertools.count(1)
+
+# Silence (blocks, ~96 ms) before speculating, so a VAD dip between words
+# doesn't start a pass that the next block invalidates
+SPECULATE_BLOCKS = 3
+# Audio past the last speech block that a pass must cover to be the final:
+# soft word endings can fall below the VAD threshold
+PAD_SAMPLES = SPECULATE_BLOCKS * BLOCK_SIZE
+
+
+class SpeculativeFinal:
+    """Tracks the newest transcription that covers all of an utterance's speech.
+
+    After the last speech block comes trailing silence, which adds nothing
+    to a CTC transcription once past the word endings just under the VAD
+    threshold.  So a partial or speculative pass that covers the last speech
+    block plus PAD_SAMPLES is the final answer, unless speech resumes.
+    """
+
+    def __init__(self):
+        self.tag = 0  # tag of the speculative job in flight, 0 if none
+        self.text: str | None = None
+        self.source = ""
+        self._speech_end = 0  # utterance samples up to the last speech block
+        self.covered = 0  # samples behind ``text`` or the job in flight
+
+    def speech(self, samples: int) -> bool:
+        """A speech block ended at ``samples``; True if that voids a job in flight."""
+        self._speech_end = samples
+        self.text = None
+        voided, self.tag = bool(self.tag), 0
+        return voided
+
+    def partial(self, samples: int, text: str) -> None:
+        """A partial pass over the first ``samples`` samples was applied."""
+        if samples >= self._speech_end + PAD_SAMPLES and not self.tag:
+            self.text, self.source, self.covered = text, "partial", samples
+
+    def wanted(self) -> bool:
+        """Nothing in hand or in flight covers the speech yet."""
+        return self.text is None and not self.tag
+
+    def start(self, samples: int) -> int:
+        """Register a speculative pass over ``samples`` samples; return its tag."""
+        self.tag = next(_tags)
+        self.covered = samples
+        return self.tag
+
+    def done(self, tag: int, text: str) -> bool:
+        """Apply a speculative result; False if it was voided or superseded."""
+        if tag != self.tag:
+            return False
+        self.tag = 0
+        self.text, self.source = text, "speculative"
+        return True
+
+    def reuse(self, trace: int) -> bool:
+        """At the end of the turn: whether a pass in hand or in flight is final."""
+        if self.wanted():
+            return False
+        log(
+            "final_reused",
+            self.source if self.text is not None else "speculative (running)",
+            trace=trace,
+            covered_s=round(self.covered / 16000, 2),
+        )
+        return True
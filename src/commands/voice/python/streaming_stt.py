@@ -0,0 +1,117 @@
+"""Incremental CTC transcription with local-agreement prefix commits."""
+
+from typing import Protocol
+
+import numpy as np
+
+from logger import log
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 1280  # 10 ms hop x 8x subsampling (FastConformer encoder)
+
+# Audio before the commit point re-fed as left context; its tokens are ignored
+LOOKBACK_SAMPLES = 2 * SAMPLE_RATE
+# Tokens this close to the end of the audio are never committed (unstable)
+MARGIN_FRAMES = 8  # 640 ms
+# Past this much uncommitted audio, commit what is settled without agreement
+MAX_PENDING_SAMPLES = 8 * SAMPLE_RATE
+
+
+class CTCModel(Protocol):
+    blank_id: int
+
+    def frame_ids(self, audio: np.ndarray) -> np.ndarray: ...
+
+    def decode(self, ids: list[int]) -> str: ...
+
+
+def collapse(preds: np.ndarray, first: int, blank: int) -> list[tuple[int, int]]:
+    """Greedy CTC collapse of ``preds[first:]`` into (frame, token) pairs.
+
+    A token repeated across ``first`` continues one already emitted before it,
+    so it is not emitted again.
+    """
+    prev = int(preds[first - 1]) if first > 0 else blank
+    tokens = []
+    for frame in range(first, len(preds)):
+        token = int(preds[frame])
+        if token != blank and token != prev:
+            tokens.append((frame, token))
+        prev = token
+    return tokens
+
+
+def _agreement(a: list[tuple[int, int]], b: list[tuple[int, int]]) -> int:
+    n = 0
+    for (_, x), (_, y) in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class STTStream:
+    """Transcribes one growing utterance without re-decoding settled audio.
+
+    Each pass decodes only the audio after the commit point plus a bounded
+    lookback.  Tokens two consecutive passes agree on (and that are not right
+    at the edge of the audio) are committed and the commit point advances, so
+    per-pass cost stays bounded instead of growing with the utterance.
+    """
+
+    def __init__(self, model: CTCModel):
+        self._model = model
+        self._offset = 0  # utterance sample where uncommitted audio starts
+        self._committed: list[int] = []
+        self._previous: list[tuple[int, int]] = []
+        # Tunable per stream (see latency_governor)
+        self.lookback = LOOKBACK_SAMPLES
+        self.max_pending = MAX_PENDING_SAMPLES
+        self.decoded = 0  # samples decoded by the latest pass
+
+    def _start(self) -> int:
+        start = max(0, self._offset - self.lookback)
+        return start - start % FRAME_SAMPLES
+
+    def decode_length(self, samples: int) -> int:
+        """Samples a pass over the first ``samples`` would decode now."""
+        return samples - self._start()
+
+    def _pass(self, audio: np.ndarray) -> list[tuple[int, int]]:
+        """Decode from the commit point; frames are utterance-absolute."""
+        start = self._start()
+        self.decoded = len(audio) - start
+        preds = self._model.frame_ids(audio[start:])
+        first = (self._offset - start) // FRAME_SAMPLES
+        base = start // FRAME_SAMPLES
+        tokens = collapse(preds, first, self._model.blank_id)
+        return [(base + frame, token) for frame, token in tokens]
+
+    def _commit(self, tokens: list[tuple[int, int]], end_frame: int) -> int:
+        agreed = _agreement(tokens, self._previous)
+        if (end_frame * FRAME_SAMPLES) - self._offset > self.max_pending:
+            agreed = len(tokens)
+        n = 0
+        while n < agreed and tokens[n][0] < end_frame - MARGIN_FRAMES:
+            n += 1
+        if n:
+            self._committed.extend(token for _, token in tokens[:n])
+            self._offset = (tokens[n - 1][0] + 1) * FRAME_SAMPLES
+        return n
+
+    def partial(self, audio: np.ndarray) -> str:
+        """Transcribe the utterance so far; ``audio`` is the whole utterance."""
+        tokens = self._pass(audio)
+        n = self._commit(tokens, len(audio) // FRAME_SAMPLES)
+        self._previous = tokens[n:]
+        text = self._model.decode(self._committed + [t for _, t in tokens[n:]])
+        log("stt_result", text, committed_s=round(self._offset / SAMPLE_RATE, 2))
+        return text
+
+    def final(self, audio: np.ndarray) -> str:
+        """Decode the uncommitted tail and join it to the committed prefix."""
+        tokens = self._pass(audio)
+        text = self._model.decode(self._committed + [t for _, t in tokens])
+        decoded_s = round(self.decoded / SAMPLE_RATE, 2)
+        log("stt_result", text, final=True, decoded_s=decoded_s)
+        return text
@@ -1,38 +1,99 @@
-"""Parakeet NeMo STT wrapper (GPU)."""
+"""Parakeet NeMo STT wrapper (GPU), and the STT backend selection."""
 
 import os
+
 import numpy as np
-import torch
 
 from logger import log
+from model_loader import timed
 
 DEFAULT_MODEL = "nvidia/parakeet-ctc-1.1b"
 
 
+def load_stt():
+    """Build the STT backend ``VOICE_MODEL_STT`` selects.
+
+    A path ending in ``.onnx`` runs the exported model on onnxruntime (see
+    export_stt.py); anything else is a NeMo model name.
+    """
+    model_name = os.environ.get("VOICE_MODEL_STT", DEFAULT_MODEL)
+    if model_name.endswith(".onnx"):
+        from stt_onnx import OnnxSTT, model_path
+
+        return OnnxSTT(model_path(model_name))
+    return ParakeetSTT()
+
+
 class ParakeetSTT:
-    def __init__(self):
-        model_name = os.environ.get("VOICE_MODEL_STT", DEFAULT_MODEL)
+    def __init__(self, model_name: str | None = None):
+        model_name = model_name or os.environ.get("VOICE_MODEL_STT", DEFAULT_MODEL)
+        # torch and NeMo take seconds to import, so only the loader pays it
+        with timed("import torch"):
+            import torch
         self._device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         log("stt_init", f"model={model_name} device={self._device}")
 
-        import nemo.collections.asr as nemo_asr
+        with timed("import nemo"):
+            import nemo.collections.asr as nemo_asr
 
-        self._model = nemo_asr.models.EncDecCTCModelBPE.from_pretrained(model_name)
-        self._model = self._model.to(self._device)
+        with timed("stt restore"):
+            self._model = nemo_asr.models.EncDecCTCModelBPE.from_pretrained(model_name)
+            self._model = self._model.to(self._device)
         self._model.eval()
+        # CTC blank is the extra class after the tokenizer vocabulary
+        self.blank_id = self._model.decoder.num_classes_with_blank - 1
         log("stt_ready")
 
-    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000) -> str:
-        """Transcribe audio buffer to text via direct forward pass."""
-        audio_tensor = (
-            torch.tensor(audio, dtype=torch.float32).unsqueeze(0).to(self._device)
-        )
+    def _forward(self, audio: np.ndarray):
+        import torch
+
+        # No copy for the float32 utterance buffer views the daemon passes in
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        audio_tensor = torch.from_numpy(audio).unsqueeze(0).to(self._device)
         audio_len = torch.tensor([audio.shape[0]], dtype=torch.long).to(self._device)
+        logits, logits_len, _ = self._model.forward(
+            input_signal=audio_tensor, input_signal_length=audio_len
+        )
+        return logits, logits_len
+
+    def frame_ids(self, audio: np.ndarray) -> np.ndarray:
+        """Greedy CTC token id per encoder frame (blanks and repeats kept)."""
+        import torch
 
+        with torch.no_grad():
+            logits, logits_len = self._forward(audio)
+            preds = torch.argmax(logits[0, : int(logits_len[0])], dim=-1)
+        return preds.cpu().numpy()
+
+    def frame_ids_batch(self, audios: list[np.ndarray]) -> list[np.ndarray]:
+        """``frame_ids`` for several clips in one zero-padded forward pass."""
+        import torch
+
+        lengths = [len(audio) for audio in audios]
+        batch = np.zeros((len(audios), max(lengths)), dtype=np.float32)
+        for row, audio in zip(batch, audios):
+            row[: len(audio)] = audio
         with torch.no_grad():
             logits, logits_len, _ = self._model.forward(
-                input_signal=audio_tensor, input_signal_length=audio_len
+                input_signal=torch.from_numpy(batch).to(self._device),
+                input_signal_length=torch.tensor(lengths).to(self._device),
             )
+            preds = torch.argmax(logits, dim=-1).cpu().numpy()
+        return [row[:n] for row, n in zip(preds, logits_len.cpu().numpy())]
+
+    def warm_up(self) -> None:
+        """One pass on a second of silence, so CUDA setup happens at load."""
+        self.frame_ids(np.zeros(16000, dtype=np.float32))
+
+    def decode(self, ids: list[int]) -> str:
+        return self._model.tokenizer.ids_to_text(ids) if ids else ""
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000) -> str:
+        """Transcribe audio buffer to text via direct forward pass."""
+        import torch
+
+        with torch.no_grad():
+            logits, logits_len = self._forward(audio)
             # Greedy CTC decode
             preds = torch.argmax(logits, dim=-1)
             text = self._model.decoding.ctc_decoder_predictions_tensor(
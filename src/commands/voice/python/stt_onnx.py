@@ -0,0 +1,92 @@
+"""Parakeet CTC STT on onnxruntime (CPU), for machines without a GPU."""
+
+import json
+import os
+
+import numpy as np
+import onnxruntime as ort
+
+from logger import log
+from model_loader import timed
+from nemo_features import NemoFeatures
+from streaming_stt import collapse
+
+# Written next to the exported model by export_stt.py
+CONFIG_FILE = "config.json"
+
+# FastConformer encoder frames are 8 feature frames each
+SUBSAMPLING = 8
+
+
+def model_path(name: str) -> str:
+    """``VOICE_MODEL_STT`` as a path; relative ones are under the models dir."""
+    name = os.path.expanduser(name)
+    if os.path.isabs(name):
+        return name
+    models_dir = os.environ.get(
+        "VOICE_MODELS_DIR",
+        os.path.expanduser("~/.assist/voice/models"),
+    )
+    return os.path.join(models_dir, name)
+
+
+class OnnxSTT:
+    """Exported encoder + CTC head behind the same interface as ``ParakeetSTT``.
+
+    Features are computed in NumPy (``NemoFeatures``) and tokens are decoded
+    from the exported vocabulary, so neither torch nor NeMo is imported.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(os.path.dirname(path), CONFIG_FILE)) as f:
+            config = json.load(f)
+        self._features = NemoFeatures(**config["preprocessor"])
+        self._vocabulary: list[str] = config["vocabulary"]
+        # CTC blank is the extra class after the tokenizer vocabulary
+        self.blank_id = len(self._vocabulary)
+
+        log("stt_init", f"model={path} backend=onnx")
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        with timed("stt session"):
+            self._session = ort.InferenceSession(
+                path, sess_options=so, providers=["CPUExecutionProvider"]
+            )
+        # (audio_signal, length); the exporter drops length if it is unused
+        self._inputs = [i.name for i in self._session.get_inputs()]
+        log("stt_ready")
+
+    def frame_ids(self, audio: np.ndarray) -> np.ndarray:
+        """Greedy CTC token id per encoder frame (blanks and repeats kept)."""
+        features = self._features(audio)
+        length = np.array([features.shape[1]], dtype=np.int64)
+        feed = dict(zip(self._inputs, (features[None], length)))
+        logprobs = self._session.run(None, feed)[0]
+        return logprobs[0].argmax(axis=-1)
+
+    def frame_ids_batch(self, audios: list[np.ndarray]) -> list[np.ndarray]:
+        """``frame_ids`` for several clips in one zero-padded forward pass."""
+        clips = [self._features(audio) for audio in audios]
+        lengths = np.array([c.shape[1] for c in clips], dtype=np.int64)
+        batch = np.zeros((len(clips), clips[0].shape[0], lengths.max()), np.float32)
+        for row, features in zip(batch, clips):
+            row[:, : features.shape[1]] = features
+        feed = dict(zip(self._inputs, (batch, lengths)))
+        ids = self._session.run(None, feed)[0].argmax(axis=-1)
+        return [row[: -(-n // SUBSAMPLING)] for row, n in zip(ids, lengths)]
+
+    def warm_up(self) -> None:
+        """One pass on a second of silence, so kernel setup happens at load."""
+        self.frame_ids(np.zeros(16000, dtype=np.float32))
+
+    def decode(self, ids: list[int]) -> str:
+        # SentencePiece marks word starts with U+2581
+        text = "".join(self._vocabulary[i] for i in ids)
+        return text.replace("▁", " ").strip()
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000) -> str:
+        """Transcribe audio buffer to text."""
+        tokens = collapse(self.frame_ids(audio), 0, self.blank_id)
+        text = self.decode([token for _, token in tokens])
+        log("stt_result", text)
+        return text
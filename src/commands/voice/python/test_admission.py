@@ -0,0 +1,58 @@
+import threading
+import time
+
+import admission
+from admission import Admission
+
+
+def test_live_jobs_do_not_wait_for_each_other():
+    access = Admission()
+    with access.live(), access.live():
+        assert access._live == 2
+
+
+def test_batch_waits_for_the_grace_period_after_live_work(monkeypatch):
+    monkeypatch.setattr(admission, "BATCH_GRACE_SECONDS", 0.1)
+    access = Admission()
+    with access.live():
+        pass
+    start = time.monotonic()
+    with access.batch():
+        waited = time.monotonic() - start
+    assert waited >= 0.09
+
+
+def test_live_job_waits_for_the_running_batch_pass(monkeypatch):
+    monkeypatch.setattr(admission, "BATCH_GRACE_SECONDS", 0.0)
+    access = Admission()
+    order = []
+
+    def live():
+        with access.live():
+            order.append("live")
+
+    with access.batch():
+        thread = threading.Thread(target=live)
+        thread.start()
+        thread.join(timeout=0.05)
+        order.append("batch")
+    thread.join(timeout=5)
+    assert order == ["batch", "live"]
+
+
+def test_batch_waits_while_a_live_job_runs(monkeypatch):
+    monkeypatch.setattr(admission, "BATCH_GRACE_SECONDS", 0.0)
+    access = Admission()
+    order = []
+
+    def batch():
+        with access.batch():
+            order.append("batch")
+
+    with access.live():
+        thread = threading.Thread(target=batch)
+        thread.start()
+        thread.join(timeout=0.05)
+        order.append("live")
+    thread.join(timeout=5)
+    assert order == ["live", "batch"]
@@ -0,0 +1,52 @@
+import numpy as np
+
+from audio_buffer import UtteranceBuffer
+
+
+def _ramp(start: int, n: int) -> np.ndarray:
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def test_view_is_everything_appended():
+    buf = UtteranceBuffer(10)
+    buf.append(_ramp(0, 3))
+    buf.append(_ramp(3, 4))
+    assert len(buf) == 7
+    np.testing.assert_array_equal(buf.view(), _ramp(0, 7))
+
+
+def test_wraps_keeping_the_most_recent_samples_contiguous():
+    buf = UtteranceBuffer(10)
+    for start in range(0, 25, 5):
+        buf.append(_ramp(start, 5))
+    view = buf.view()
+    assert len(buf) == 10
+    np.testing.assert_array_equal(view, _ramp(15, 10))
+    assert view.base is not None  # a view of the backing array, not a copy
+
+
+def test_chunk_longer_than_capacity_keeps_its_tail():
+    buf = UtteranceBuffer(4)
+    buf.append(_ramp(0, 3))
+    buf.append(_ramp(3, 9))
+    np.testing.assert_array_equal(buf.view(), _ramp(8, 4))
+
+
+def test_last_is_clamped_to_what_is_buffered():
+    buf = UtteranceBuffer(10)
+    buf.append(_ramp(0, 6))
+    np.testing.assert_array_equal(buf.last(2), _ramp(4, 2))
+    np.testing.assert_array_equal(buf.last(50), _ramp(0, 6))
+
+
+def test_clear_empties_without_touching_earlier_views():
+    buf = UtteranceBuffer(10)
+    buf.append(_ramp(0, 6))
+    old = buf.view()
+    buf.clear()
+    assert len(buf) == 0
+    assert not buf
+    assert len(buf.view()) == 0
+    np.testing.assert_array_equal(old, _ramp(0, 6))
+    buf.append(_ramp(100, 2))
+    np.testing.assert_array_equal(buf.view(), _ramp(100, 2))
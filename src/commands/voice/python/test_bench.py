@@ -0,0 +1,28 @@
+import numpy as np
+
+from bench import _allocations, compare
+
+BASE = {"time_us": 10.0, "alloc_peak_b": 0, "alloc_count": 2.0}
+
+
+def test_allocations_count_blocks_a_call_returns():
+    buffer = np.zeros(1000)
+    assert _allocations(lambda: None)["alloc_count"] == 0
+    copied = _allocations(buffer.copy)
+    assert copied["alloc_count"] >= 1
+    assert copied["alloc_peak_b"] >= buffer.nbytes
+    assert copied["retained_b"] < 100  # the copies were freed afterwards
+
+
+def test_compare_flags_more_allocations():
+    assert compare(dict(BASE), BASE, 0.25) == []
+    assert compare({**BASE, "alloc_count": 3.0}, BASE, 0.25) == []  # slack
+    assert compare({**BASE, "alloc_count": 5.0}, BASE, 0.25) == [
+        "allocations 2.0 -> 5.0 per call"
+    ]
+
+
+def test_compare_against_a_baseline_without_counts():
+    old = {"time_us": 10.0, "alloc_peak_b": 0}
+    assert compare({**BASE, "alloc_count": 50.0}, old, 0.25) == []
+    assert compare({**BASE, "time_us": 20.0}, old, 0.25) == ["time 10.0 -> 20.0 us"]
@@ -0,0 +1,62 @@
+import numpy as np
+
+from capture_ring import CaptureRing
+
+
+def _ramp(start: int, n: int) -> np.ndarray:
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def test_writes_of_any_size_become_whole_frames():
+    ring = CaptureRing(8, 4)
+    ring.write(_ramp(0, 3))
+    assert ring.depth() == 0  # a partial frame isn't published
+    ring.write(_ramp(3, 7))
+    frames = ring.read(8, timeout=0)
+    np.testing.assert_array_equal(frames, _ramp(0, 8).reshape(2, 4))
+    assert ring.stats()["written"] == 2
+
+
+def test_read_returns_views_and_releases_them_on_the_next_read():
+    ring = CaptureRing(4, 2)
+    ring.write(_ramp(0, 4))
+    first = ring.read(4, timeout=0)
+    assert first.base is not None
+    assert len(first) == 2
+    assert ring.depth() == 0
+    ring.write(_ramp(4, 4))
+    assert len(ring.read(4, timeout=0)) == 2
+
+
+def test_read_never_crosses_the_end_of_the_ring():
+    ring = CaptureRing(4, 1)
+    ring.write(_ramp(0, 3))
+    ring.read(3, timeout=0)
+    assert len(ring.read(3, timeout=0)) == 0  # releases the first batch
+    ring.write(_ramp(3, 3))
+    np.testing.assert_array_equal(ring.read(4, timeout=0)[:, 0], [3])
+    np.testing.assert_array_equal(ring.read(4, timeout=0)[:, 0], [4, 5])
+
+
+def test_full_ring_drops_new_audio_and_counts_it():
+    ring = CaptureRing(2, 4)
+    ring.write(_ramp(0, 8))
+    ring.write(_ramp(8, 6))  # nowhere to go: the reader holds nothing yet
+    assert ring.dropped_samples == 6
+    assert ring.dropped == 2  # frames' worth, rounded up
+    np.testing.assert_array_equal(ring.read(2, timeout=0).ravel(), _ramp(0, 8))
+    assert ring.stats()["high_water"] == 2
+
+
+def test_frames_held_by_the_reader_are_not_overwritten():
+    ring = CaptureRing(2, 2)
+    ring.write(_ramp(0, 4))
+    held = ring.read(2, timeout=0)
+    ring.write(_ramp(4, 2))  # dropped: both frames are still held
+    np.testing.assert_array_equal(held.ravel(), _ramp(0, 4))
+    assert ring.dropped_samples == 2
+
+
+def test_read_times_out_empty():
+    ring = CaptureRing(2, 2)
+    assert len(ring.read(2, timeout=0.01)) == 0
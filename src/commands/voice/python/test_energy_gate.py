@@ -0,0 +1,77 @@
+import numpy as np
+
+from energy_gate import (
+    AUDIT,
+    AUDIT_EVERY,
+    HANGOVER,
+    MARGIN_DB,
+    PASS,
+    SILENT_DB,
+    SKIP,
+    EnergyGate,
+)
+
+
+def _gate(floor_db: float = -60.0) -> EnergyGate:
+    gate = EnergyGate()
+    gate.floor_db = floor_db
+    return gate
+
+
+def test_levels_ignore_hum_and_hear_speech_band_noise():
+    t = np.arange(512) / 16000
+    hum = 0.5 * np.sin(2 * np.pi * 50 * t)
+    noise = np.random.default_rng(0).normal(0, 0.05, 512)
+    silence = np.zeros(512)
+    levels = EnergyGate.levels(np.stack([hum, noise, silence]).astype(np.float32))
+    assert levels[2] < SILENT_DB
+    # The hum is 17 dB louder, but pre-emphasis takes it well below the noise
+    assert np.mean(hum**2) > 10 * np.mean(noise**2)
+    assert levels[1] > levels[0] + 10
+
+
+def test_everything_passes_until_there_is_a_floor():
+    assert EnergyGate().decide(-90.0) == PASS
+
+
+def test_quiet_blocks_skip_with_a_periodic_audit():
+    gate = _gate()
+    decisions = [gate.decide(-62.0) for _ in range(2 * AUDIT_EVERY)]
+    assert decisions.count(AUDIT) == 2
+    assert decisions[AUDIT_EVERY - 1] == AUDIT
+    assert decisions.count(SKIP) == 2 * AUDIT_EVERY - 2
+
+
+def test_loud_block_passes_with_a_hangover():
+    gate = _gate()
+    assert gate.decide(-60.0 + MARGIN_DB) == PASS
+    after = [gate.decide(-70.0) for _ in range(HANGOVER + 1)]
+    assert after == [PASS] * HANGOVER + [SKIP]
+
+
+def test_floor_falls_fast_and_rises_slowly():
+    gate = _gate()
+    gate.observe(-70.0, SKIP, speech=False)
+    fell = -60.0 - gate.floor_db
+    gate = _gate()
+    gate.observe(-50.0, PASS, speech=False)
+    rose = gate.floor_db + 60.0
+    assert fell > 10 * rose > 0
+
+
+def test_speech_and_digital_silence_leave_the_floor_alone():
+    gate = _gate()
+    gate.observe(-20.0, PASS, speech=True)
+    gate.observe(SILENT_DB, SKIP, speech=False)
+    assert gate.floor_db == -60.0
+    first = EnergyGate()
+    first.observe(-55.0, PASS, speech=False)
+    assert first.floor_db == -55.0
+
+
+def test_speech_on_an_audited_block_is_a_miss():
+    gate = _gate()
+    gate.observe(-62.0, AUDIT, speech=True)
+    gate.observe(-40.0, PASS, speech=True)
+    assert gate._missed == 1
+    assert gate._counts == {SKIP: 0, AUDIT: 1, PASS: 1}
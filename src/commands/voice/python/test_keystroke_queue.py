@@ -0,0 +1,115 @@
+import re
+import sys
+import threading
+import time
+
+import pytest
+
+from command_typing import CommandTyper
+from keyboard_backend import RecordingKeyboard, SharedKeyboard
+from keystroke_queue import KeystrokeQueue
+
+
+def _drain(keys: KeystrokeQueue) -> None:
+    keys.start()
+    keys.stop()
+
+
+def test_edits_queued_together_are_sent_as_one_batch():
+    sink = RecordingKeyboard()
+    keys = KeystrokeQueue(sink)
+    keys.type_text("open the dor")
+    keys.backspace(3)
+    keys.type_text("door")
+    _drain(keys)
+    assert sink.text == "open the door"
+    assert keys.edits == 3
+    assert keys.injections == 1
+
+
+def test_enter_is_a_barrier_edits_never_merge_across():
+    sink = RecordingKeyboard()
+    keys = KeystrokeQueue(sink)
+    keys.type_text("first")
+    keys.press_enter()
+    keys.type_text("second")
+    _drain(keys)
+    assert sink.submitted == ["first"]
+    assert sink.text == "second"
+    assert keys.injections == 2
+
+
+class FailingKeyboard(RecordingKeyboard):
+    def edit(self, backspaces: int, text: str) -> None:
+        if text == "fail":
+            raise OSError("device gone")
+        super().edit(backspaces, text)
+
+
+def test_a_failed_injection_is_logged_and_later_keys_still_go_out():
+    sink = FailingKeyboard()
+    keys = KeystrokeQueue(sink)
+    keys.type_text("fail")
+    keys.press_enter()
+    keys.type_text("ok")
+    _drain(keys)
+    assert sink.text == "ok"
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_a_bug_stops_dispatch_and_fails_later_calls_instead_of_blocking(
+    monkeypatch,
+):
+    monkeypatch.setattr("keystroke_queue.QUEUE_SIZE", 2)
+    release = threading.Event()
+
+    def buggy():
+        release.wait(5)
+        raise KeyError("bug")
+
+    keys = KeystrokeQueue(RecordingKeyboard())
+    keys.start()
+    keys.put(buggy)
+    keys.press_enter()
+    keys.press_enter()  # the queue is full now
+    blocked = threading.Thread(target=keys.press_enter)
+    blocked.start()
+    release.set()
+    blocked.join(timeout=5)
+    assert not blocked.is_alive()  # woken, not left waiting on a dead thread
+    keys._thread.join(timeout=5)
+    with pytest.raises(KeyError):
+        keys.check()
+    with pytest.raises(KeyError):
+        keys.type_text("more")
+
+
+def test_submit_window_allowlist_is_ignored_off_windows(monkeypatch):
+    monkeypatch.setattr(sys, "platform", "linux")
+    typer = CommandTyper(KeystrokeQueue(RecordingKeyboard()), {"Code.exe"})
+    assert typer._should_submit()
+
+
+class SlowKeyboard(RecordingKeyboard):
+    """Types a key at a time, yielding between keys like a chunked backend."""
+
+    def edit(self, backspaces: int, text: str) -> None:
+        for char in text:
+            time.sleep(0.0005)
+            super().edit(0, char)
+
+
+def test_streams_sharing_a_keyboard_never_interleave_an_edit():
+    sink = SlowKeyboard()
+    queues = [KeystrokeQueue(SharedKeyboard(sink))]
+    queues.append(KeystrokeQueue(queues[0].sink))
+    for keys in queues:
+        keys.start()
+    for _ in range(3):
+        for keys, word in zip(queues, ("a" * 30, "b" * 30)):
+            keys.type_text(word)
+            keys.press_enter()  # a barrier, so edits aren't merged
+    for keys in queues:
+        keys.stop()
+    assert re.fullmatch("(a{30}|b{30})*", "".join(sink.submitted) + sink.text)
+    assert len("".join(sink.submitted) + sink.text) == 180
@@ -0,0 +1,19 @@
+import threading
+
+import logger
+
+
+def test_records_dropped_from_many_threads_are_all_counted(monkeypatch):
+    monkeypatch.setattr(logger, "MAX_PENDING", 0)
+    before = logger.dropped
+
+    def spam():
+        for _ in range(2000):
+            logger.log("spam")
+
+    threads = [threading.Thread(target=spam) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert logger.dropped - before == 16000
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from model_batcher import Batcher
+
+
+def test_calls_queued_during_a_batch_go_out_together():
+    release = threading.Event()
+    sizes = []
+
+    def double(items):
+        sizes.append(len(items))
+        release.wait(5)
+        return [item * 2 for item in items]
+
+    batcher = Batcher("test", double)
+    try:
+        first = batcher.submit(1)
+        while not sizes:  # the first batch is running
+            threading.Event().wait(0.001)
+        rest = [batcher.submit(n) for n in (2, 3, 4)]
+        release.set()
+        assert [f.result(5) for f in [first, *rest]] == [2, 4, 6, 8]
+        assert sizes == [1, 3]
+        assert batcher.stats()["mean_batch"] == 2
+    finally:
+        batcher.stop()
+
+
+def test_model_error_fails_the_batch_and_the_batcher_carries_on():
+    def fn(items):
+        if items == ["bad"]:
+            raise ValueError("bad shape")
+        return items
+
+    batcher = Batcher("test", fn)
+    try:
+        with pytest.raises(ValueError):
+            batcher("bad")
+        assert batcher("good") == "good"
+    finally:
+        batcher.stop()
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_crash_fails_later_calls_instead_of_hanging_them():
+    def fn(items):
+        raise KeyError("bug")
+
+    batcher = Batcher("test", fn)
+    with pytest.raises(KeyError):
+        batcher("a")
+    batcher._thread.join(timeout=5)
+    with pytest.raises(KeyError):
+        batcher.submit("b").result(timeout=5)
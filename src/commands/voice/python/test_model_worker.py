@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from model_worker import Job, ModelWorker
+
+AUDIO = np.zeros(160, dtype=np.float32)
+
+
+def _results(worker: ModelWorker, n: int) -> list:
+    return [worker.results.get(timeout=5) for _ in range(n)]
+
+
+def test_runs_queued_jobs_by_priority():
+    worker = ModelWorker()
+    for kind in ("partial", "speculative", "turn"):
+        worker.submit(Job(kind, 1, AUDIO, lambda audio, kind=kind: kind))
+    worker.start()
+    try:
+        assert [r.kind for r in _results(worker, 3)] == [
+            "turn",
+            "speculative",
+            "partial",
+        ]
+    finally:
+        worker.stop()
+
+
+def test_newer_job_replaces_a_queued_one_of_its_kind():
+    worker = ModelWorker()
+    worker.submit(Job("partial", 1, AUDIO, lambda audio: "old"))
+    worker.submit(Job("partial", 2, AUDIO, lambda audio: "new"))
+    worker.start()
+    try:
+        (result,) = _results(worker, 1)
+        assert (result.tag, result.value) == (2, "new")
+        assert result.samples == len(AUDIO)
+    finally:
+        worker.stop()
+
+
+def test_final_drops_every_queued_job():
+    worker = ModelWorker()
+    worker.submit(Job("partial", 1, AUDIO, lambda audio: "partial"))
+    worker.submit(Job("turn", 1, AUDIO, lambda audio: 0.9))
+    worker.submit(Job("final", 1, AUDIO, lambda audio: "final"))
+    worker.start()
+    try:
+        (result,) = _results(worker, 1)
+        assert result.kind == "final"
+        assert worker.results.empty()
+    finally:
+        worker.stop()
+
+
+def test_model_error_gives_an_empty_result_and_the_worker_carries_on():
+    def broken(audio):
+        raise ValueError("bad shape")
+
+    worker = ModelWorker()
+    worker.submit(Job("turn", 1, AUDIO, broken))
+    worker.start()
+    try:
+        (result,) = _results(worker, 1)
+        assert result.value is None
+        worker.submit(Job("turn", 2, AUDIO, lambda audio: 0.5))
+        (result,) = _results(worker, 1)
+        assert result.value == 0.5
+    finally:
+        worker.stop()
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_bug_in_a_job_reaches_the_caller():
+    def buggy(audio):
+        raise KeyError("bug")
+
+    worker = ModelWorker()
+    worker.submit(Job("turn", 1, AUDIO, buggy))
+    worker.start()
+    worker._thread.join(timeout=5)
+    with pytest.raises(KeyError):
+        worker.check()
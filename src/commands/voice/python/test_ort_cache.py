@@ -0,0 +1,58 @@
+import json
+
+import onnxruntime as ort
+
+from ort_cache import _remove_stale, _valid, cache_key, file_digest
+
+EXTENDED = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+
+
+def _entry(tmp_path, data: bytes = b"optimized graph", digest: str | None = None):
+    path = tmp_path / "vad.1234.onnx"
+    path.write_bytes(data)
+    sidecar = {"sha256": digest or file_digest(str(path))}
+    (tmp_path / "vad.1234.onnx.json").write_text(json.dumps(sidecar))
+    return str(path)
+
+
+def test_entry_matching_its_sidecar_is_valid(tmp_path):
+    assert _valid(_entry(tmp_path))
+
+
+def test_entry_without_a_usable_sidecar_is_invalid(tmp_path):
+    path = tmp_path / "vad.1234.onnx"
+    path.write_bytes(b"graph")
+    assert not _valid(str(path))  # no sidecar
+    (tmp_path / "vad.1234.onnx.json").write_text("{not json")
+    assert not _valid(str(path))
+    (tmp_path / "vad.1234.onnx.json").write_text("{}")
+    assert not _valid(str(path))
+
+
+def test_truncated_entry_is_invalid(tmp_path):
+    path = _entry(tmp_path)
+    with open(path, "r+b") as f:
+        f.truncate(4)
+    assert not _valid(path)
+
+
+def test_missing_entry_is_invalid(tmp_path):
+    assert not _valid(str(tmp_path / "absent.onnx"))
+
+
+def test_cache_key_follows_the_model_and_level(tmp_path):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"weights v1")
+    key = cache_key(str(model), EXTENDED)
+    assert key == cache_key(str(model), EXTENDED)
+    assert len(key) == 16
+    assert key != cache_key(str(model), ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+    model.write_bytes(b"weights v2")
+    assert key != cache_key(str(model), EXTENDED)
+
+
+def test_remove_stale_drops_only_this_models_entries(tmp_path):
+    for name in ("vad.old.onnx", "vad.old.onnx.json", "stt.abc.onnx"):
+        (tmp_path / name).write_bytes(b"")
+    _remove_stale(str(tmp_path), "vad")
+    assert [p.name for p in tmp_path.iterdir()] == ["stt.abc.onnx"]
@@ -0,0 +1,55 @@
+import threading
+
+import profiler
+from profiler import Profiler
+
+
+def _logged(monkeypatch) -> list[str]:
+    events: list[str] = []
+    monkeypatch.setattr(profiler, "log", lambda event, *a, **k: events.append(event))
+    return events
+
+
+def _wait_for(predicate) -> bool:
+    for _ in range(500):
+        if predicate():
+            return True
+        threading.Event().wait(0.01)
+    return False
+
+
+def test_request_is_picked_up_by_the_watcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_SECONDS", 0.02)
+    monkeypatch.setattr(profiler, "POLL_SECONDS", 0.01)
+    events = _logged(monkeypatch)
+    prof = Profiler(str(tmp_path))
+    prof.start()
+    try:
+        prof.request()
+        assert _wait_for(lambda: "profile_written" in events)
+    finally:
+        prof.stop()
+    names = sorted(p.name.split(".", 1)[1] for p in tmp_path.iterdir())
+    assert names == ["alloc.txt", "folded"]
+
+
+def test_trigger_file_starts_a_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_SECONDS", 0.02)
+    monkeypatch.setattr(profiler, "POLL_SECONDS", 0.01)
+    events = _logged(monkeypatch)
+    (tmp_path / profiler.TRIGGER_FILE).touch()
+    prof = Profiler(str(tmp_path))
+    prof.start()
+    try:
+        assert _wait_for(lambda: "profile_written" in events)
+    finally:
+        prof.stop()
+    assert not (tmp_path / profiler.TRIGGER_FILE).exists()
+
+
+def test_unwritable_directory_is_logged_not_raised(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_SECONDS", 0.0)
+    events = _logged(monkeypatch)
+    prof = Profiler(str(tmp_path / "missing"))
+    prof._profile()
+    assert events == ["profile_start", "profile_error"]
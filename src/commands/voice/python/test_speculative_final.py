@@ -0,0 +1,34 @@
+from speculative_final import PAD_SAMPLES, SpeculativeFinal
+
+
+def test_partial_is_reused_only_once_it_covers_the_padding():
+    spec = SpeculativeFinal()
+    spec.speech(16000)
+    spec.partial(16000, "open the do")  # ends on the last speech block
+    assert spec.wanted()
+    spec.partial(16000 + PAD_SAMPLES - 1, "open the doo")
+    assert spec.wanted()
+    spec.partial(16000 + PAD_SAMPLES, "open the door")
+    assert not spec.wanted()
+    assert (spec.text, spec.source) == ("open the door", "partial")
+
+
+def test_speech_voids_the_pass_in_hand_and_in_flight():
+    spec = SpeculativeFinal()
+    spec.speech(8000)
+    tag = spec.start(8000 + PAD_SAMPLES)
+    assert not spec.wanted()
+    assert spec.speech(12000)  # voids the running job
+    assert not spec.done(tag, "stale")
+    assert spec.wanted()
+
+
+def test_partial_does_not_replace_a_speculative_pass_in_flight():
+    spec = SpeculativeFinal()
+    spec.speech(8000)
+    tag = spec.start(8000 + PAD_SAMPLES)
+    spec.partial(20000, "partial")
+    assert spec.text is None
+    assert spec.done(tag, "speculative")
+    assert spec.reuse(1)
+    assert spec.text == "speculative"
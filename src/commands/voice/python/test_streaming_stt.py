@@ -0,0 +1,89 @@
+import numpy as np
+
+from streaming_stt import (
+    FRAME_SAMPLES,
+    MARGIN_FRAMES,
+    SAMPLE_RATE,
+    STTStream,
+    collapse,
+)
+
+
+class FrameModel:
+    """CTC stand-in whose frame ids are the audio's value in each frame."""
+
+    blank_id = 0
+
+    def __init__(self):
+        self.seen: list[int] = []  # samples passed to each frame_ids call
+
+    def frame_ids(self, audio: np.ndarray) -> np.ndarray:
+        self.seen.append(len(audio))
+        return audio[::FRAME_SAMPLES][: len(audio) // FRAME_SAMPLES].astype(int)
+
+    def decode(self, ids: list[int]) -> str:
+        return " ".join(map(str, ids))
+
+
+def _utterance(frames: int, tokens: dict[int, int]) -> np.ndarray:
+    """``frames`` frames of blank audio with ``tokens`` {frame: id} in it."""
+    audio = np.zeros(frames * FRAME_SAMPLES, dtype=np.float32)
+    for frame, token in tokens.items():
+        audio[frame * FRAME_SAMPLES : (frame + 1) * FRAME_SAMPLES] = token
+    return audio
+
+
+def test_collapse_drops_blanks_and_repeats():
+    preds = np.array([0, 5, 5, 0, 5, 7, 7, 0])
+    assert collapse(preds, 0, 0) == [(1, 5), (4, 5), (5, 7)]
+
+
+def test_collapse_does_not_repeat_a_token_continuing_across_first():
+    preds = np.array([3, 3, 3, 4])
+    assert collapse(preds, 2, 0) == [(3, 4)]
+
+
+def test_commit_keeps_agreed_tokens_clear_of_the_edge():
+    stream = STTStream(FrameModel())
+    stream._previous = [(2, 11), (5, 12), (30, 13)]
+    tokens = [(2, 11), (5, 12), (30, 13), (31, 14)]
+    end = 32
+    assert tokens[2][0] >= end - MARGIN_FRAMES
+    assert stream._commit(tokens, end) == 2  # 13 agrees but is in the margin
+    assert stream._committed == [11, 12]
+    assert stream._offset == 6 * FRAME_SAMPLES
+
+
+def test_commit_nothing_without_agreement():
+    stream = STTStream(FrameModel())
+    stream._previous = [(2, 99)]
+    assert stream._commit([(2, 11), (5, 12)], 40) == 0
+    assert stream._committed == []
+    assert stream._offset == 0
+
+
+def test_commit_settled_tokens_once_too_much_is_pending():
+    stream = STTStream(FrameModel())
+    stream.max_pending = 10 * FRAME_SAMPLES
+    tokens = [(2, 11), (5, 12), (20, 13)]
+    assert stream._commit(tokens, 20) == 2  # no agreement needed; not 13
+    assert stream._committed == [11, 12]
+
+
+def test_partials_commit_and_decode_only_the_tail():
+    model = FrameModel()
+    stream = STTStream(model)
+    stream.max_pending = 20 * SAMPLE_RATE  # agreement alone decides here
+    frames = 10 * SAMPLE_RATE // FRAME_SAMPLES  # 125
+    audio = _utterance(frames, {3: 1, 10: 2, 20: 3, 60: 4, 100: 5, 120: 6})
+
+    assert stream.partial(audio[: 90 * FRAME_SAMPLES]) == "1 2 3 4"
+    assert stream._committed == []  # nothing to agree with yet
+    assert stream.partial(audio) == "1 2 3 4 5 6"
+    assert stream._committed == [1, 2, 3, 4]
+    assert stream._offset == 61 * FRAME_SAMPLES
+
+    assert stream.final(audio) == "1 2 3 4 5 6"
+    start = 61 * FRAME_SAMPLES - stream.lookback
+    assert model.seen[-1] == len(audio) - start < len(audio)
+    assert stream.decode_length(len(audio)) == len(audio) - start
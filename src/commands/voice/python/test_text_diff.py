@@ -0,0 +1,51 @@
+import pytest
+
+from text_diff import merge_edits, word_edit
+
+
+def _apply(screen: str, edit: tuple[int, str]) -> str:
+    backspaces, text = edit
+    return screen[: len(screen) - backspaces] + text
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "edit"),
+    [
+        ("open the", "open the", (0, "")),
+        ("", "open the door", (0, "open the door")),
+        ("open the", "open the door", (0, " door")),
+        ("open the dor", "open the door", (3, "door")),
+        ("open the door", "close the door", (13, "close the door")),
+    ],
+)
+def test_word_edit(old, new, edit):
+    assert word_edit(old, new) == edit
+    assert _apply(old, edit) == new
+
+
+def test_word_edit_keeps_the_common_word_prefix_on_screen():
+    old = "run the tests in the voice package"
+    new = "run the tests in the voice folder please"
+    backspaces, _ = word_edit(old, new)
+    assert backspaces == len("package")
+    assert _apply(old, word_edit(old, new)) == new
+
+
+def test_word_edit_leaves_the_separator_when_words_are_dropped():
+    assert word_edit("open the door now", "open the") == (8, "")
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        ((0, "open"), (0, " the")),
+        ((2, "door"), (1, "r")),
+        ((0, "ab"), (5, "xyz")),  # erases past what the first one typed
+        ((3, ""), (0, "")),
+    ],
+)
+def test_merge_edits_matches_applying_both(first, second):
+    screen = "typed so far"
+    assert _apply(screen, merge_edits(first, second)) == _apply(
+        _apply(screen, first), second
+    )
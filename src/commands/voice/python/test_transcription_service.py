@@ -0,0 +1,103 @@
+import json
+import os
+import socket
+import stat
+import threading
+from contextlib import nullcontext
+
+import numpy as np
+import pytest
+
+import transcription_service
+import transcripts
+from transcription_service import (
+    CHUNK_SECONDS,
+    SAMPLE_RATE,
+    Busy,
+    TranscriptionService,
+    split,
+)
+
+
+class FakeSTT:
+    blank_id = 0
+
+    def frame_ids_batch(self, pieces):
+        return [np.array([0, 1, 1, 0]) for _ in pieces]
+
+    def decode(self, ids):
+        return "word" * len(ids)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcription_service.model_access, "batch", nullcontext)
+    service = TranscriptionService(str(tmp_path / "voice.sock"), FakeSTT())
+    service.start()
+    yield service
+    service.stop()
+
+
+def _connect(service) -> socket.socket:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(service._path)
+    return client
+
+
+def test_split_cuts_long_audio_at_the_quietest_point():
+    limit = CHUNK_SECONDS * SAMPLE_RATE
+    audio = np.ones(limit + SAMPLE_RATE, dtype=np.float32)
+    quiet = limit - SAMPLE_RATE
+    audio[quiet : quiet + SAMPLE_RATE // 10] = 0.0
+    pieces = split(audio)
+    assert len(pieces) == 2
+    assert abs(len(pieces[0]) - (quiet + SAMPLE_RATE // 20)) <= 1
+    assert sum(map(len, pieces)) == len(audio)
+
+
+def test_busy_once_too_much_audio_is_queued(service, monkeypatch):
+    monkeypatch.setattr(transcription_service, "MAX_QUEUED_SECONDS", 1)
+    with pytest.raises(Busy):
+        service.transcribe(np.zeros(2 * SAMPLE_RATE, dtype=np.float32))
+    assert service.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32)) == "word"
+
+
+def test_socket_is_owner_only(service):
+    assert stat.S_IMODE(os.stat(service._path).st_mode) == 0o600
+
+
+def test_transcribe_over_the_socket(service):
+    pcm = np.zeros(SAMPLE_RATE, dtype="<i2").tobytes()
+    with _connect(service) as client:
+        request = {"op": "transcribe", "format": "pcm", "bytes": len(pcm)}
+        client.sendall(json.dumps(request).encode() + b"\n" + pcm)
+        reply = json.loads(client.makefile().readline())
+    assert reply == {"text": "word", "audio_s": 1.0}
+
+
+def test_subscription_ends_when_the_client_hangs_up(service, monkeypatch):
+    monkeypatch.setattr(transcription_service, "SUBSCRIBER_POLL_SECONDS", 0.01)
+    subscribed = threading.Event()
+    monkeypatch.setattr(
+        transcripts, "subscribe", _then(transcripts.subscribe, subscribed.set)
+    )
+    client = _connect(service)
+    client.sendall(b'{"op": "subscribe"}\n')
+    assert subscribed.wait(5)
+    transcripts.publish("final", "hello")
+    line = client.makefile().readline()
+    assert json.loads(line) == {"event": "final", "text": "hello"}
+    client.close()
+    for _ in range(500):
+        if not transcripts._subscribers:
+            break
+        threading.Event().wait(0.01)
+    assert transcripts._subscribers == []
+
+
+def _then(fn, after):
+    def wrapped(*args):
+        fn(*args)
+        after()
+
+    return wrapped
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from turn_schedule import TurnSchedule
+from vad import vad_threshold
+from voice_config import ConfigWatcher, read_voice_config, validate
+from wake_word import get_wake_words
+
+
+def _write(path, text: str) -> str:
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_validate_reports_each_bad_key():
+    errors = validate(
+        {
+            "wakeWords": ["computer"],
+            "vadThreshold": 1.5,
+            "turnMinSilenceMs": 200.5,
+            "keyboard": "xdotool",
+            "models": {"stt": "parakeet", "tts": "x"},
+            "colour": "blue",
+        }
+    )
+    assert errors == [
+        "vadThreshold: invalid value 1.5",
+        "turnMinSilenceMs: invalid value 200.5",
+        "keyboard: invalid value 'xdotool'",
+        "models.tts: expected a path",
+        "colour: unknown key",
+    ]
+
+
+def test_project_config_merges_over_global(tmp_path):
+    home = _write(
+        tmp_path / "global.yml",
+        "voice:\n  wakeWords: [computer]\n  models: {vad: a.onnx, stt: b}\n",
+    )
+    project = _write(
+        tmp_path / "project.yml", "voice:\n  models: {stt: c}\n  vadThreshold: 0.4\n"
+    )
+    config = read_voice_config([home, project, str(tmp_path / "missing.yml")])
+    assert config["models"] == {"vad": "a.onnx", "stt": "c"}
+    assert config["vadThreshold"] == 0.4
+    assert config["modelsDir"] == "~/.assist/voice/models"  # a default
+
+
+def test_invalid_config_raises(tmp_path):
+    bad = _write(tmp_path / "bad.yml", "voice:\n  vadThreshold: high\n")
+    with pytest.raises(ValueError, match="vadThreshold"):
+        read_voice_config([bad])
+    listed = _write(tmp_path / "list.yml", "voice: [computer]\n")
+    with pytest.raises(TypeError):
+        read_voice_config([listed])
+    repo = _write(tmp_path / "repo.yml", "repos:\n  x:\n    voice: {mic: y}\n")
+    with pytest.raises(ValueError, match="per-repo"):
+        read_voice_config([repo])
+
+
+def test_reload_hands_over_changes_without_touching_the_environment(tmp_path):
+    path = _write(tmp_path / "c.yml", "voice:\n  vadThreshold: 0.5\n")
+    seen = []
+    watcher = ConfigWatcher([path], read_voice_config([path]), seen.append)
+    env = dict(os.environ)
+
+    _write(tmp_path / "c.yml", "voice:\n  vadThreshold: [\n")  # half-saved
+    watcher._reload()
+    assert seen == []
+    _write(tmp_path / "c.yml", "voice:\n  vadThreshold: 0.7\n  turnThreshold: 0.6\n")
+    watcher._reload()
+    assert [c["vadThreshold"] for c in seen] == [0.7]
+    watcher._reload()  # unchanged
+    assert len(seen) == 1
+    assert dict(os.environ) == env
+
+
+def test_live_settings_come_from_the_config(monkeypatch):
+    monkeypatch.setenv("VOICE_VAD_THRESHOLD", "0.3")
+    monkeypatch.setenv("VOICE_WAKE_WORDS", "jarvis")
+    assert vad_threshold({"vadThreshold": 0.6}) == 0.6
+    assert vad_threshold({}) == 0.3
+    assert get_wake_words({"wakeWords": ["Computer "]}) == ["computer"]
+    assert get_wake_words({}) == ["jarvis"]
+    schedule = TurnSchedule(800, 512, {"turnThreshold": 0.7, "turnMinSilenceMs": 400})
+    assert schedule.threshold == 0.7
+    assert [ms for ms, _ in schedule._points] == [400, 600, 800]
@@ -0,0 +1,64 @@
+"""Word-level edits between typed text and newer transcriptions."""
+
+
+def word_edit(old: str, new_text: str) -> tuple[int, str]:
+    """Return (backspaces, text to type) that turn ``old`` into ``new_text``.
+
+    Only deletes back to the first word that changed; appends everything
+    after the common word prefix.  This avoids the jarring full-delete
+    that character-level diffing causes when earlier words shift slightly.
+    """
+    if old == new_text:
+        return 0, ""
+
+    old_words = old.split()
+    new_words = new_text.split()
+
+    # Find the longest common word prefix
+    common_words = 0
+    for a, b in zip(old_words, new_words):
+        if a == b:
+            common_words += 1
+        else:
+            break
+
+    # Character position where the common word prefix ends (including
+    # the trailing space after the last common word, if any).
+    if common_words == 0:
+        keep_chars = 0
+    else:
+        # Rejoin the common words and add one space (the separator before
+        # the next word that was already typed).
+        keep = " ".join(old_words[:common_words])
+        # Only count the trailing space if there were more old words after
+        # the common prefix (meaning that space is already on screen).
+        if common_words < len(old_words):
+            keep_chars = len(keep) + 1  # +1 for the space
+        else:
+            keep_chars = len(keep)
+
+    # Build the new suffix to type from the first divergent word onward
+    if common_words == 0:
+        to_type = new_text
+    else:
+        suffix = " ".join(new_words[common_words:])
+        if suffix:
+            # Need a space separator if we kept text and are appending
+            if keep_chars > 0 and common_words < len(old_words):
+                to_type = suffix
+            elif keep_chars > 0:
+                to_type = " " + suffix
+            else:
+                to_type = suffix
+        else:
+            to_type = ""
+
+    return len(old) - keep_chars, to_type
+
+
+def merge_edits(first: tuple[int, str], second: tuple[int, str]) -> tuple[int, str]:
+    """One edit with the effect of applying ``first`` and then ``second``."""
+    backspaces, text = first
+    erase, to_type = second
+    kept = max(len(text) - erase, 0)
+    return backspaces + max(erase - len(text), 0), text[:kept] + to_type
@@ -0,0 +1,256 @@
+"""Local transcription over a Unix socket, reusing the daemon's loaded STT.
+
+Requests are newline-terminated JSON on a stream connection:
+
+- ``{"op": "transcribe", "format": "wav" | "pcm", "bytes": n}`` followed by
+  ``n`` bytes of audio (``pcm`` is 16 kHz mono 16-bit little-endian) answers
+  ``{"text": ..., "audio_s": ...}``.  A connection may send several.
+- ``{"op": "subscribe"}`` streams the daemon's ``partial`` and ``final``
+  transcript events as JSON lines until the client hangs up.
+- ``{"op": "metrics"}`` answers the daemon's metrics in the Prometheus text
+  format (see ``metrics``) and closes the connection.
+
+Failures answer ``{"error": ...}``; ``"busy"`` means too much audio is
+already queued and the caller should retry later.
+"""
+
+import io
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+import wave
+from collections.abc import Callable
+
+import numpy as np
+
+import metrics
+import transcripts
+from admission import model_access
+from logger import log
+from model_batcher import Batcher
+from model_worker import MODEL_ERRORS
+from streaming_stt import collapse
+from wav_source import read_wav
+
+SAMPLE_RATE = 16000
+
+# Long audio is cut into pieces of at most this many seconds, at the quietest
+# 100 ms of the last few seconds.  Each piece is one batch item, so a live job
+# never waits behind more than one pass of MAX_BATCH pieces.
+CHUNK_SECONDS = 20
+SEARCH_SECONDS = 3
+MAX_BATCH = 4
+
+# Admission control: audio queued across all callers before "busy" replies
+MAX_QUEUED_SECONDS = 600
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+# Events buffered per subscriber; a slower reader misses events
+SUBSCRIBER_QUEUE = 256
+# How often an idle subscription checks that its client is still there
+SUBSCRIBER_POLL_SECONDS = 5.0
+
+
+class Busy(Exception):
+    """Too much batch audio is already queued."""
+
+
+def split(audio: np.ndarray) -> list[np.ndarray]:
+    """Cut ``audio`` into pieces of at most CHUNK_SECONDS at quiet points."""
+    limit = CHUNK_SECONDS * SAMPLE_RATE
+    search = SEARCH_SECONDS * SAMPLE_RATE
+    window = SAMPLE_RATE // 10
+    pieces = []
+    while len(audio) > limit:
+        energy = np.cumsum(audio[limit - search : limit].astype(np.float64) ** 2)
+        moving = energy[window:] - energy[:-window]
+        cut = limit - search + int(moving.argmin()) + window // 2
+        pieces.append(audio[:cut])
+        audio = audio[cut:]
+    return pieces + [audio] if len(audio) else pieces
+
+
+def _decode_audio(data: bytes, fmt: str) -> np.ndarray:
+    if fmt == "pcm":
+        return (np.frombuffer(data, dtype="<i2") / 32768.0).astype(np.float32)
+    if fmt == "wav":
+        return read_wav(io.BytesIO(data))
+    raise ValueError(f"unknown format {fmt!r}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, message: dict) -> None:
+        self.wfile.write((json.dumps(message) + "\n").encode())
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        service = self.server.service
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                self._reply({"error": "request is not JSON"})
+                return
+            op = request.get("op")
+            if op == "subscribe":
+                service.stream_events(self.wfile, self._closed)
+                return
+            if op == "metrics":
+                self.wfile.write(metrics.render().encode())
+                return
+            if op != "transcribe":
+                self._reply({"error": f"unknown op {op!r}"})
+                return
+            self._reply(service.handle_transcribe(request, self.rfile))
+
+    def _closed(self) -> bool:
+        """Whether the client has hung up, without reading what it sent."""
+        try:
+            peek = self.connection.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return False
+        except OSError:
+            return True
+        return peek == b""
+
+
+class TranscriptionService:
+    """Serves transcription and live transcript events on a Unix socket.
+
+    Requests from all callers go through one ``Batcher``, so pieces queued
+    while a pass runs share the next padded forward pass.  Every pass waits
+    for a gap in live mic traffic (``admission``), and requests beyond
+    MAX_QUEUED_SECONDS of waiting audio are turned away.
+    """
+
+    def __init__(self, path: str, stt):
+        self._path = path
+        self._stt = stt
+        self._batcher = Batcher("service_stt", self._run_batch, MAX_BATCH)
+        self._server: socketserver.BaseServer | None = None
+        self._lock = threading.Lock()
+        self._queued = 0  # samples submitted and not yet transcribed
+
+    def _run_batch(self, pieces: list[np.ndarray]) -> list[np.ndarray]:
+        with model_access.batch():
+            return self._stt.frame_ids_batch(pieces)
+
+    def _text(self, ids: np.ndarray) -> str:
+        tokens = collapse(ids, 0, self._stt.blank_id)
+        return self._stt.decode([token for _, token in tokens])
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        """Transcribe ``audio`` (16 kHz float32); raise ``Busy`` if over quota."""
+        with self._lock:
+            if self._queued + len(audio) > MAX_QUEUED_SECONDS * SAMPLE_RATE:
+                raise Busy(f"{self._queued / SAMPLE_RATE:.0f}s of audio queued")
+            self._queued += len(audio)
+        try:
+            futures = [self._batcher.submit(piece) for piece in split(audio)]
+            texts = [self._text(future.result()) for future in futures]
+        finally:
+            with self._lock:
+                self._queued -= len(audio)
+        return " ".join(text for text in texts if text)
+
+    def handle_transcribe(self, request: dict, rfile) -> dict:
+        size = int(request.get("bytes", 0))
+        if not 0 < size <= MAX_REQUEST_BYTES:
+            return {"error": f"bytes must be 1..{MAX_REQUEST_BYTES}"}
+        data = rfile.read(size)
+        if len(data) < size:
+            return {"error": "connection closed mid-audio"}
+        start = time.monotonic()
+        try:
+            audio = _decode_audio(data, request.get("format", "wav"))
+            text = self.transcribe(audio)
+        except Busy as exc:
+            log("service_busy", str(exc), level="warn")
+            return {"error": "busy"}
+        except (ValueError, EOFError, wave.Error) as exc:
+            return {"error": str(exc)}
+        except MODEL_ERRORS as exc:
+            log("service_error", str(exc), level="error")
+            return {"error": "transcription failed"}
+        except Exception as exc:
+            log("service_crash", repr(exc), level="error")
+            raise
+        audio_s = round(len(audio) / SAMPLE_RATE, 2)
+        seconds = round(time.monotonic() - start, 3)
+        log("service_transcribe", text, audio_s=audio_s, seconds=seconds)
+        return {"text": text, "audio_s": audio_s}
+
+    def stream_events(self, wfile, closed: Callable[[], bool]) -> None:
+        """Write transcript events to ``wfile`` until the client goes away.
+
+        A failed write ends it, and so does ``closed()``, checked whenever no
+        event has come for SUBSCRIBER_POLL_SECONDS.
+        """
+        events: queue.Queue[dict] = queue.Queue(maxsize=SUBSCRIBER_QUEUE)
+
+        def push(event: dict) -> None:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                pass  # never block the daemon on a slow reader
+
+        transcripts.subscribe(push)
+        log("service_subscribe")
+        try:
+            while True:
+                try:
+                    event = events.get(timeout=SUBSCRIBER_POLL_SECONDS)
+                except queue.Empty:
+                    if closed():
+                        break
+                    continue
+                wfile.write((json.dumps(event) + "\n").encode())
+                wfile.flush()
+        except OSError:
+            pass
+        finally:
+            transcripts.unsubscribe(push)
+            log("service_unsubscribe")
+
+    def start(self) -> None:
+        if os.path.exists(self._path) and stat.S_ISSOCK(os.stat(self._path).st_mode):
+            os.unlink(self._path)  # left behind by a daemon that crashed
+        # Created owner-only, so there is no moment anyone else can connect
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(self._path, _Handler)
+        finally:
+            os.umask(umask)
+        server.daemon_threads = True
+        server.service = self
+        threading.Thread(
+            target=server.serve_forever, name="transcription-service", daemon=True
+        ).start()
+        self._server = server
+        log("service_start", self._path)
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            os.unlink(self._path)
+            self._server = None
+        self._batcher.stop()
+
+
+def serve(config: dict, stt) -> TranscriptionService | None:
+    """Start the service if ``voice.socket`` is set and Unix sockets exist."""
+    path = config.get("socket")
+    if not path:
+        return None
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        log("service_error", "Unix sockets are not available", level="error")
+        return None
+    service = TranscriptionService(os.path.expanduser(path), stt)
+    service.start()
+    return service
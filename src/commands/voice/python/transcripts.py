@@ -0,0 +1,20 @@
+"""Live transcript events, for whatever subscribes (see transcription_service)."""
+
+from collections.abc import Callable
+
+_subscribers: list[Callable[[dict], None]] = []
+
+
+def subscribe(callback: Callable[[dict], None]) -> None:
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[dict], None]) -> None:
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+
+def publish(event: str, text: str, **data) -> None:
+    """Hand an event to every subscriber; callbacks must not block."""
+    for callback in _subscribers.copy():
+        callback({"event": event, "text": text, **data})
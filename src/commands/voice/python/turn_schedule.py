@@ -0,0 +1,75 @@
+"""When to ask Smart Turn whether the speaker has finished."""
+
+import os
+
+from logger import log
+from smart_turn import END_THRESHOLD, SAMPLE_RATE
+
+# Speculative checks before the full stop silence; only a confident
+# "complete" at one of these ends the turn early
+CHECKPOINTS_MS = (200, 400, 600)
+EARLY_THRESHOLD = 0.8
+
+
+class TurnSchedule:
+    """Smart Turn checkpoints through one utterance's trailing silence.
+
+    Each checkpoint submits a check; a newer one supersedes a check still
+    queued, and the cached mel frames make each check cost only the frames
+    since the last.  At ``stop_ms`` the usual threshold decides either way.
+    ``turnMinSilenceMs`` drops checkpoints below it.  A schedule is made per
+    utterance, so config reloads apply from the next one.  ``config`` settings
+    override the ``VOICE_TURN_*`` variables.
+    """
+
+    def __init__(self, stop_ms: int, block_size: int, config: dict | None = None):
+        config = config or {}
+        min_ms = int(
+            config.get("turnMinSilenceMs")
+            or os.environ.get("VOICE_TURN_MIN_SILENCE_MS", CHECKPOINTS_MS[0])
+        )
+        threshold = config.get("turnThreshold")
+        if threshold is None:
+            threshold = os.environ.get("VOICE_TURN_THRESHOLD", END_THRESHOLD)
+        self.threshold = float(threshold)
+        self.early_threshold = float(
+            os.environ.get("VOICE_TURN_EARLY_THRESHOLD", EARLY_THRESHOLD)
+        )
+        self._stop_ms = stop_ms
+        self._block_ms = block_size * 1000 / SAMPLE_RATE
+        points = [ms for ms in CHECKPOINTS_MS if min_ms <= ms < stop_ms]
+        # (ms, blocks of silence that reach it)
+        self._points = [
+            (ms, ms * SAMPLE_RATE // (block_size * 1000)) for ms in points + [stop_ms]
+        ]
+        self._next = 0
+        self._silence = 0
+        self.checks = 0
+
+    def due(self, silence: int) -> int | None:
+        """Checkpoint (ms) that ``silence`` blocks of silence just reached."""
+        if silence < self._silence:
+            self._next = 0  # speech resumed; start over
+        self._silence = silence
+        if self._next < len(self._points) and silence >= self._points[self._next][1]:
+            self._next += 1
+            self.checks += 1
+            return self._points[self._next - 1][0]
+        return None
+
+    def verdict(self, point_ms: int, probability: float, silence: int) -> bool | None:
+        """Whether the turn is over, or None to wait for a later checkpoint."""
+        final = point_ms == self._stop_ms
+        if probability <= (self.threshold if final else self.early_threshold):
+            return False if final else None
+        silence_ms = round(silence * self._block_ms)
+        log(
+            "turn_complete",
+            f"at {point_ms} ms checkpoint",
+            point_ms=point_ms,
+            silence_ms=silence_ms,
+            saved_ms=max(0, self._stop_ms - silence_ms),
+            probability=round(probability, 3),
+            checks=self.checks,
+        )
+        return True
@@ -0,0 +1,76 @@
+"""Per-utterance latency trace, logged as one waterfall record."""
+
+import time
+
+from logger import log
+from model_worker import Result
+
+# Waterfall stage for each model job kind
+JOB_STAGES = {
+    "partial": "stt_partial",
+    "turn": "smart_turn",
+    "speculative": "stt_speculative",
+    "final": "stt_final",
+}
+
+STAGES = ("vad", "queue_wait", *JOB_STAGES.values(), "dispatch")
+
+
+class UtteranceTrace:
+    """Monotonic-clock spans from speech start to the last keystroke.
+
+    Owned by the audio thread until ``handoff``, after which only the
+    keystroke thread touches it, so it needs no lock.
+    """
+
+    def __init__(self, trace_id: int):
+        self.id = trace_id
+        self._origin = time.monotonic()
+        self._spans: list[tuple[str, float, float]] = []  # (stage, start, end)
+        self._vad = 0.0
+        self._handoff = 0.0
+
+    def vad(self, seconds: float) -> None:
+        """Add VAD compute time; VAD runs per block, so it is only totalled."""
+        self._vad += seconds
+
+    def mark(self, name: str) -> None:
+        now = time.monotonic()
+        self._spans.append((name, now, now))
+
+    def job(self, result: Result) -> None:
+        """Record a model job's queue wait and run time."""
+        if result.waited > 0:
+            start = result.started - result.waited
+            self._spans.append(("queue_wait", start, result.started))
+        end = result.started + result.seconds
+        self._spans.append((JOB_STAGES[result.kind], result.started, end))
+
+    def handoff(self) -> None:
+        """The final result is in; dispatch runs from here until ``finish``."""
+        self._handoff = time.monotonic()
+
+    def finish(self, text: str) -> None:
+        """Log the waterfall; queue it behind the utterance's keystrokes."""
+        end = time.monotonic()
+        self._spans.append(("dispatch", self._handoff, end))
+        stages = dict.fromkeys(STAGES, 0.0)
+        stages["vad"] = self._vad
+        for name, start, stop in self._spans:
+            if name in stages:
+                stages[name] += stop - start
+        log(
+            "utterance_trace",
+            text,
+            trace=self.id,
+            total_ms=self._ms(end - self._origin),
+            stages={name: self._ms(s) for name, s in stages.items()},
+            waterfall=[
+                [name, self._ms(start - self._origin), self._ms(stop - start)]
+                for name, start, stop in self._spans
+            ],
+        )
+
+    @staticmethod
+    def _ms(seconds: float) -> float:
+        return round(seconds * 1000, 1)
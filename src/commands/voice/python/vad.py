@@ -1,50 +1,263 @@
 """Silero VAD wrapper (ONNX)."""
 
 import os
+import time
 
 import numpy as np
 import onnxruntime as ort
 
+from energy_gate import PREROLL, SKIP, EnergyGate, gate_enabled
 from logger import log
+from ort_cache import cached_session
 
 DEFAULT_THRESHOLD = 0.5
 CONTEXT_SIZE = 64  # v5/v6 requires 64 context samples prepended at 16kHz
+BLOCK_SIZE = 512  # the only block size Silero accepts at 16kHz
+STATE_SHAPE = (2, 1, 128)
+MAX_BATCH = 64  # most blocks process_batch scores in one call
+
+
+def _bind(binding: ort.IOBinding, name: str, array: np.ndarray, output=False):
+    """Bind ``array``'s memory directly, so ORT reads/writes it in place."""
+    args = (name, "cpu", 0, array.dtype, list(array.shape), array.ctypes.data)
+    if output:
+        binding.bind_output(*args)
+    else:
+        binding.bind_input(*args)
+
+
+def vad_threshold(config: dict | None = None) -> float:
+    """Speech probability above which a block is speech (``vadThreshold``)."""
+    value = (config or {}).get("vadThreshold")
+    if value is None:
+        value = os.environ.get("VOICE_VAD_THRESHOLD", DEFAULT_THRESHOLD)
+    return float(value)
+
+
+def _model_path() -> str:
+    model_path = os.environ.get("VOICE_MODEL_VAD")
+    if model_path:
+        return model_path
+    models_dir = os.environ.get(
+        "VOICE_MODELS_DIR",
+        os.path.expanduser("~/.assist/voice/models"),
+    )
+    return os.path.join(models_dir, "silero_vad.onnx")
 
 
 class SileroVAD:
-    def __init__(self):
-        model_path = os.environ.get("VOICE_MODEL_VAD")
-        if not model_path:
-            models_dir = os.environ.get(
-                "VOICE_MODELS_DIR",
-                os.path.expanduser("~/.assist/voice/models"),
-            )
-            model_path = os.path.join(models_dir, "silero_vad.onnx")
+    """Allocation-free Silero inference.
+
+    The model input is one preallocated [context | block] row: each block is
+    written after the context in place, and the context is refreshed in place
+    from the block's tail.  The recurrent state ping-pongs between two
+    buffers through two prebuilt IOBindings, so no input dict, array or
+    OrtValue is created per block.
 
+    While gated (``set_gated``, which the daemon does in IDLE) an
+    ``EnergyGate`` skips Silero on quiet blocks.  Every gated block is kept,
+    as its model input row, in a ring with the PREROLL before it.  Feeding
+    Silero only the blocks that ran would leave its state following a stream
+    it never hears (after minutes of that it scores real onsets near 0), so
+    the first run after a skip resets the state and runs the whole ring: the
+    block is scored like the start of an utterance after the daemon's own
+    reset, with the audio just before it as the model's recent history.
+    """
+
+    def __init__(self):
+        model_path = _model_path()
         log("vad_init", f"model={model_path}")
-        self._session = ort.InferenceSession(
-            model_path, providers=["CPUExecutionProvider"]
+        self._session = cached_session(
+            model_path, ort.SessionOptions(), ["CPUExecutionProvider"]
         )
-        self._state = np.zeros((2, 1, 128), dtype=np.float32)
-        self._context = np.zeros(CONTEXT_SIZE, dtype=np.float32)
+        self._input = np.zeros((1, CONTEXT_SIZE + BLOCK_SIZE), dtype=np.float32)
+        self._states = [np.zeros(STATE_SHAPE, dtype=np.float32) for _ in range(2)]
         self._sample_rate = np.array(16000, dtype=np.int64)
-        self.threshold = DEFAULT_THRESHOLD
+        self._out = np.zeros((1, 1), dtype=np.float32)
+        self._probs = np.zeros(MAX_BATCH, dtype=np.float32)
+        self._bindings = [self._make_binding(i) for i in range(2)]
+        self._turn = 0  # binding whose input state holds the current state
+        self.threshold = vad_threshold()
+        self._gate = EnergyGate() if gate_enabled() else None
+        self._gated = False
+        self._ring = np.zeros((PREROLL + 1, self._input.shape[1]), dtype=np.float32)
+        self._ring_at = 0  # oldest row, and the next one written
+        self._behind = False  # blocks were skipped since Silero last ran
+
+    def _make_binding(self, current: int) -> ort.IOBinding:
+        binding = self._session.io_binding()
+        _bind(binding, "input", self._input)
+        _bind(binding, "state", self._states[current])
+        _bind(binding, "sr", self._sample_rate)
+        _bind(binding, "output", self._out, output=True)
+        _bind(binding, "stateN", self._states[1 - current], output=True)
+        return binding
+
+    def _infer(self) -> float:
+        self._session.run_with_iobinding(self._bindings[self._turn])
+        self._turn = 1 - self._turn
+        self._input[0, :CONTEXT_SIZE] = self._input[0, -CONTEXT_SIZE:]
+        return self._out[0, 0]
+
+    def _run(self, audio: np.ndarray) -> float:
+        self._input[0, CONTEXT_SIZE:] = audio  # casts to float32 in place
+        return self._infer()
+
+    def _remember(self, audio: np.ndarray) -> None:
+        """Write ``audio`` after the context, keeping the row in the ring."""
+        self._input[0, CONTEXT_SIZE:] = audio
+        self._ring[self._ring_at] = self._input[0]
+        self._ring_at = (self._ring_at + 1) % len(self._ring)
+
+    def _replay(self) -> float:
+        """Reset the state and run the ring, oldest first.
+
+        The last row is the block just remembered: its probability is
+        returned, and its tail is left as the context, as ``_infer`` does.
+        """
+        for state in self._states:
+            state.fill(0.0)
+        for k in range(len(self._ring)):
+            self._input[0] = self._ring[(self._ring_at + k) % len(self._ring)]
+            prob = self._infer()
+        return prob
 
     def process(self, audio: np.ndarray) -> float:
         """Process a chunk of audio, return speech probability."""
-        chunk = audio.astype(np.float32)
-        # Prepend context (last 64 samples from previous chunk)
-        input_data = np.concatenate([self._context, chunk]).reshape(1, -1)
-        ort_inputs = {
-            "input": input_data,
-            "state": self._state,
-            "sr": self._sample_rate,
-        }
-        out, state = self._session.run(None, ort_inputs)
-        self._state = state
-        self._context = chunk[-CONTEXT_SIZE:]
-        return float(out[0][0])
+        return float(self._run(audio))
+
+    def process_batch(self, blocks: list[np.ndarray]) -> np.ndarray:
+        """Score a backlog of blocks in order, one probability per block.
+
+        Returns a view of a reused buffer, valid until the next call; at most
+        MAX_BATCH blocks are scored.
+        """
+        n = min(len(blocks), MAX_BATCH)
+        if self._gated and self._gate:
+            return self._gated_batch(blocks[:n])
+        for i in range(n):
+            self._probs[i] = self._run(blocks[i])
+        return self._probs[:n]
+
+    def set_gated(self, gated: bool) -> None:
+        self._gated = gated
+
+    def _gated_batch(self, blocks: list[np.ndarray]) -> np.ndarray:
+        """Score ``blocks`` through the gate until one is speech.
+
+        The daemon leaves IDLE at that block, so the rest are scored in full.
+        """
+        if not blocks:
+            return self._probs[:0]
+        start = time.perf_counter()
+        levels = self._gate.levels(np.asarray(blocks)).tolist()
+        run_seconds, runs, replayed = 0.0, 0, 0
+        for i, block in enumerate(blocks):
+            decision = self._gate.decide(levels[i])
+            self._remember(block)
+            if decision == SKIP:
+                self._input[0, :CONTEXT_SIZE] = self._input[0, -CONTEXT_SIZE:]
+                self._behind = True
+                self._probs[i] = 0.0
+            else:
+                began = time.perf_counter()
+                if self._behind:
+                    self._probs[i] = self._replay()
+                    self._behind = False
+                    replayed += PREROLL
+                else:
+                    self._probs[i] = self._infer()
+                run_seconds += time.perf_counter() - began
+                runs += 1
+            speech = bool(self._probs[i] > self.threshold)
+            self._gate.observe(levels[i], decision, speech)
+            if speech:
+                break
+        gate_seconds = time.perf_counter() - start - run_seconds
+        self._gate.timed(gate_seconds, run_seconds, runs, replayed)
+        for j in range(i + 1, len(blocks)):
+            self._probs[j] = self._run(blocks[j])
+        return self._probs[: len(blocks)]
+
+    def warm_up(self) -> None:
+        """Run once on silence so kernel setup isn't paid inside an utterance."""
+        self._run(np.zeros(BLOCK_SIZE, dtype=np.float32))
+        self.reset()
+
+    def reset(self) -> None:
+        for state in self._states:
+            state.fill(0.0)
+        self._input.fill(0.0)
+        self._ring.fill(0.0)
+        self._behind = False
+
+
+class BatchedVAD:
+    """Silero over several independent streams, one call per time step.
+
+    Each stream's recurrent state is a column of one (2, streams, 128) array
+    and its context a row of one input array, so streams with a block at the
+    same step share a single forward pass.
+    """
+
+    def __init__(self, streams: int):
+        model_path = _model_path()
+        log("vad_init", f"model={model_path} streams={streams}")
+        self._session = cached_session(
+            model_path, ort.SessionOptions(), ["CPUExecutionProvider"]
+        )
+        self._input = np.zeros((streams, CONTEXT_SIZE + BLOCK_SIZE), dtype=np.float32)
+        self._state = np.zeros((2, streams, STATE_SHAPE[2]), dtype=np.float32)
+        self._sample_rate = np.array(16000, dtype=np.int64)
+        self.threshold = vad_threshold()
+
+    def process_streams(self, batches: list[list[np.ndarray]]) -> list[np.ndarray]:
+        """Score each stream's backlog in order; one probability array per stream."""
+        probs = [np.zeros(len(blocks), dtype=np.float32) for blocks in batches]
+        for step in range(max(map(len, batches), default=0)):
+            active = [i for i, blocks in enumerate(batches) if len(blocks) > step]
+            rows = np.array(active)
+            feed = self._input[rows]  # fancy indexing copies
+            for row, i in enumerate(active):
+                feed[row, CONTEXT_SIZE:] = batches[i][step]
+            out, state = self._session.run(
+                None,
+                {"input": feed, "state": self._state[:, rows], "sr": self._sample_rate},
+            )
+            self._state[:, rows] = state
+            self._input[rows, :CONTEXT_SIZE] = feed[:, -CONTEXT_SIZE:]
+            for row, i in enumerate(active):
+                probs[i][step] = out[row, 0]
+        return probs
+
+    def reset(self, stream: int) -> None:
+        self._state[:, stream] = 0.0
+        self._input[stream] = 0.0
+
+    def warm_up(self) -> None:
+        silence = np.zeros(BLOCK_SIZE, dtype=np.float32)
+        self.process_streams([[silence]] * len(self._input))
+        self._state.fill(0.0)
+        self._input.fill(0.0)
+
+    def stream(self, index: int) -> "StreamVAD":
+        return StreamVAD(self, index)
+
+
+class StreamVAD:
+    """One stream of a ``BatchedVAD``, as its ``VoiceDaemon`` sees it.
+
+    Scoring happens in ``MultiStreamDaemon``, one pass for every stream, so
+    this only carries the threshold and per-stream state.
+    """
+
+    def __init__(self, vad: BatchedVAD, index: int):
+        self._vad = vad
+        self._index = index
+        self.threshold = vad.threshold
+
+    def set_gated(self, gated: bool) -> None:
+        pass  # streams share one model pass per step; there is none to skip
 
     def reset(self) -> None:
-        self._state = np.zeros((2, 1, 128), dtype=np.float32)
-        self._context = np.zeros(CONTEXT_SIZE, dtype=np.float32)
+        self._vad.reset(self._index)
@@ -0,0 +1,284 @@
+"""The ``voice`` section of the assist config, read from its YAML files.
+
+``assist voice start`` passes the global and project config paths in
+``VOICE_CONFIG_FILES``; they are merged and validated here the way
+loadConfigFrom does, without starting Node.  ``assist config get voice``
+remains the fallback when the files aren't given or can't be read here.
+Settings read at startup reach the other modules as ``VOICE_*`` environment
+variables; the live ones (``LIVE_KEYS``) are passed in the config itself.
+"""
+
+import json
+import os
+import subprocess
+import threading
+
+from logger import log
+
+DEFAULTS = {"wakeWords": ["computer"], "modelsDir": "~/.assist/voice/models"}
+
+# Seconds between checks of the config files' modification times
+WATCH_SECONDS = 1.0
+
+
+def _is_str(value) -> bool:
+    return isinstance(value, str)
+
+
+def _is_strs(value) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_positive(value) -> bool:
+    return _is_number(value) and value > 0
+
+
+def _is_positive_int(value) -> bool:
+    return _is_positive(value) and isinstance(value, int)
+
+
+def _is_fraction(value) -> bool:
+    return _is_number(value) and 0 <= value <= 1
+
+
+def _one_of(*choices):
+    return lambda value: value in choices
+
+
+# Mirrors the voice schema in src/shared/types.ts
+SCHEMA = {
+    "wakeWords": _is_strs,
+    "mic": _is_str,
+    "mics": _is_strs,
+    "cwd": _is_str,
+    "modelsDir": _is_str,
+    "lockDir": _is_str,
+    "submitWindows": _is_strs,
+    "wakeGate": _one_of("on", "off", "report"),
+    "keyboard": _one_of("sendinput", "uinput", "recording"),
+    "latencyBudgetMs": _is_positive,
+    "turnMinSilenceMs": _is_positive_int,
+    "vadThreshold": _is_fraction,
+    "turnThreshold": _is_fraction,
+    "socket": _is_str,
+}
+MODEL_KEYS = ("vad", "smartTurn", "stt", "wakeWord")
+
+# Settings that take effect without a restart: the daemon applies them from
+# each reloaded config, and they are never exported to the environment
+LIVE_KEYS = {
+    "wakeWords",
+    "submitWindows",
+    "vadThreshold",
+    "turnThreshold",
+    "turnMinSilenceMs",
+}
+
+
+def validate(voice: dict) -> list[str]:
+    """Problems with a merged ``voice`` section, as "key: reason" strings."""
+    errors = []
+    for key, value in voice.items():
+        if key == "models":
+            if not isinstance(value, dict):
+                errors.append("models: expected a mapping")
+                continue
+            errors += [
+                f"models.{name}: expected a path"
+                for name, path in value.items()
+                if name not in MODEL_KEYS or not _is_str(path)
+            ]
+        elif key not in SCHEMA:
+            errors.append(f"{key}: unknown key")
+        elif not SCHEMA[key](value):
+            errors.append(f"{key}: invalid value {value!r}")
+    return errors
+
+
+def _read_yaml(path: str) -> dict:
+    import yaml
+
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+    except yaml.YAMLError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    return data if isinstance(data, dict) else {}
+
+
+def _merge(base: dict, override: dict) -> dict:
+    """Deep merge, as deepMergeRawConfig: mappings merge, anything else replaces."""
+    merged = dict(base)
+    for key, value in override.items():
+        existing = merged.get(key)
+        both = isinstance(existing, dict) and isinstance(value, dict)
+        merged[key] = _merge(existing, value) if both else value
+    return merged
+
+
+def read_voice_config(paths: list[str]) -> dict:
+    """Merge and validate the ``voice`` sections of ``paths``, global first.
+
+    Raises ValueError for invalid config, or config only the CLI can resolve
+    (per-repo overrides of voice settings), and TypeError for a ``voice``
+    section that isn't a mapping.
+    """
+    voice: dict = {}
+    for path in paths:
+        raw = _read_yaml(path)
+        repos = raw.get("repos") or {}
+        if any(isinstance(r, dict) and "voice" in r for r in repos.values()):
+            raise ValueError(f"{path}: per-repo voice overrides need the CLI")
+        section = raw.get("voice") or {}
+        if not isinstance(section, dict):
+            raise TypeError(f"{path}: voice: expected a mapping")
+        voice = _merge(voice, section)
+    errors = validate(voice)
+    if errors:
+        raise ValueError("; ".join(errors))
+    return {**DEFAULTS, **voice, "models": voice.get("models") or {}}
+
+
+def _config_files() -> list[str]:
+    paths = os.environ.get("VOICE_CONFIG_FILES", "")
+    return [p for p in paths.split(os.pathsep) if p]
+
+
+def _load_from_cli() -> dict:
+    """Load voice config by calling ``assist config get voice``."""
+    try:
+        result = subprocess.run(
+            ["assist", "config", "get", "voice"],
+            capture_output=True,
+            text=True,
+            check=True,
+            shell=True,
+        )
+        return json.loads(result.stdout)
+    except (subprocess.CalledProcessError, json.JSONDecodeError) as exc:
+        log("config_error", str(exc), level="error")
+        return {}
+
+
+def apply_env(config: dict) -> None:
+    """Export the startup settings as the VOICE_* variables modules read.
+
+    Call it once, before other threads start; live settings stay out of the
+    environment so a reload never has to change it.
+    """
+    models = config.get("models") or {}
+    env_map: dict[str, str | None] = {
+        "VOICE_MIC": config.get("mic"),
+        "VOICE_MODELS_DIR": os.path.expanduser(v)
+        if (v := config.get("modelsDir"))
+        else None,
+        "VOICE_MODEL_VAD": models.get("vad"),
+        "VOICE_MODEL_SMART_TURN": models.get("smartTurn"),
+        "VOICE_MODEL_STT": models.get("stt"),
+        "VOICE_MODEL_WAKE_WORD": models.get("wakeWord"),
+        "VOICE_WAKE_GATE": config.get("wakeGate"),
+        "VOICE_KEYBOARD": config.get("keyboard"),
+    }
+    if (budget := config.get("latencyBudgetMs")) is not None:
+        env_map["VOICE_LATENCY_BUDGET_MS"] = str(budget)
+    for key, value in env_map.items():
+        if value:
+            os.environ[key] = value
+
+
+def load_voice_config() -> dict:
+    """Load the voice config, export it to the environment, and return it."""
+    config, source = None, "cli"
+    if paths := _config_files():
+        try:
+            config, source = read_voice_config(paths), "files"
+        except (ImportError, OSError, TypeError, ValueError) as exc:
+            log("config_fallback", str(exc), level="warn")
+    if config is None:
+        config = _load_from_cli()
+        if not config:
+            return {}
+    apply_env(config)
+    log("config_loaded", json.dumps(config), source=source)
+    return config
+
+
+class ConfigWatcher:
+    """Polls the config files and reloads them when they change.
+
+    A valid new config is handed to ``on_change`` (on this thread); an
+    invalid one, such as a half-saved file, is logged and ignored until the
+    next change.
+    """
+
+    def __init__(self, paths: list[str], config: dict, on_change):
+        self._paths = paths
+        self._config = config
+        self._on_change = on_change
+        self._stamps = self._stat()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, name="config-watch", daemon=True
+        )
+
+    def _stat(self) -> list:
+        return [
+            (s.st_mtime_ns, s.st_size) if (s := _stat_or_none(p)) else None
+            for p in self._paths
+        ]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(WATCH_SECONDS):
+            stamps = self._stat()
+            if stamps != self._stamps:
+                self._stamps = stamps
+                self._reload()
+
+    def _reload(self) -> None:
+        try:
+            config = read_voice_config(self._paths)
+        except (OSError, TypeError, ValueError) as exc:
+            log("config_invalid", str(exc), level="warn")
+            return
+        keys = config.keys() | self._config.keys()
+        changed = sorted(k for k in keys if config.get(k) != self._config.get(k))
+        if not changed:
+            return
+        self._config = config
+        restart = [key for key in changed if key not in LIVE_KEYS]
+        log("config_reloaded", ", ".join(changed), restart_needed=restart)
+        self._on_change(config)
+
+
+def _stat_or_none(path: str) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def watch_config(config: dict, on_change) -> ConfigWatcher | None:
+    """Start watching the config files, if they can be read directly."""
+    paths = _config_files()
+    if not paths:
+        return None
+    try:
+        read_voice_config(paths)
+    except (ImportError, OSError, TypeError, ValueError):
+        return None  # loaded through the CLI; changes need a restart
+    watcher = ConfigWatcher(paths, config, on_change)
+    watcher.start()
+    return watcher
@@ -1,90 +1,46 @@
 """Voice daemon entry point — main loop and signal handling."""
 
-import ctypes
-import json
 import os
+import queue
 import signal
-import subprocess
 import sys
 import time
+from collections import deque
 
 import numpy as np
 
-from audio_capture import AudioCapture, BLOCK_SIZE
+import transcripts
+from audio_buffer import UtteranceBuffer
+from audio_capture import BLOCK_SIZE, AudioCapture
+from command_typing import CommandTyper
+from keystroke_queue import KeystrokeQueue
+from latency_governor import LatencyGovernor
 from logger import DEBUG, log
-from smart_turn import SmartTurn
-from stt import ParakeetSTT
-from vad import SileroVAD
-from wake_word import check_wake_word
-
-import keyboard
-
-
-def _load_voice_config() -> dict:
-    """Load voice config by calling ``assist config get voice``.
-
-    Sets environment variables so other Python modules (audio_capture,
-    vad, smart_turn, stt, wake_word) can read them as before.
-    Returns the parsed config dict.
-    """
-    try:
-        result = subprocess.run(
-            ["assist", "config", "get", "voice"],
-            capture_output=True,
-            text=True,
-            check=True,
-            shell=True,
-        )
-        config = json.loads(result.stdout)
-    except (subprocess.CalledProcessError, json.JSONDecodeError) as exc:
-        log("config_error", str(exc), level="error")
-        return {}
-
-    env_map: dict[str, str | None] = {
-        "VOICE_WAKE_WORDS": ",".join(config.get("wakeWords", [])) or None,
-        "VOICE_MIC": config.get("mic"),
-        "VOICE_MODELS_DIR": os.path.expanduser(v)
-        if (v := config.get("modelsDir"))
-        else None,
-        "VOICE_MODEL_VAD": (config.get("models") or {}).get("vad"),
-        "VOICE_MODEL_SMART_TURN": (config.get("models") or {}).get("smartTurn"),
-    }
-    for key, value in env_map.items():
-        if value:
-            os.environ[key] = value
-
-    log("config_loaded", json.dumps(config))
-    return config
-
-
-def _get_foreground_window_info() -> str:
-    """Return the title and process name of the currently focused window."""
-    user32 = ctypes.windll.user32
-    kernel32 = ctypes.windll.kernel32
-    hwnd = user32.GetForegroundWindow()
-
-    # Window title
-    buf = ctypes.create_unicode_buffer(256)
-    user32.GetWindowTextW(hwnd, buf, 256)
-    title = buf.value
-
-    # Process name from window handle
-    pid = ctypes.c_ulong()
-    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-    process_name = ""
-    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
-    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
-    if handle:
-        exe_buf = ctypes.create_unicode_buffer(260)
-        size = ctypes.c_ulong(260)
-        if kernel32.QueryFullProcessImageNameW(handle, 0, exe_buf, ctypes.byref(size)):
-            process_name = exe_buf.value.rsplit("\\", 1)[-1]
-        kernel32.CloseHandle(handle)
-
-    if process_name:
-        return f"{process_name}: {title}"
-    return title
-
+from metrics import (
+    BLOCKS,
+    MIC_QUEUE,
+    MODEL_SECONDS,
+    SMART_TURN,
+    STT_RTF,
+    TRANSITIONS,
+    VAD_SECONDS,
+    export_metrics,
+)
+from model_loader import ModelLoader, mark_imports_done, report_startup, timed
+from model_worker import Job, ModelWorker
+from profiler import install_profiler
+from smart_turn import SmartTurn, TurnStream
+from speculative_final import SPECULATE_BLOCKS, SpeculativeFinal
+from streaming_stt import STTStream
+from stt import load_stt
+from transcription_service import serve
+from turn_schedule import TurnSchedule
+from utterance_trace import UtteranceTrace
+from vad import MAX_BATCH, SileroVAD, vad_threshold
+from voice_config import load_voice_config, watch_config
+from wake_gate import load_wake_gate
+from wake_word import get_wake_words
+from windows import setup_console
 
 # States
 IDLE = "idle"
@@ -94,17 +50,38 @@ ACTIVATED = "activated"  # wake word heard (alone), waiting for command utteranc
 # Max seconds of speech before forced processing
 MAX_SPEECH_SECONDS = 30
 
-# How often (in samples) to run partial STT during speech
-PARTIAL_STT_INTERVAL = 16000  # every 1 second of audio
+# Utterance buffer capacity; one extra block because the cap is checked after
+# the chunk that crosses it has been appended
+BUFFER_SAMPLES = MAX_SPEECH_SECONDS * 16000 + BLOCK_SIZE
 
-# Trailing silence (in ms) required before sending segment to smart turn.
+# Blocks held while the final STT pass runs (then replayed into the state
+# machine); bounded so a stuck model can't grow memory without limit
+HELD_BLOCKS = MAX_SPEECH_SECONDS * 16000 // BLOCK_SIZE
+
+# Trailing silence (in ms) after which smart turn decides either way (earlier
+# speculative checks only end the turn on a confident "complete").
 # Matches the reference implementation (record_and_predict.py STOP_MS=1000).
 STOP_MS = 1000
-STOP_CHUNKS = (STOP_MS * 16000) // (BLOCK_SIZE * 1000)  # ~31 chunks
+
+# Start capture and VAD as soon as the VAD loads, buffering speech until the
+# STT and Smart Turn models are up (VOICE_PROGRESSIVE_START=0 waits for all)
+PROGRESSIVE_START = os.environ.get("VOICE_PROGRESSIVE_START", "1") != "0"
 
 # How long (seconds) to wait for a command after a wake-word-only utterance
 ACTIVATED_TIMEOUT = 10.0
 
+# Updated for every batch of blocks, so held rather than looked up each time
+_BLOCKS = BLOCKS.labels()
+_VAD_SECONDS = VAD_SECONDS.labels()
+
+
+def load_models() -> tuple:
+    """Start loading the models in parallel: (loader, vad, smart_turn, stt)."""
+    loader = ModelLoader()
+    vad = loader.load("vad", SileroVAD)
+    smart_turn = loader.load("smart_turn", SmartTurn)
+    return loader, vad, smart_turn, loader.load("stt", load_stt)
+
 
 def _print_state(state: str) -> None:
     """Print the current daemon state to stderr when debug mode is on."""
@@ -112,409 +89,512 @@ def _print_state(state: str) -> None:
 
 
 class VoiceDaemon:
-    def __init__(self):
+    def __init__(
+        self, mic=None, keys=None, worker=None, config=None, models=None, name=""
+    ):
+        """Defaults are the live mic, Windows keystrokes and the assist config.
+
+        replay.py swaps in WAV input and recorded keystrokes instead, and
+        multi_stream.py passes ``models`` shared with other streams.  ``name``
+        tags this stream's transcript events.
+        """
+        self.name = name
         self._running = True
+        self._new_config: dict | None = None  # from the config watcher
         self._state = IDLE
-        self._audio_buffer: list[np.ndarray] = []
+        self._audio_buffer = UtteranceBuffer(BUFFER_SAMPLES)
 
-        config = _load_voice_config()
-        self._submit_windows: set[str] = set(config.get("submitWindows") or [])
+        with timed("config"):
+            if config is None:
+                config = load_voice_config()
+        self._config = config
+        submit_windows: set[str] = set(config.get("submitWindows") or [])
 
         log("daemon_init", "Initializing models...")
-        self._mic = AudioCapture()
-        self._vad = SileroVAD()
-        self._smart_turn = SmartTurn()
-        self._stt = ParakeetSTT()
-        if self._submit_windows:
-            log("daemon_init", f"Submit windows: {self._submit_windows}")
-        log("daemon_ready")
+        self._mic = mic or AudioCapture()
+        MIC_QUEUE.labels(name).track(self._mic.depth)
+        self._loader, vad, self._smart_turn, self._stt = models or load_models()
+        self._worker = worker or ModelWorker()
+        self._keys = keys or KeystrokeQueue()
+        if submit_windows:
+            log("daemon_init", f"Submit windows: {submit_windows}")
+            if sys.platform != "win32":
+                log(
+                    "daemon_init", "submitWindows only applies on Windows", level="warn"
+                )
+        # Capture needs only the VAD; in progressive mode speech is buffered
+        # until the other models finish loading
+        self._vad = vad.get()
+        self._vad.set_gated(True)  # IDLE
+        with timed("wake_gate"):
+            self._gate = load_wake_gate()
+        if not PROGRESSIVE_START:
+            self._loader.wait()
+
+        # Segment state, advanced one VAD-scored block at a time
+        self._sample_count = 0
+        self._trailing_silence = 0
+
+        # Results tagged with an older utterance or turn-check id are stale
+        self._utterance = 0
+        self._governor = LatencyGovernor()
+        self._stream = STTStream(self._stt)
+        self._governor.tune(self._stream)
+        self._turn = TurnStream(self._smart_turn)
+        self._turns = TurnSchedule(STOP_MS, BLOCK_SIZE, self._config)
+        self._spec = SpeculativeFinal()
+        self._turn_seq = 0
+        self._turn_check = 0  # id of the pending smart turn check, 0 if none
+        self._turn_point = 0  # silence checkpoint (ms) of the pending check
+
+        # Blocks that arrive while the final pass runs, replayed afterwards
+        self._finalizing = False
+        self._held: deque[tuple[np.ndarray, float]] = deque(maxlen=HELD_BLOCKS)
+
+        # Latency spans for the current utterance, from its first speech block
+        self._trace: UtteranceTrace | None = None
 
         # Incremental typing state
-        self._wake_detected = False
-        self._typed_text = ""
+        self._typer = CommandTyper(self._keys, submit_windows)
         self._last_partial_at = 0
         self._activated_at = 0.0
+        self._apply_config(config)
+
+    @property
+    def stt(self):
+        """The STT model, for the transcription service to share."""
+        return self._stt
 
     def _handle_signal(self, signum, frame) -> None:
         log("daemon_signal", f"Received signal {signum}")
+        self.stop()
+
+    def stop(self) -> None:
+        """Ask ``run`` to exit after the current block."""
         self._running = False
 
-    def _run_partial_stt(self) -> None:
-        """Run STT on accumulated audio and type incrementally."""
-        if not self._audio_buffer:
-            return
+    def _submit(self, kind: str, tag: int, audio: np.ndarray, fn) -> None:
+        """Queue a model job on a buffer view without copying it.
 
-        audio = np.concatenate(self._audio_buffer)
-        text = self._stt.transcribe(audio)
-        if not text.strip():
-            return
+        Safe because the buffer never wraps within an utterance (capacity
+        covers MAX_SPEECH_SECONDS), and ``_clear_utterance`` never reuses it
+        while a job may still be reading it.
+        """
+        self._worker.submit(Job(kind, tag, audio, fn))
 
-        if DEBUG:
-            print(f"\n  Partial: {text}", file=sys.stderr)
+    def _request_partial_stt(self) -> None:
+        """Queue streaming STT on the utterance; a newer request replaces it.
 
-        if self._state == ACTIVATED:
-            # Already activated — everything is the command, no wake word needed
-            partial = text.strip()
-            if partial and partial != self._typed_text:
-                if self._typed_text:
-                    self._update_typed_text(partial)
-                else:
-                    keyboard.type_text(partial)
-                    self._typed_text = partial
-        elif not self._wake_detected:
-            found, command = check_wake_word(text)
-            if found and command:
-                self._wake_detected = True
-                log("wake_word_detected", command)
-                if DEBUG:
-                    print(f"  Wake word! Typing: {command}", file=sys.stderr)
-                keyboard.type_text(command)
-                self._typed_text = command
-        else:
-            found, command = check_wake_word(text)
-            if found and command:
-                if command != self._typed_text:
-                    self._update_typed_text(command)
-
-    def _should_submit(self) -> bool:
-        """Check if the foreground window matches the submit allowlist."""
-        if not self._submit_windows:
-            return True
-        info = _get_foreground_window_info()
-        process_name = info.split(":")[0].strip() if ":" in info else ""
-        return process_name in self._submit_windows
-
-    def _update_typed_text(self, new_text: str) -> None:
-        """Diff old typed text vs new at word level, minimising deletions.
-
-        Only deletes back to the first word that changed; appends everything
-        after the common word prefix.  This avoids the jarring full-delete
-        that character-level diffing causes when earlier words shift slightly.
+        The stream only decodes audio past its committed prefix, and the final
+        pass in ``_finalize_utterance`` reuses that prefix too.
         """
-        old = self._typed_text
-        if old == new_text:
+        if not self._audio_buffer or not self._stt.done():
             return
+        if not self._spec.wanted():
+            return  # only silence since a pass that covers all the speech
+        silent = self._trailing_silence > 0
+        if not self._governor.allow_partial(self._mic.depth(), silent):
+            return
+        if not self._gate.allow():
+            return
+        self._submit(
+            "partial", self._utterance, self._audio_buffer.view(), self._stream.partial
+        )
 
-        old_words = old.split()
-        new_words = new_text.split()
-
-        # Find the longest common word prefix
-        common_words = 0
-        for a, b in zip(old_words, new_words):
-            if a == b:
-                common_words += 1
-            else:
-                break
-
-        # Character position where the common word prefix ends (including
-        # the trailing space after the last common word, if any).
-        if common_words == 0:
-            keep_chars = 0
-        else:
-            # Rejoin the common words and add one space (the separator before
-            # the next word that was already typed).
-            keep = " ".join(old_words[:common_words])
-            # Only count the trailing space if there were more old words after
-            # the common prefix (meaning that space is already on screen).
-            if common_words < len(old_words):
-                keep_chars = len(keep) + 1  # +1 for the space
-            else:
-                keep_chars = len(keep)
-
-        to_delete = len(old) - keep_chars
-        if to_delete > 0:
-            keyboard.backspace(to_delete)
-
-        # Build the new suffix to type from the first divergent word onward
-        if common_words == 0:
-            to_type = new_text
-        else:
-            suffix = " ".join(new_words[common_words:])
-            if suffix:
-                # Need a space separator if we kept text and are appending
-                if keep_chars > 0 and common_words < len(old_words):
-                    to_type = suffix
-                elif keep_chars > 0:
-                    to_type = " " + suffix
-                else:
-                    to_type = suffix
-            else:
-                to_type = ""
-
-        if to_type:
-            keyboard.type_text(to_type)
-        self._typed_text = new_text
-
-    def _process_audio_chunk(
-        self, chunk, prob: float, sample_count: int, trailing_silence: int
-    ) -> tuple[int, int]:
-        """Buffer audio chunk, run partial STT, and check for segment end."""
+    def _process_audio_chunk(self, chunk: np.ndarray, prob: float) -> None:
+        """Buffer audio chunk, request partial STT, and check for segment end."""
         self._audio_buffer.append(chunk)
-        sample_count += len(chunk)
+        self._sample_count += len(chunk)
 
         if prob > self._vad.threshold:
-            trailing_silence = 0
+            self._trailing_silence = 0
+            if self._spec.speech(self._sample_count):
+                self._worker.cancel("speculative")
+            if self._turn_check:
+                # Speech resumed; the pending smart turn answer is moot
+                self._turn_check = 0
+                self._worker.cancel("turn")
         else:
-            trailing_silence += 1
-
-        if sample_count - self._last_partial_at >= PARTIAL_STT_INTERVAL:
-            self._last_partial_at = sample_count
-            self._run_partial_stt()
+            self._trailing_silence += 1
+            if self._trailing_silence == SPECULATE_BLOCKS:
+                self._speculate_final()
 
-        is_end, reset_silence = self._check_segment_end(sample_count, trailing_silence)
-        if is_end:
-            self._finalize_utterance()
-            sample_count = 0
-            trailing_silence = 0
-        elif reset_silence:
-            trailing_silence = 0
+        if self._sample_count - self._last_partial_at >= self._governor.interval:
+            self._last_partial_at = self._sample_count
+            self._request_partial_stt()
 
-        return sample_count, trailing_silence
+        self._check_segment_end()
 
-    def _check_segment_end(
-        self, sample_count: int, trailing_silence: int
-    ) -> tuple[bool, bool]:
+    def _check_segment_end(self) -> None:
         """Check if the current segment is done.
 
         Follows the reference smart-turn implementation:
         1. Accumulate speech + trailing silence.
-        2. After STOP_MS of continuous silence, send the full segment to smart turn.
-        3. If smart turn says "Incomplete", keep listening.
-        4. If smart turn says "Complete", finalize.
+        2. At each silence checkpoint (``TurnSchedule``), send the segment to
+           smart turn (on the model worker; the answer arrives via
+           ``_on_turn``).  A newer check supersedes a pending one.
+        3. A confident "Complete" at an early checkpoint finalizes early.
+        4. After STOP_MS of continuous silence, "Complete" finalizes and
+           "Incomplete" keeps listening.
         5. Hard cap at MAX_SPEECH_SECONDS always finalizes.
-
-        Returns (is_end, reset_silence).  When reset_silence is True the caller
-        must zero trailing_silence so that another full STOP_MS of silence is
-        required before re-checking smart turn.
         """
         max_samples = MAX_SPEECH_SECONDS * 16000
 
-        if sample_count >= max_samples:
+        if self._sample_count >= max_samples:
             log("max_speech", "Reached max speech duration")
-            return True, False
+            self._finalize_utterance()
+            return
 
-        if trailing_silence >= STOP_CHUNKS:
-            audio_so_far = np.concatenate(self._audio_buffer)
-            is_complete = self._smart_turn.is_end_of_turn(audio_so_far)
-            if DEBUG:
-                label = "Complete" if is_complete else "Incomplete"
-                print(f"\n  Smart turn: {label}", file=sys.stderr)
-            if is_complete:
-                return True, False
-            else:
-                log("smart_turn_incomplete", "Continuing to listen...")
-                return False, True
-        return False, False
-
-    def _dispatch_result(self, text: str) -> None:
-        """Log and optionally submit a recognized command."""
-        should_submit = self._should_submit()
-        if should_submit:
-            log("dispatch_enter", text)
-            if DEBUG:
-                print(f"  Final: {text} [Enter]", file=sys.stderr)
-            keyboard.press_enter()
+        if not self._smart_turn.done():
+            return
+        point = self._turns.due(self._trailing_silence)
+        if point is not None:
+            self._turn_seq += 1
+            self._turn_check = self._turn_seq
+            self._turn_point = point
+            self._submit(
+                "turn",
+                self._turn_check,
+                self._audio_buffer.view(),
+                self._turn.probability,
+            )
+
+    def _speculate_final(self) -> None:
+        """Transcribe the utterance now, overlapping end-of-turn detection."""
+        if not self._spec.wanted() or not self._stt.done() or not self._gate.allow():
+            return
+        audio = self._audio_buffer.view()
+        if not self._governor.allow_speculation(self._stream.decode_length(len(audio))):
+            return
+        tag = self._spec.start(len(audio))
+        self._submit("speculative", tag, audio, self._stream.final)
+
+    def _on_turn(self, probability: float) -> None:
+        """Handle the smart turn answer for the pending check."""
+        self._turn_check = 0
+        is_complete = self._turns.verdict(
+            self._turn_point, probability, self._trailing_silence
+        )
+        outcome = {None: "undecided", True: "complete", False: "incomplete"}
+        SMART_TURN.labels(outcome[is_complete]).inc()
+        if is_complete is None:
+            return  # not confident this early; a later checkpoint decides
+        if DEBUG:
+            label = "Complete" if is_complete else "Incomplete"
+            print(f"\n  Smart turn: {label}", file=sys.stderr)
+        if is_complete:
+            self._finalize_utterance()
         else:
-            log("dispatch_typed", text)
-            if DEBUG:
-                print(f"  Final: {text} (no submit)", file=sys.stderr)
+            log("smart_turn_incomplete", "Continuing to listen...")
+            # Require another full STOP_MS of silence before re-checking
+            self._trailing_silence = 0
+
+    def _start_trace(self, message: str = "") -> None:
+        """Begin the utterance's latency trace at its first speech block."""
+        self._trace = UtteranceTrace(self._utterance)
+        self._gate.begin(exempt=self._state == ACTIVATED)
+        log("speech_start", message, trace=self._utterance)
+
+    def _observe_job(self, result) -> None:
+        if self._trace:
+            self._trace.job(result)
+        if result.kind != "turn":
+            self._governor.observe(result, self._stream.decoded)
+            self._governor.tune(self._stream)
+
+    def _drain_results(self) -> None:
+        """Apply model results, dropping any that belong to an older segment."""
+        while True:
+            try:
+                result = self._worker.results.get_nowait()
+            except queue.Empty:
+                return
+            _record_job(result)
+            if result.kind == "final":
+                self._observe_job(result)
+                self._on_final(result.value or "")
+            elif result.kind == "turn" and result.tag == self._turn_check:
+                self._observe_job(result)
+                self._on_turn(result.value or 0.0)
+            elif (
+                result.kind == "partial"
+                and result.tag == self._utterance
+                and not self._finalizing
+            ):
+                self._observe_job(result)
+                self._publish("partial", result.value or "")
+                self._typer.partial(result.value or "", self._state == ACTIVATED)
+                self._spec.partial(result.samples, result.value or "")
+            elif result.kind == "speculative" and self._spec.done(
+                result.tag, result.value or ""
+            ):
+                self._observe_job(result)
+                if self._finalizing:
+                    # The turn ended while this pass ran; it is the final
+                    self._on_final(self._spec.text)
+            else:
+                log("result_stale", result.kind, tag=result.tag)
+
+    def _publish(self, event: str, text: str) -> None:
+        transcripts.publish(event, text, stream=self.name, trace=self._utterance)
 
     def _finalize_utterance(self) -> None:
-        """End of turn: final STT, correct typed text, press Enter."""
+        """End of turn: queue the final STT; ``_on_final`` finishes the job."""
         if not self._audio_buffer:
             self._reset_listening()
             return
 
-        audio = np.concatenate(self._audio_buffer)
+        if not self._gate.allow():
+            # The keyword spotter never heard the wake word; skip STT
+            self._gate.end(None)
+            self._vad.reset()
+            self._reset_listening()
+            return
+
+        audio = self._audio_buffer.view()
         duration = len(audio) / 16000
-        log("end_of_turn", f"audio_length={duration:.1f}s")
+        log("end_of_turn", f"audio_length={duration:.1f}s", trace=self._utterance)
+        if self._trace:
+            self._trace.mark("end_of_turn")
 
         if DEBUG:
             print(file=sys.stderr)
 
-        text = self._stt.transcribe(audio)
-
+        self._finalizing = True
+        self._turn_check = 0
+        self._vad.reset()
+        if not self._spec.reuse(self._utterance):
+            self._submit("final", self._utterance, audio, self._stream.final)
+        elif self._spec.text is not None:
+            self._on_final(self._spec.text)
+        # else the speculative pass in flight becomes the final
+
+    def _on_final(self, text: str) -> None:
+        """Correct typed text, press Enter, then replay blocks held meanwhile."""
+        self._finalizing = False
+        self._gate.end(text)
+        self._publish("final", text)
+        trace, self._trace = self._trace, None
+        if trace:
+            trace.handoff()
         if self._state == ACTIVATED:
-            self._finalize_activated_command(text)
+            self._typer.final_command(text)
+            self._reset_listening()
+        elif self._typer.wake_detected:
+            self._typer.final_streamed(text)
+            self._reset_listening()
+        elif self._typer.final_text(text):
             self._reset_listening()
-            return
-
-        if self._wake_detected:
-            self._finalize_streamed_wake_word(text)
-        elif not self._finalize_check_final_text(text):
-            return  # entered ACTIVATED state, don't reset to IDLE
-
-        self._reset_listening()
-
-    def _finalize_activated_command(self, text: str) -> None:
-        """Finalize utterance in ACTIVATED state (full text is the command)."""
-        command = text.strip()
-        if command:
-            if command != self._typed_text:
-                if self._typed_text:
-                    self._update_typed_text(command)
-                else:
-                    keyboard.type_text(command)
-            self._dispatch_result(command)
         else:
-            if self._typed_text:
-                keyboard.backspace(len(self._typed_text))
-            log("dispatch_cancelled", "Empty command in activated mode")
-
-    def _finalize_streamed_wake_word(self, text: str) -> None:
-        """Finalize when wake word was detected during streaming."""
-        found, command = check_wake_word(text)
-        if found and command:
-            if command != self._typed_text:
-                self._update_typed_text(command)
-            self._dispatch_result(command)
-        elif found:
-            if self._typed_text:
-                keyboard.backspace(len(self._typed_text))
-            log("dispatch_cancelled", "No command after wake word")
-        elif self._typed_text:
-            # Final transcription lost the wake word (e.g. audio clipping
-            # turned "computer" into "uter"); fall back to the command
-            # captured during streaming
-            self._dispatch_result(self._typed_text)
-
-    def _finalize_check_final_text(self, text: str) -> bool:
-        """Check final transcription for wake word.
-
-        Returns True if caller should reset to IDLE, False if entering ACTIVATED.
-        """
-        found, command = check_wake_word(text)
-        if found and command:
-            log("wake_word_detected", command)
-            if DEBUG:
-                print(f"  Wake word! Final: {command}", file=sys.stderr)
-            keyboard.type_text(command)
-            self._dispatch_result(command)
-        if found and not command:
             # Wake word only — enter ACTIVATED state for next utterance
-            log("wake_word_only", "Listening for command...")
-            if DEBUG:
-                print("  Wake word heard — listening for command...", file=sys.stderr)
-            self._audio_buffer.clear()
-            self._vad.reset()
-            self._wake_detected = False
-            self._typed_text = ""
-            self._last_partial_at = 0
+            self._clear_utterance()
             self._activated_at = time.monotonic()
-            self._state = ACTIVATED
-            return False
-        elif not found:
-            log("no_wake_word", text)
-            if DEBUG:
-                print(f"  No wake word: {text}", file=sys.stderr)
-        return True
+            self._set_state(ACTIVATED)
+        if trace:
+            # Logged once the keystrokes queued above have been sent
+            self._keys.put(trace.finish, text.strip())
+
+        held = list(self._held)
+        self._held.clear()
+        for chunk, prob in held:
+            self._step(chunk, prob)
+
+    def _clear_utterance(self) -> None:
+        """Drop buffered audio and typing state; in-flight results go stale."""
+        if self._worker.idle():
+            self._audio_buffer.clear()
+        else:
+            # A queued or running job still reads a view of this buffer; the
+            # next utterance gets a new one and the job keeps the old alive
+            self._audio_buffer = UtteranceBuffer(BUFFER_SAMPLES)
+        self._utterance += 1
+        self._stream = STTStream(self._stt)
+        self._governor.tune(self._stream)
+        self._turn = TurnStream(self._smart_turn)
+        self._turns = TurnSchedule(STOP_MS, BLOCK_SIZE, self._config)
+        self._spec = SpeculativeFinal()
+        self._sample_count = 0
+        self._trailing_silence = 0
+        self._turn_check = 0
+        self._trace = None
+        self._typer.reset()
+        self._last_partial_at = 0
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            TRANSITIONS.labels(self._state, state).inc()
+            self._state = state
+            # Only IDLE can skip Silero; the other states need every score
+            self._vad.set_gated(state == IDLE)
 
     def _reset_listening(self) -> None:
-        self._audio_buffer.clear()
-        self._vad.reset()
-        self._wake_detected = False
-        self._typed_text = ""
-        self._last_partial_at = 0
+        self._clear_utterance()
         self._activated_at = 0.0
-        self._state = IDLE
+        self._set_state(IDLE)
 
     def _check_activated_timeout(self) -> bool:
         """If in ACTIVATED state with no audio buffered, check for timeout.
 
         Returns True if timed out and state was reset.
         """
-        if self._state != ACTIVATED or self._audio_buffer:
+        if self._state != ACTIVATED or self._audio_buffer or self._finalizing:
             return False
         if time.monotonic() - self._activated_at <= ACTIVATED_TIMEOUT:
             return False
         log("activated_timeout", "No command received")
         if DEBUG:
             print("\n  Activation timed out", file=sys.stderr)
+        self._vad.reset()
         self._reset_listening()
         return True
 
-    def run(self) -> None:
-        signal.signal(signal.SIGTERM, self._handle_signal)
-        signal.signal(signal.SIGINT, self._handle_signal)
+    def _check_models_ready(self) -> None:
+        """Report startup once every model has loaded; raise if one failed."""
+        if self._loader.poll():
+            report_startup()
+            log("daemon_ready")
+
+    def _step(self, chunk: np.ndarray, prob: float) -> None:
+        """Advance the state machine by one VAD-scored block."""
+        if self._finalizing:
+            # Capture blocks are ring views, reused after this batch
+            self._held.append((chunk.copy(), prob))
+            return
+
+        if self._state == IDLE:
+            if prob > self._vad.threshold:
+                self._start_trace()
+                self._set_state(LISTENING)
+                self._audio_buffer.append(chunk)
+                self._sample_count = len(chunk)
+                self._trailing_silence = 0
+                self._last_partial_at = 0
+
+        elif self._state == ACTIVATED:
+            if self._check_activated_timeout():
+                return
+
+            if prob > self._vad.threshold and not self._audio_buffer:
+                self._start_trace("command after activation")
 
+            if prob > self._vad.threshold or self._audio_buffer:
+                self._process_audio_chunk(chunk, prob)
+
+        elif self._state == LISTENING:
+            self._process_audio_chunk(chunk, prob)
+
+    def start(self) -> None:
         log("daemon_start", "Starting audio capture...")
+        self._worker.start()
+        self._keys.start()
         self._mic.start()
+        self._check_models_ready()
+
+    def poll(self) -> None:
+        """Between reads: report startup, apply config changes and results.
+
+        Raises the error that stopped the model or keystroke thread, if one did.
+        """
+        self._worker.check()
+        self._keys.check()
+        self._check_models_ready()
+        if self._new_config is not None:
+            config, self._new_config = self._new_config, None
+            self._apply_config(config)
+        self._drain_results()
+
+    def reload(self, config: dict) -> None:
+        """Hand over a changed config (from any thread); ``poll`` applies it."""
+        self._new_config = config
+
+    def _apply_config(self, config: dict) -> None:
+        """Apply the live settings (``LIVE_KEYS``); the rest need a restart."""
+        self._config = config
+        self._typer.submit_windows = set(config.get("submitWindows") or [])
+        self._typer.wake_words = self._gate.wake_words = get_wake_words(config)
+        self._vad.threshold = vad_threshold(config)
+
+    def feed(self, blocks: list[np.ndarray], probs, vad_seconds: float) -> None:
+        """Run VAD-scored blocks through the wake gate and state machine."""
+        if not blocks:
+            self._check_activated_timeout()
+            return
+        if self._trace:
+            self._trace.vad(vad_seconds)
+        _BLOCKS.inc(len(blocks))
+        _VAD_SECONDS.observe(vad_seconds / len(blocks))
+        self._gate.feed(blocks)
 
         if DEBUG:
-            print("Listening... (Ctrl+C to stop)", file=sys.stderr)
+            _print_state(self._state)
 
-        sample_count = 0
-        trailing_silence = 0
+        for chunk, prob in zip(blocks, probs):
+            self._step(chunk, float(prob))
+
+    def close(self) -> None:
+        self._mic.stop()
+        self._worker.stop()
+        self._keys.stop()
+        log("daemon_stop", "Voice daemon stopped")
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        self.start()
+
+        if DEBUG:
+            print("Listening... (Ctrl+C to stop)", file=sys.stderr)
 
         try:
             while self._running:
-                chunk = self._mic.read(timeout=0.5)
-                if chunk is None:
-                    self._check_activated_timeout()
-                    continue
-
-                prob = self._vad.process(chunk)
-
-                if DEBUG:
-                    _print_state(self._state)
-
-                if self._state == IDLE:
-                    if prob > self._vad.threshold:
-                        log("speech_start")
-                        self._state = LISTENING
-                        self._audio_buffer.append(chunk)
-                        sample_count = len(chunk)
-                        trailing_silence = 0
-                        self._last_partial_at = 0
-
-                elif self._state == ACTIVATED:
-                    if self._check_activated_timeout():
-                        continue
-
-                    if prob > self._vad.threshold and not self._audio_buffer:
-                        log("speech_start", "command after activation")
-
-                    if prob > self._vad.threshold or self._audio_buffer:
-                        sample_count, trailing_silence = self._process_audio_chunk(
-                            chunk, prob, sample_count, trailing_silence
-                        )
-
-                elif self._state == LISTENING:
-                    sample_count, trailing_silence = self._process_audio_chunk(
-                        chunk, prob, sample_count, trailing_silence
-                    )
+                self.poll()
+                # Normally one block; after a stall, the whole backlog is
+                # scored in one tight VAD pass before the state machine runs
+                blocks = self._mic.read_batch(MAX_BATCH, timeout=0.5)
+                start = time.monotonic()
+                probs = self._vad.process_batch(blocks) if blocks else []
+                self.feed(blocks, probs, time.monotonic() - start)
 
         finally:
             if DEBUG:
                 print(file=sys.stderr)
-            self._mic.stop()
-            log("daemon_stop", "Voice daemon stopped")
+            self.close()
 
 
-def _setup_console() -> None:
-    """On Windows, reopen stdout/stderr to the process's own console (CONOUT$).
+def _record_job(result) -> None:
+    MODEL_SECONDS.labels(result.kind).observe(result.seconds)
+    if result.kind != "turn" and result.samples:
+        STT_RTF.labels(result.kind).observe(result.seconds * 16000 / result.samples)
 
-    When launched as a detached background process, Node.js redirects stdio to
-    NUL.  Windows still allocates a console window for the process, but nothing
-    appears in it.  Opening CONOUT$ gives us a handle to that console so all
-    debug output shows up there.
-    """
-    if sys.platform != "win32":
-        return
-    try:
-        con = open("CONOUT$", "w", encoding="utf-8")
-        sys.stdout = con
-        sys.stderr = con
-    except OSError:
-        pass
+
+def _build_daemon(config: dict):
+    """One stream, or one per ``voice.mics`` device sharing the models."""
+    if len(config.get("mics") or []) > 1:
+        from multi_stream import MultiStreamDaemon
+
+        return MultiStreamDaemon.for_mics(config)
+    return VoiceDaemon(config=config)
 
 
 def main() -> None:
-    _setup_console()
+    mark_imports_done()
+    setup_console()
     log("daemon_launch", f"PID={os.getpid()}")
     try:
-        daemon = VoiceDaemon()
-        daemon.run()
+        with timed("config"):
+            config = load_voice_config()
+        daemon = _build_daemon(config)
+        services = [
+            serve(config, daemon.stt),
+            watch_config(config, daemon.reload),
+            install_profiler(),
+            export_metrics(),
+        ]
+        try:
+            daemon.run()
+        finally:
+            for service in filter(None, services):
+                service.stop()
     except Exception as e:
         log("daemon_crash", str(e), level="error")
         if DEBUG:
@@ -0,0 +1,108 @@
+"""Acoustic wake-word gate in front of STT."""
+
+import os
+
+import numpy as np
+
+from kws import KeywordSpotter
+from logger import log
+from wake_word import get_wake_words
+
+MODES = ("on", "off", "report")
+
+# A detection this soon before a segment starts still opens it
+GRACE_SAMPLES = 16000
+
+
+def load_wake_gate() -> "WakeGate":
+    """Gate configured by ``VOICE_MODEL_WAKE_WORD`` and ``VOICE_WAKE_GATE``.
+
+    The mode defaults to ``on`` when a keyword model is configured.
+    """
+    model_path = os.environ.get("VOICE_MODEL_WAKE_WORD")
+    mode = os.environ.get("VOICE_WAKE_GATE", "on" if model_path else "off")
+    if mode not in MODES:
+        raise ValueError(f"VOICE_WAKE_GATE must be one of {MODES}, got {mode!r}")
+    if mode == "off" or not model_path:
+        return WakeGate(None, "off")
+    models_dir = os.environ.get(
+        "VOICE_MODELS_DIR",
+        os.path.expanduser("~/.assist/voice/models"),
+    )
+    if not os.path.isabs(model_path):
+        model_path = os.path.join(models_dir, model_path)
+    return WakeGate(KeywordSpotter(model_path, models_dir), mode)
+
+
+class WakeGate:
+    """Lets a segment reach STT only if the keyword spotter heard the wake word.
+
+    Segments after a bare wake word (ACTIVATED) are exempt.  Text-level
+    ``check_wake_word`` still confirms every transcription.  In ``report``
+    mode nothing is blocked; each segment logs the STT calls the gate would
+    have saved and whether the transcription had the wake word after all.
+    """
+
+    def __init__(self, spotter: KeywordSpotter | None, mode: str):
+        self._spotter = spotter
+        self.mode = mode
+        self.wake_words = get_wake_words()
+        self._samples = 0
+        self._heard_at = -2 * GRACE_SAMPLES
+        self._begin_at = 0
+        self._exempt = True
+        self._segment_calls = 0
+        self._segment_saved = 0
+        self.calls = 0
+        self.saved = 0
+
+    def feed(self, blocks: list[np.ndarray]) -> None:
+        """Run the keyword spotter on newly captured blocks."""
+        if self._spotter is None:
+            return
+        for block in blocks:
+            self._samples += len(block)
+            if self._spotter.feed(block) > self._spotter.threshold:
+                self._heard_at = self._samples
+
+    def begin(self, exempt: bool) -> None:
+        """Start gating a new speech segment."""
+        self._exempt = exempt or self._spotter is None
+        self._begin_at = self._samples
+        self._segment_calls = 0
+        self._segment_saved = 0
+
+    @property
+    def heard(self) -> bool:
+        return self._heard_at >= self._begin_at - GRACE_SAMPLES
+
+    def allow(self) -> bool:
+        """Whether the current segment may make an STT call."""
+        if self._exempt:
+            return True
+        self._segment_calls += 1
+        if self.heard:
+            return True
+        self._segment_saved += 1
+        return self.mode == "report"
+
+    def end(self, text: str | None) -> None:
+        """Log the segment; ``text`` is its final transcription, if it had one."""
+        if self._exempt:
+            return
+        self.calls += self._segment_calls
+        self.saved += self._segment_saved
+        spoken = None
+        if text is not None:
+            spoken = any(word in text.lower() for word in self.wake_words)
+        log(
+            "wake_gate",
+            "heard" if self.heard else "not heard",
+            mode=self.mode,
+            stt_calls=self._segment_calls,
+            stt_saved=self._segment_saved,
+            wake_word_in_text=spoken,
+            total_calls=self.calls,
+            total_saved=self.saved,
+        )
+        self._exempt = True
@@ -7,17 +7,19 @@ from logger import log
 DEFAULT_WAKE_WORDS = ["computer"]
 
 
-def get_wake_words() -> list[str]:
-    env = os.environ.get("VOICE_WAKE_WORDS", "")
-    if env:
-        return [w.strip().lower() for w in env.split(",") if w.strip()]
-    return DEFAULT_WAKE_WORDS
+def get_wake_words(config: dict | None = None) -> list[str]:
+    """``wakeWords`` from ``config``, else ``VOICE_WAKE_WORDS``, else the default."""
+    words = (config or {}).get("wakeWords")
+    if not words:
+        words = os.environ.get("VOICE_WAKE_WORDS", "").split(",")
+    words = [w.strip().lower() for w in words if w.strip()]
+    return words or DEFAULT_WAKE_WORDS
 
 
-def check_wake_word(text: str) -> tuple[bool, str]:
+def check_wake_word(text: str, wake_words: list[str] | None = None) -> tuple[bool, str]:
     """Check if text contains a wake word. Returns (found, remaining_text)."""
     lower = text.lower()
-    for word in get_wake_words():
+    for word in wake_words or get_wake_words():
         idx = lower.find(word)
         if idx != -1:
             remaining = text[idx + len(word) :].strip().lstrip(",").strip()
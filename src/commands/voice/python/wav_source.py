@@ -0,0 +1,96 @@
+"""WAV-file audio source with AudioCapture's interface, for offline replay."""
+
+import time
+import wave
+from collections.abc import Callable
+
+import numpy as np
+
+from audio_capture import BLOCK_SIZE, SAMPLE_RATE
+
+
+def read_wav(path: str) -> np.ndarray:
+    """Load a 16-bit PCM WAV as mono float32 at 16kHz."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM is supported")
+        rate = f.getframerate()
+        channels = f.getnchannels()
+        pcm = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+    audio = pcm.reshape(-1, channels).mean(axis=1) / 32768.0
+    if rate != SAMPLE_RATE:
+        n = int(len(audio) * SAMPLE_RATE / rate)
+        audio = np.interp(
+            np.arange(n) * rate / SAMPLE_RATE, np.arange(len(audio)), audio
+        )
+    return audio.astype(np.float32)
+
+
+class WavSource:
+    """Feeds WAV files to the daemon in 512-sample blocks.
+
+    ``realtime`` paces blocks at 1x.  Otherwise blocks go out as fast as the
+    pipeline takes them, in lockstep with the model worker: no block is
+    released while a job is queued or running, so every result lands at the
+    same audio position it would with instant models, and runs are
+    reproducible.  ``on_end`` is called once the audio runs out.
+    """
+
+    def __init__(
+        self,
+        paths: list[str],
+        gap_seconds: float,
+        realtime: bool,
+        is_idle: Callable[[], bool],
+        on_end: Callable[[], None],
+    ):
+        gap = np.zeros(int(gap_seconds * SAMPLE_RATE), dtype=np.float32)
+        parts = [part for path in paths for part in (read_wav(path), gap)]
+        audio = np.concatenate([gap, *parts])
+        audio = np.pad(audio, (0, -len(audio) % BLOCK_SIZE))
+        self.blocks = audio.reshape(-1, BLOCK_SIZE)
+        self.seconds = len(audio) / SAMPLE_RATE
+        self.dropped = 0
+        self._realtime = realtime
+        self._is_idle = is_idle
+        self._on_end = on_end
+        self._next = 0
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+
+    def stop(self) -> None:
+        pass
+
+    def depth(self) -> int:
+        if not self._realtime:
+            return 0
+        due = int((time.monotonic() - self._started) * SAMPLE_RATE / BLOCK_SIZE)
+        return max(0, min(due, len(self.blocks)) - self._next)
+
+    def read_batch(self, max_blocks: int, timeout: float = 1.0) -> list[np.ndarray]:
+        if self._next >= len(self.blocks):
+            if self._is_idle():
+                self._on_end()
+            time.sleep(0.001)
+            return []
+        if self._realtime:
+            return self._read_realtime(max_blocks, timeout)
+        if not self._is_idle():
+            time.sleep(0.0005)
+            return []  # let the daemon drain the result before more audio
+        self._next += 1
+        return [self.blocks[self._next - 1]]
+
+    def _read_realtime(self, max_blocks: int, timeout: float) -> list[np.ndarray]:
+        due_at = self._started + (self._next + 1) * BLOCK_SIZE / SAMPLE_RATE
+        wait = due_at - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        n = min(max_blocks, self.depth())
+        self._next += n
+        return list(self.blocks[self._next - n : self._next])
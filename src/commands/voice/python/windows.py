@@ -0,0 +1,52 @@
+"""Windows-only helpers: the focused window and the daemon's console."""
+
+import ctypes
+import sys
+
+
+def foreground_window_info() -> str:
+    """Return the title and process name of the currently focused window."""
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    hwnd = user32.GetForegroundWindow()
+
+    # Window title
+    buf = ctypes.create_unicode_buffer(256)
+    user32.GetWindowTextW(hwnd, buf, 256)
+    title = buf.value
+
+    # Process name from window handle
+    pid = ctypes.c_ulong()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    process_name = ""
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+    if handle:
+        exe_buf = ctypes.create_unicode_buffer(260)
+        size = ctypes.c_ulong(260)
+        if kernel32.QueryFullProcessImageNameW(handle, 0, exe_buf, ctypes.byref(size)):
+            process_name = exe_buf.value.rsplit("\\", 1)[-1]
+        kernel32.CloseHandle(handle)
+
+    if process_name:
+        return f"{process_name}: {title}"
+    return title
+
+
+def setup_console() -> None:
+    """On Windows, reopen stdout/stderr to the process's own console (CONOUT$).
+
+    When launched as a detached background process, Node.js redirects stdio to
+    NUL.  Windows still allocates a console window for the process, but nothing
+    appears in it.  Opening CONOUT$ gives us a handle to that console so all
+    debug output shows up there.
+    """
+    if sys.platform != "win32":
+        return
+    try:
+        # Replaces stdio for the life of the process, so never closed
+        con = open("CONOUT$", "w", encoding="utf-8")  # noqa: SIM115
+        sys.stdout = con
+        sys.stderr = con
+    except OSError:
+        pass
@@ -0,0 +1,69 @@
+import { spawnSync } from "node:child_process";
+import { closeSync, existsSync, openSync, readSync, statSync } from "node:fs";
+import { join } from "node:path";
+import { getPythonDir, getVenvPython, voicePaths } from "./shared";
+
+export type LogQuery = {
+	lines: number;
+	event?: string;
+	level?: string;
+	since?: string;
+};
+
+// Fallback when there is no index yet: read only the end of voice.log
+const TAIL_BYTES_PER_LINE = 1024;
+
+function queryIndex(query: LogQuery): string[] | undefined {
+	if (!existsSync(voicePaths.db) || !existsSync(getVenvPython())) return;
+	const args = [
+		join(getPythonDir(), "log_query.py"),
+		"-n",
+		String(query.lines),
+	];
+	if (query.event) args.push("--event", query.event);
+	if (query.level) args.push("--level", query.level);
+	if (query.since) args.push("--since", query.since);
+	const result = spawnSync(getVenvPython(), args, {
+		encoding: "utf8",
+		env: { ...process.env, VOICE_LOG_DB: voicePaths.db },
+	});
+	if (result.status !== 0) return;
+	return result.stdout.split("\n").filter(Boolean);
+}
+
+function readLogTail(count: number): string[] {
+	if (!existsSync(voicePaths.log)) return [];
+	const size = statSync(voicePaths.log).size;
+	const length = Math.min(size, count * TAIL_BYTES_PER_LINE);
+	const buffer = Buffer.alloc(length);
+	const fd = openSync(voicePaths.log, "r");
+	try {
+		readSync(fd, buffer, 0, length, size - length);
+	} finally {
+		closeSync(fd);
+	}
+	const lines = buffer.toString("utf8").trim().split("\n");
+	// The first line is likely cut mid-record unless the whole file was read
+	if (length < size) lines.shift();
+	return lines.filter(Boolean).slice(-count);
+}
+
+function matches(line: string, query: LogQuery): boolean {
+	if (!query.event && !query.level && !query.since) return true;
+	try {
+		const event = JSON.parse(line);
+		if (query.event && event.event !== query.event) return false;
+		if (query.level && event.level !== query.level) return false;
+		return !query.since || (event.timestamp ?? "") >= query.since;
+	} catch {
+		return false;
+	}
+}
+
+/** Recent voice log lines, newest last, from the SQLite index if it exists. */
+export function queryLogs(query: LogQuery): string[] {
+	return (
+		queryIndex(query) ??
+		readLogTail(query.lines).filter((line) => matches(line, query))
+	);
+}
@@ -0,0 +1,58 @@
+import { existsSync, readFileSync } from "node:fs";
+import { voicePaths } from "./shared";
+
+type Metrics = Map<string, number>;
+
+// Sum of every sample of `name` whose labels contain `match`
+function total(metrics: Metrics, name: string, match = ""): number {
+	let sum = 0;
+	for (const [key, value] of metrics) {
+		const [metric] = key.split("{");
+		if (metric === name && key.includes(match)) sum += value;
+	}
+	return sum;
+}
+
+function parse(text: string): Metrics {
+	const metrics: Metrics = new Map();
+	for (const line of text.split("\n")) {
+		if (!line || line.startsWith("#")) continue;
+		const space = line.lastIndexOf(" ");
+		metrics.set(line.slice(0, space), Number(line.slice(space + 1)));
+	}
+	return metrics;
+}
+
+function meanMs(metrics: Metrics, kind: string): string {
+	const match = `kind="${kind}"`;
+	const count = total(metrics, "voice_model_seconds_count", match);
+	if (!count) return "-";
+	const sum = total(metrics, "voice_model_seconds_sum", match);
+	return `${Math.round((sum / count) * 1000)}ms x${count}`;
+}
+
+// Headline numbers from voice.prom, which the daemon rewrites every few seconds
+export function readMetrics(): string[] {
+	if (!existsSync(voicePaths.metrics)) return [];
+	const metrics = parse(readFileSync(voicePaths.metrics, "utf8"));
+	const count = (name: string, match = "") => total(metrics, name, match);
+	const vadCount = count("voice_vad_block_seconds_count");
+	const vadSum = count("voice_vad_block_seconds_sum");
+	const vadMs = vadCount ? ((vadSum / vadCount) * 1000).toFixed(2) : "-";
+	const turns = (outcome: string) =>
+		count("voice_smart_turn_total", `outcome="${outcome}"`);
+	const gate = (decision: string) =>
+		count("voice_vad_gate_blocks_total", `decision="${decision}"`);
+	const saved = count("voice_vad_gate_saved_seconds_total").toFixed(1);
+	const dropped = (
+		count("voice_capture_dropped_samples_total") / 16000
+	).toFixed(1);
+	return [
+		`blocks ${count("voice_blocks_total")} (VAD ${vadMs}ms/block)`,
+		`mic queue ${count("voice_mic_queue_blocks")}, overflows ${count("voice_capture_overflows_total")} (${dropped}s dropped)`,
+		`STT partial ${meanMs(metrics, "partial")}, speculative ${meanMs(metrics, "speculative")}, final ${meanMs(metrics, "final")}`,
+		`smart turn ${meanMs(metrics, "turn")}: ${turns("complete")} complete, ${turns("incomplete")} incomplete`,
+		`utterances ${count("voice_state_transitions_total", 'to="listening"')}, keystrokes ${count("voice_keystrokes_total")}`,
+		`idle VAD gate: ${gate("skip")} skipped, ${gate("audit")} audited, ${count("voice_vad_gate_misses_total")} missed, ${saved}s CPU saved`,
+	];
+}
@@ -1,6 +1,7 @@
 import { spawnSync } from "node:child_process";
 import { mkdirSync } from "node:fs";
 import { join } from "node:path";
+import { loadConfig } from "../../shared/loadConfig";
 import { bootstrapVenv } from "./checkLockFile";
 import { getPythonDir, getVenvPython, voicePaths } from "./shared";
 
@@ -11,9 +12,20 @@ export function setup(): void {
 
 	console.log("\nDownloading models...\n");
 	const script = join(getPythonDir(), "setup_models.py");
+	// An .onnx STT model is exported from the NeMo one during setup
+	const models = loadConfig().voice?.models;
+	const stt = models?.stt;
 	const result = spawnSync(getVenvPython(), [script], {
 		stdio: "inherit",
-		env: { ...process.env, VOICE_LOG_FILE: voicePaths.log },
+		env: {
+			...process.env,
+			VOICE_LOG_FILE: voicePaths.log,
+			VOICE_LOG_DB: voicePaths.db,
+			...(stt ? { VOICE_MODEL_STT: stt } : {}),
+			...(models?.wakeWord
+				? { VOICE_MODEL_WAKE_WORD: models.wakeWord }
+				: {}),
+		},
 	});
 
 	if (result.status !== 0) {
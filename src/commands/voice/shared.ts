@@ -11,6 +11,8 @@ export const voicePaths = {
 	dir: VOICE_DIR,
 	pid: join(VOICE_DIR, "voice.pid"),
 	log: join(VOICE_DIR, "voice.log"),
+	db: join(VOICE_DIR, "voice.db"),
+	metrics: join(VOICE_DIR, "voice.prom"),
 	venv: join(VOICE_DIR, ".venv"),
 	lock: join(VOICE_DIR, "voice.lock"),
 };
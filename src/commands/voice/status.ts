@@ -1,4 +1,6 @@
 import { existsSync, readFileSync } from "node:fs";
+import { queryLogs } from "./queryLogs";
+import { readMetrics } from "./readMetrics";
 import { voicePaths } from "./shared";
 
 function isProcessAlive(pid: number): boolean {
@@ -10,12 +12,6 @@ function isProcessAlive(pid: number): boolean {
 	}
 }
 
-function readRecentLogs(count: number): string[] {
-	if (!existsSync(voicePaths.log)) return [];
-	const lines = readFileSync(voicePaths.log, "utf8").trim().split("\n");
-	return lines.slice(-count);
-}
-
 export function status(): void {
 	if (!existsSync(voicePaths.pid)) {
 		console.log("Voice daemon: not running (no PID file)");
@@ -27,7 +23,13 @@ export function status(): void {
 
 	console.log(`Voice daemon: ${alive ? "running" : "dead"} (PID ${pid})`);
 
-	const recent = readRecentLogs(5);
+	const metrics = readMetrics();
+	if (metrics.length > 0) {
+		console.log("\nMetrics:");
+		for (const line of metrics) console.log(`  ${line}`);
+	}
+
+	const recent = queryLogs({ lines: 5 });
 	if (recent.length > 0) {
 		console.log("\nRecent events:");
 		for (const line of recent) {
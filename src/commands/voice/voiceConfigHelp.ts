@@ -11,6 +11,11 @@ export const voiceConfigHelp: ConfigHelpEntry[] = [
 		setter: "assist config set voice.mic <device>",
 		note: "audio input device (defaults to the system default)",
 	},
+	{
+		key: "voice.mics",
+		setter: 'assist config set voice.mics "Headset,USB Mic"',
+		note: "two or more devices: one daemon listens on each, sharing the models",
+	},
 	{
 		key: "voice.cwd",
 		setter: "assist config set voice.cwd <path>",
@@ -29,7 +34,42 @@ export const voiceConfigHelp: ConfigHelpEntry[] = [
 	{
 		key: "voice.submitWindows",
 		setter: 'assist config set voice.submitWindows "Code"',
-		note: "window titles where transcriptions auto-submit",
+		note: "window titles where transcriptions auto-submit (Windows only)",
+	},
+	{
+		key: "voice.wakeGate",
+		setter: "assist config set voice.wakeGate report",
+		note: "on, off or report: skip STT until the keyword model hears the wake word",
+	},
+	{
+		key: "voice.keyboard",
+		setter: "assist config set voice.keyboard uinput",
+		note: "keystroke backend: sendinput (Windows), uinput (Linux) or recording",
+	},
+	{
+		key: "voice.latencyBudgetMs",
+		setter: "assist config set voice.latencyBudgetMs 800",
+		note: "end-of-turn STT budget; partial STT adapts to stay within it",
+	},
+	{
+		key: "voice.turnMinSilenceMs",
+		setter: "assist config set voice.turnMinSilenceMs 400",
+		note: "earliest silence (200/400/600 ms) at which a confident smart turn ends the turn",
+	},
+	{
+		key: "voice.vadThreshold",
+		setter: "assist config set voice.vadThreshold 0.5",
+		note: "speech probability above which audio counts as speech (applied live)",
+	},
+	{
+		key: "voice.turnThreshold",
+		setter: "assist config set voice.turnThreshold 0.5",
+		note: "smart turn probability that ends the turn after full silence (applied live)",
+	},
+	{
+		key: "voice.socket",
+		setter: "assist config set voice.socket ~/.assist/voice/voice.sock",
+		note: "Unix socket serving transcription and live transcripts from the loaded models",
 	},
 	{
 		key: "voice.models.vad",
@@ -41,4 +81,15 @@ export const voiceConfigHelp: ConfigHelpEntry[] = [
 		setter: "assist config set voice.models.smartTurn <path>",
 		note: "override the smart-turn model path",
 	},
+	{
+		key: "voice.models.stt",
+		setter:
+			"assist config set voice.models.stt parakeet-ctc/model.int8.onnx",
+		note: "NeMo model name, or an .onnx path (under modelsDir) for the CPU backend",
+	},
+	{
+		key: "voice.models.wakeWord",
+		setter: "assist config set voice.models.wakeWord computer.onnx",
+		note: "openWakeWord keyword model (under modelsDir) for the wake gate",
+	},
 ];
@@ -260,14 +260,24 @@ const assistConfigShape = {
 		.strictObject({
 			wakeWords: z.array(z.string()).default(DEFAULT_WAKE_WORDS),
 			mic: z.string().optional(),
+			mics: z.array(z.string()).optional(),
 			cwd: z.string().optional(),
 			modelsDir: z.string().default(DEFAULT_MODELS_DIR),
 			lockDir: z.string().optional(),
 			submitWindows: z.array(z.string()).optional(),
+			wakeGate: z.enum(["on", "off", "report"]).optional(),
+			keyboard: z.enum(["sendinput", "uinput", "recording"]).optional(),
+			latencyBudgetMs: z.number().positive().optional(),
+			turnMinSilenceMs: z.number().int().positive().optional(),
+			vadThreshold: z.number().min(0).max(1).optional(),
+			turnThreshold: z.number().min(0).max(1).optional(),
+			socket: z.string().optional(),
 			models: z
 				.strictObject({
 					vad: z.string().optional(),
 					smartTurn: z.string().optional(),
+					stt: z.string().optional(),
+					wakeWord: z.string().optional(),
 				})
 				.default({}),
 		})